@@ -0,0 +1,181 @@
+from typing import List
+import numpy as np
+from game_board import GameBoard
+from placements import placement_table
+from ship import naval_fleet
+
+"""
+This file contains batched game board. It holds boards of many games
+played in lockstep as Numpy tensors, so one call resolves a shot
+in every game at once.
+"""
+
+
+class BatchGameBoard:
+    """
+    Class BatchGameBoard. Game boards of many games of the same size.
+    Ships are numbered from 0 in fleet's order.
+    Contains attributes:
+    :param ship_ids: number of the ship occupying each field plus one
+    (0 for empty fields)
+    :type ship_ids: Numpy array of shape (games, boards_edge, boards_edge)
+
+    :param ship_sizes: size of each ship of the fleet
+    :type ship_sizes: Numpy array of shape (ships,)
+
+    Besides that the batch keeps which fields have been shot at,
+    remaining hit points of each ship and number of ships afloat
+    in each game.
+    """
+    def __init__(self, ship_ids: np.ndarray, ship_sizes: np.ndarray):
+        """
+        Creates batch of game boards with arranged fleets.
+        """
+        self._ship_ids = ship_ids
+        self._ship_sizes = np.asarray(ship_sizes)
+        games = ship_ids.shape[0]
+        self._shot = np.zeros(ship_ids.shape, dtype=bool)
+        self._hit_points = np.zeros((games, len(ship_sizes)), dtype=np.int16)
+        flat_ids = ship_ids.reshape(games, -1).astype(np.int64)
+        for ship_number in range(len(ship_sizes)):
+            self._hit_points[:, ship_number] = \
+                (flat_ids == ship_number + 1).sum(axis=1)
+        self._ships_afloat = (self._hit_points > 0).sum(axis=1)
+
+    def games(self):
+        """
+        Method that returns number of games in the batch.
+        """
+        return self._ship_ids.shape[0]
+
+    def boards_edge(self):
+        """
+        Method that returns length of boards' edge.
+        """
+        return self._ship_ids.shape[1]
+
+    def ship_ids(self):
+        """
+        Method that return batch's ship_ids attribute.
+        """
+        return self._ship_ids
+
+    def ship_sizes(self):
+        """
+        Method that return batch's ship_sizes attribute.
+        """
+        return self._ship_sizes
+
+    def shot(self):
+        """
+        Method that returns boolean tensor of fields that have been shot at.
+        """
+        return self._shot
+
+    def hits(self):
+        """
+        Method that returns boolean tensor of successful hits.
+        """
+        return self._shot & (self._ship_ids > 0)
+
+    def hit_points(self):
+        """
+        Method that returns remaining hit points of each ship in each game.
+        """
+        return self._hit_points
+
+    def ships_afloat(self):
+        """
+        Method that returns number of ships afloat in each game.
+        """
+        return self._ships_afloat
+
+    def lost(self):
+        """
+        Method that returns boolean array of games whose fleet has sunk.
+        """
+        return self._ships_afloat == 0
+
+    def ocean_grid(self, game: int):
+        """
+        Method that returns ocean grid of one game, with the same
+        statuses as GameBoard's ocean grid
+        (0 - empty, 1 - ship, 2 - successful hit, 3 - missed shot).
+        """
+        ships = self._ship_ids[game] > 0
+        shot = self._shot[game]
+        return np.where(shot, np.where(ships, 2, 3), ships.astype(int))
+
+    def fire(self, y_coordinates: np.ndarray, x_coordinates: np.ndarray,
+             games: np.ndarray = None):
+        """
+        Method that fires one shot in each of the given games
+        (by default in every game of the batch) - a batched
+        GameBoard.set_new_board_status.
+        Returns arrays (one value per shot):
+        hit - whether a ship has been hit,
+        ship - number of the ship that has been hit (-1 for a miss),
+        sunk - whether the shot has sunk the ship,
+        lost - whether the game's whole fleet has sunk.
+        As in GameBoard only the first hit of a field takes a hit point.
+        """
+        if games is None:
+            games = np.arange(self.games())
+        ship = self._ship_ids[games, y_coordinates, x_coordinates]
+        ship = ship.astype(np.int64) - 1
+        first_shot = ~self._shot[games, y_coordinates, x_coordinates]
+        self._shot[games, y_coordinates, x_coordinates] = True
+        hit = ship >= 0
+        damaging = hit & first_shot
+        damaged_games = games[damaging]
+        damaged_ships = ship[damaging]
+        self._hit_points[damaged_games, damaged_ships] -= 1
+        sunk = np.zeros(len(games), dtype=bool)
+        sunk[damaging] = \
+            self._hit_points[damaged_games, damaged_ships] == 0
+        self._ships_afloat[games[sunk]] -= 1
+        lost = self._ships_afloat[games] == 0
+        return hit, ship, sunk, lost
+
+    def ship_fields(self, games: np.ndarray, ships: np.ndarray):
+        """
+        Method that returns boolean tensor of fields occupied by
+        the given ship in each of the given games.
+        """
+        return self._ship_ids[games] == (ships + 1)[:, None, None]
+
+
+def batch_from_layouts(boards_edge: int, layouts: np.ndarray,
+                       fleet: dict = None):
+    """
+    Function that creates BatchGameBoard from layouts drawn by
+    placements.random_fleet_layouts (one game per layout).
+    """
+    if fleet is None:
+        fleet = naval_fleet
+    ship_sizes = np.array(list(fleet.values()))
+    games = len(layouts)
+    ship_ids = np.zeros((games, boards_edge * boards_edge), dtype=np.int16)
+    rows = np.arange(games)[:, None]
+    for ship_number, ship_size in enumerate(ship_sizes):
+        cells = placement_table(boards_edge, int(ship_size)).cells()
+        ship_ids[rows, cells[layouts[:, ship_number]]] = ship_number + 1
+    return BatchGameBoard(
+        ship_ids.reshape(games, boards_edge, boards_edge), ship_sizes)
+
+
+def batch_from_game_boards(boards: List[GameBoard]):
+    """
+    Function that creates BatchGameBoard from game boards of the same
+    size and the same fleet sizes (shots already made are not copied).
+    """
+    boards_edge = boards[0].boards_edge()
+    ship_sizes = np.array([each_ship.size()
+                           for each_ship in boards[0].fleet()])
+    ship_ids = np.zeros((len(boards), boards_edge, boards_edge),
+                        dtype=np.int16)
+    for game, board in enumerate(boards):
+        for ship_number, each_ship in enumerate(board.fleet()):
+            for coordinate in each_ship.coordinates():
+                ship_ids[(game,) + tuple(coordinate)] = ship_number + 1
+    return BatchGameBoard(ship_ids, ship_sizes)
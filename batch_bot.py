@@ -0,0 +1,182 @@
+import numpy as np
+from batch_board import BatchGameBoard, batch_from_layouts
+from placements import random_fleet_layouts
+
+"""
+This file contains vectorized version of Bot Player's strategy.
+It chooses next shots for a whole batch of games at once,
+so that large simulations don't pay Python's cost per game.
+"""
+
+
+def neighbour_counts(fields: np.ndarray):
+    """
+    Function that counts for every field how many of its neighbours
+    (left/right/up/down) are set in fields (a boolean tensor of shape
+    (games, boards_edge, boards_edge)).
+    """
+    counts = np.zeros(fields.shape, dtype=np.int64)
+    counts[:, 1:, :] += fields[:, :-1, :]
+    counts[:, :-1, :] += fields[:, 1:, :]
+    counts[:, :, 1:] += fields[:, :, :-1]
+    counts[:, :, :-1] += fields[:, :, 1:]
+    return counts
+
+
+def weighted_choice(weights: np.ndarray, rng: np.random.Generator):
+    """
+    Function that chooses one field in each game with probability
+    proportional to its weight. Returns flat field numbers.
+    """
+    flat_weights = weights.reshape(len(weights), -1)
+    cumulative = np.cumsum(flat_weights, axis=1)
+    thresholds = rng.random(len(weights)) * cumulative[:, -1]
+    return (cumulative <= thresholds[:, None]).sum(axis=1)
+
+
+class BatchBotPolicy:
+    """
+    Class BatchBotPolicy. Bot Player's hunt and target strategy
+    (see BotPlayer.attack_player) for many games at once.
+    Contains attributes:
+    :param games: number of games
+    :type games: int
+
+    :param boards_edge: length of boards' edge
+    :type boards_edge: int
+
+    :param rng: random number generator
+    :type rng: Numpy Generator (or a seed)
+
+    The policy keeps tried fields (the stacked players' memories) and
+    pending hits - hits of ships that haven't sunk (the stacked hits
+    memories). Like BotPlayer it:
+    - fires at a random untried field when there are no pending hits,
+    - fires next to the pending hit when there is only one,
+    - fires at an untried end of the line of pending hits,
+    - otherwise fires next to a random pending hit.
+    BotPlayer works out the line from the first two remembered hits,
+    the policy requires all pending hits to lie in one row or column,
+    which is the same in every game where hits of only one ship
+    are pending.
+    """
+    def __init__(self, games: int, boards_edge: int, rng=None):
+        """
+        Creates policy for games without any shots.
+        """
+        self._boards_edge = boards_edge
+        self._tried = np.zeros((games, boards_edge, boards_edge), dtype=bool)
+        self._pending = np.zeros((games, boards_edge, boards_edge),
+                                 dtype=bool)
+        self._rng = np.random.default_rng(rng)
+
+    def tried(self):
+        """
+        Method that return policy's tried attribute.
+        """
+        return self._tried
+
+    def pending(self):
+        """
+        Method that return policy's pending attribute.
+        """
+        return self._pending
+
+    def _line_ends(self, pending: np.ndarray, untried: np.ndarray,
+                   along_rows: bool):
+        """
+        Helper method of shot_weights. Marks untried fields just past
+        both ends of the line of pending hits (in games where all of them
+        lie in one row, or in one column when along_rows is False).
+        """
+        if not along_rows:
+            pending = pending.transpose(0, 2, 1)
+            untried = untried.transpose(0, 2, 1)
+        edge = self._boards_edge
+        ends = np.zeros(pending.shape, dtype=bool)
+        in_line = (pending.any(axis=2).sum(axis=1) == 1) & \
+            (pending.sum(axis=(1, 2)) >= 2)
+        games = np.flatnonzero(in_line)
+        if len(games):
+            rows = pending[games].any(axis=2).argmax(axis=1)
+            line = pending[games, rows]
+            first = line.argmax(axis=1) - 1
+            last = edge - line[:, ::-1].argmax(axis=1)
+            for end in (first, last):
+                inside = (end >= 0) & (end < edge)
+                ends[games[inside], rows[inside], end[inside]] = True
+        ends &= untried
+        if not along_rows:
+            ends = ends.transpose(0, 2, 1)
+        return ends
+
+    def shot_weights(self, games: np.ndarray):
+        """
+        Method that returns weights of fields for the next shot
+        in each of the given games.
+        """
+        pending = self._pending[games]
+        untried = ~self._tried[games]
+        ends = self._line_ends(pending, untried, True) | \
+            self._line_ends(pending, untried, False)
+        near_hits = neighbour_counts(pending) * untried
+        hunting = ~pending.any(axis=(1, 2))
+        along_line = ends.any(axis=(1, 2))
+        weights = np.where(along_line[:, None, None], ends, near_hits)
+        return np.where(hunting[:, None, None], untried, weights)
+
+    def choose_shots(self, games: np.ndarray = None):
+        """
+        Method that chooses next shot in each of the given games
+        (by default in every game). Returns arrays of y and x coordinates.
+        """
+        if games is None:
+            games = np.arange(len(self._tried))
+        cells = weighted_choice(self.shot_weights(games), self._rng)
+        return np.divmod(cells, self._boards_edge)
+
+    def observe(self, games: np.ndarray, y_coordinates: np.ndarray,
+                x_coordinates: np.ndarray, hit: np.ndarray,
+                sunk: np.ndarray = None, sunk_fields: np.ndarray = None):
+        """
+        Method that updates policy's memory with results of shots.
+        sunk_fields is a boolean tensor with fields of the ship sunk
+        by each shot for which sunk is True.
+        """
+        self._tried[games, y_coordinates, x_coordinates] = True
+        self._pending[games[hit], y_coordinates[hit],
+                      x_coordinates[hit]] = True
+        if sunk is not None and sunk.any():
+            self._pending[games[sunk]] &= ~sunk_fields
+
+
+def play_batch(batch: BatchGameBoard, policy: BatchBotPolicy):
+    """
+    Function that lets the policy shoot at every board of the batch
+    until all fleets have sunk. Returns number of shots needed
+    in each game.
+    """
+    shots = np.zeros(batch.games(), dtype=np.int64)
+    active = np.flatnonzero(~batch.lost())
+    while len(active):
+        y_coordinates, x_coordinates = policy.choose_shots(active)
+        hit, ship, sunk, lost = batch.fire(
+            y_coordinates, x_coordinates, active)
+        shots[active] += 1
+        sunk_fields = batch.ship_fields(active[sunk], ship[sunk])
+        policy.observe(active, y_coordinates, x_coordinates, hit,
+                       sunk, sunk_fields)
+        active = active[~lost]
+    return shots
+
+
+def batch_shots_to_win(boards_edge: int, games: int, seed: int = None):
+    """
+    Function that plays given number of games of the batch policy
+    against random fleet layouts. Returns number of shots needed
+    to sink each fleet.
+    """
+    rng = np.random.default_rng(seed)
+    batch = batch_from_layouts(
+        boards_edge, random_fleet_layouts(boards_edge, games, rng=rng))
+    return play_batch(batch, BatchBotPolicy(games, boards_edge, rng))
@@ -1,10 +1,18 @@
-import time
 from players import HumanPlayer, BotPlayer
 from game_board import GameBoard
 from game_interface import before_enemys_attack, before_players_attack
 from game_interface import game_description, input_arrange_ships_on_board
 from game_interface import result_of_enemys_attack, result_of_players_attack
 from game_interface import separator
+from pacing import pause
+
+"""
+Accepted lengths of game board's edge. Boards bigger than 26 * 26
+get multi-letter column labels (AA, AB, ...) and are drawn through
+a window (see renderer).
+"""
+MIN_BOARD_EDGE = 8
+MAX_BOARD_EDGE = 10000
 
 
 def main():
@@ -30,27 +38,29 @@ def initialize_game():
     Function that initializes Human player and their game board.
     Processes player's input - gets player's name (it cannot be empty)
     and desired game board's size which impacts game level.
-    Accepted game board's size's were set between 8*8 and 16*16.
+    Accepted game board's size's were set between 8*8 and 10000*10000.
     Checks if player's input is correct.
     """
     print("Welcome to the game of Warships!")
-    time.sleep(1)
+    pause(1)
     print("Before you face your opponent please tell us what is your name.")
-    time.sleep(1)
+    pause(1)
     players_name = input("Enter your name: ")
     while not players_name:
         players_name = input("Ups! Try again - enter your name: ")
     separator()
     print("Select your game level - choose the desired Ocean Grid's dimension")
-    print("from 8 to 16 (10 is a standard grid's size for the game).")
-    time.sleep(4)
+    print(f"from {MIN_BOARD_EDGE} to {MAX_BOARD_EDGE} "
+          "(10 is a standard grid's size for the game).")
+    pause(4)
     end_loop = 1
     while end_loop:
-        time.sleep(0.5)
+        pause(0.5)
         try:
             boards_dimensions = input("Enter length of board's edge: ")
             int_boards_dimensions = int(boards_dimensions)
-            if int_boards_dimensions in range(8, 16+1):
+            if int_boards_dimensions in range(MIN_BOARD_EDGE,
+                                              MAX_BOARD_EDGE + 1):
                 end_loop = 0
             else:
                 print("Ups! Try again.", end=" ")
@@ -0,0 +1,431 @@
+import time
+from typing import List
+from random import Random
+import numpy as np
+from density_bot import DensityBotPlayer, DensityMap
+from game_board import GameBoard
+from placements import placement_table, random_fleet_layouts
+from players import HumanPlayer
+
+"""
+This file contains Monte Carlo belief sampler. It keeps a number of
+Markov chains, each of them a layout of opponent's ships afloat
+consistent with the shots so far (it doesn't cover misses or sunk
+ships, covers all the hits and none of its ships is made of hits only,
+because such a ship would have sunk). Hit probability of a field is
+estimated as the fraction of sampled layouts covering it.
+
+Chains move by Gibbs steps: one ship at a time is moved to a placement
+drawn uniformly from all placements legal given the other ships,
+so the layouts stay consistent and their distribution tends to
+the uniform one over all consistent layouts. One step is made
+for all the chains at once, with Numpy.
+
+Chains are kept between turns. After a shot the layouts that are
+no longer consistent are replaced with copies of the consistent ones
+and the chains make a few more steps to forget the copies.
+"""
+
+"""
+Number of chains kept by the sampler.
+"""
+CHAINS = 64
+
+"""
+Number of sweeps (Gibbs steps of every ship of every chain) made
+before a move. Each sweep gives one sample from each chain.
+"""
+SWEEPS_PER_MOVE = 16
+
+"""
+Number of sweeps made after chains have been replaced, before
+their samples are counted.
+"""
+REJUVENATION_SWEEPS = 4
+
+"""
+Largest number of ships placed (and taken back) while looking
+for a consistent layout from scratch.
+"""
+CONSTRUCTION_STEPS = 20000
+
+"""
+Time (in seconds) the sampler may take to bring its chains up to date
+before a move that has no deadline of its own
+(see MonteCarloBotPlayer.choose_new_hit).
+"""
+UPDATE_TIME_BUDGET = 0.05
+
+
+class BeliefSampler:
+    """
+    Class BeliefSampler. Markov chains of layouts consistent with
+    knowledge gathered in a density map.
+    Contains attributes:
+    :param density_map: knowledge about opponent's board
+    :type density_map: instance of DensityMap
+
+    :param chains: number of chains
+    :type chains: int
+
+    :param rng: random number generator (a Numpy Generator or a seed)
+
+    Each chain is a row of placements: index of each ship's placement
+    in placement_table(boards_edge, ship's size), ships in order
+    of sizes.
+    """
+    __slots__ = ("_density_map", "_rng", "_sizes", "_placements",
+                 "_known_sunk", "_counts", "_samples", "_consistent",
+                 "_occupied")
+
+    def __init__(self, density_map: DensityMap, chains: int = CHAINS,
+                 rng=None):
+        """
+        Creates chains of random layouts of ships afloat.
+        """
+        self._density_map = density_map
+        self._rng = np.random.default_rng(rng)
+        self._sizes = sorted(density_map.remaining().elements())
+        fleet = {number: size for number, size in enumerate(self._sizes)}
+        self._placements = random_fleet_layouts(
+            density_map.boards_edge(), chains, fleet, self._rng)
+        fields = density_map.boards_edge() ** 2
+        self._known_sunk = density_map.sunk().copy()
+        self._counts = np.zeros(fields, dtype=np.int64)
+        self._samples = 0
+        self._consistent = True
+        self._occupied = np.zeros((chains, fields), dtype=bool)
+        self._mark_occupied()
+        self.update()
+
+    def density_map(self):
+        """
+        Method that return sampler's density_map attribute.
+        """
+        return self._density_map
+
+    def sizes(self):
+        """
+        Method that returns sizes of ships afloat (in chains' order).
+        """
+        return self._sizes
+
+    def placements(self):
+        """
+        Method that return sampler's placements attribute.
+        """
+        return self._placements
+
+    def chains(self):
+        """
+        Method that returns number of chains.
+        """
+        return len(self._placements)
+
+    def samples(self):
+        """
+        Method that returns number of samples counted since the last
+        shot.
+        """
+        return self._samples
+
+    def consistent(self):
+        """
+        Method that checks whether the chains hold consistent layouts
+        (False if no consistent layout has been found).
+        """
+        return self._consistent
+
+    def _cells(self, ship: int, placements: np.ndarray = None):
+        """
+        Helper method. Returns fields of ship's placements in all
+        the chains (or of the given placements), shape (chains, size).
+        """
+        if placements is None:
+            placements = self._placements[:, ship]
+        table = placement_table(self._density_map.boards_edge(),
+                                self._sizes[ship])
+        return table.cells()[placements]
+
+    def _mark_occupied(self):
+        """
+        Helper method. Marks fields occupied by ships of each chain.
+        """
+        self._occupied[:] = False
+        rows = np.arange(self.chains())[:, None]
+        for ship in range(len(self._sizes)):
+            self._occupied[rows, self._cells(ship)] = True
+
+    def _allowed(self, size: int):
+        """
+        Helper method. Returns boolean array of placements of a ship
+        of given size that don't cover blocked fields and aren't
+        made of hits only.
+        """
+        table = placement_table(self._density_map.boards_edge(), size)
+        hits = self._density_map.hits()
+        return (self._density_map.possible(size)
+                & ~hits[table.cells()].all(axis=1))
+
+    def step(self, ship: int):
+        """
+        Method that makes a Gibbs step of the ship in all the chains:
+        moves it to a placement drawn uniformly from placements that
+        are consistent with the shots and the other ships.
+        """
+        size = self._sizes[ship]
+        cells = placement_table(self._density_map.boards_edge(),
+                                size).cells()
+        rows = np.arange(self.chains())[:, None]
+        self._occupied[rows, self._cells(ship)] = False
+        others = self._occupied
+        legal = self._allowed(size)[None, :] & ~others[:, cells].any(axis=2)
+        hits = self._density_map.hits()
+        if hits.any():
+            needed = hits[None, :] & ~others
+            covered = needed[:, cells].sum(axis=2)
+            legal &= covered == needed.sum(axis=1)[:, None]
+        keys = np.where(legal, self._rng.random(legal.shape), -1.0)
+        chosen = keys.argmax(axis=1)
+        self._placements[:, ship] = chosen
+        self._occupied[rows, cells[chosen]] = True
+
+    def sweep(self):
+        """
+        Method that makes a Gibbs step of every ship.
+        """
+        for ship in range(len(self._sizes)):
+            self.step(ship)
+
+    def sample(self, sweeps: int = SWEEPS_PER_MOVE):
+        """
+        Method that makes given number of sweeps and counts fields
+        covered by the layouts after each of them.
+        """
+        if not self._consistent or not self._sizes:
+            return
+        for _ in range(sweeps):
+            self.sweep()
+            self.count_layouts()
+
+    def count_layouts(self):
+        """
+        Method that counts fields covered by the current layouts
+        of the chains as one sample from each chain.
+        """
+        self._counts += self._occupied.sum(axis=0)
+        self._samples += self.chains()
+
+    def hit_probabilities(self):
+        """
+        Method that returns estimated hit probability of each field
+        (-1 for fields that have been shot at), None if there are
+        no samples.
+        """
+        if not self._samples:
+            return None
+        probabilities = self._counts / self._samples
+        probabilities[self._density_map.tried()] = -1
+        return probabilities
+
+    def _remove_sunk(self):
+        """
+        Helper method of update. Takes ships that have sunk since
+        the last update out of the chains - in each chain the ship
+        placed exactly at the sunk fields if there is one.
+        Returns boolean array of chains which had such ships.
+        """
+        remaining = self._density_map.remaining()
+        sunk = self._density_map.sunk() & ~self._known_sunk
+        self._known_sunk = self._density_map.sunk().copy()
+        matched = np.ones(self.chains(), dtype=bool)
+        for size in sorted(set(self._sizes)):
+            while self._sizes.count(size) > remaining.get(size, 0):
+                ships = [ship for ship, ship_size in enumerate(self._sizes)
+                         if ship_size == size]
+                inside = np.stack([sunk[self._cells(ship)].all(axis=1)
+                                   for ship in ships], axis=1)
+                matched &= inside.any(axis=1)
+                removed = np.array(ships)[inside.argmax(axis=1)]
+                keep = np.ones(self._placements.shape, dtype=bool)
+                keep[np.arange(self.chains()), removed] = False
+                self._placements = self._placements[keep].reshape(
+                    self.chains(), -1)
+                self._sizes.remove(size)
+        return matched
+
+    def _valid_chains(self):
+        """
+        Helper method of update. Returns boolean array of chains
+        holding layouts consistent with the shots.
+        """
+        valid = np.ones(self.chains(), dtype=bool)
+        for ship, size in enumerate(self._sizes):
+            valid &= self._allowed(size)[self._placements[:, ship]]
+        hits = self._density_map.hits()
+        valid &= ~(hits[None, :] & ~self._occupied).any(axis=1)
+        valid &= self._occupied.sum(axis=1) == sum(self._sizes)
+        return valid
+
+    def update(self, deadline: float = None):
+        """
+        Method that brings the chains up to date with the density map
+        after shots. Inconsistent layouts are replaced with copies
+        of consistent ones (or, if there are none, with a layout
+        found from scratch) and counted samples are dropped.
+        If the deadline (a moment of time.perf_counter()) is given,
+        the search from scratch and the rejuvenation stop there.
+        """
+        valid = self._remove_sunk()
+        self._mark_occupied()
+        valid &= self._valid_chains()
+        self._counts[:] = 0
+        self._samples = 0
+        self._consistent = bool(valid.any())
+        if valid.all():
+            return
+        if self._consistent:
+            sources = np.flatnonzero(valid)
+            replaced = np.flatnonzero(~valid)
+            self._placements[replaced] = self._placements[
+                self._rng.choice(sources, len(replaced))]
+        else:
+            layout = self.construct(deadline)
+            self._consistent = layout is not None
+            if not self._consistent:
+                return
+            self._placements[:] = layout
+        self._mark_occupied()
+        for _ in range(REJUVENATION_SWEEPS):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            self.sweep()
+
+    def construct(self, deadline: float = None):
+        """
+        Method that looks for a random consistent layout from scratch:
+        ships covering hits first (the one covering the lowest
+        uncovered hit), then the others, backtracking when a ship
+        doesn't fit. Returns array of placements (in sizes' order)
+        or None if none has been found in CONSTRUCTION_STEPS steps
+        (or before the deadline, if it is given).
+        """
+        if deadline is None:
+            deadline = float("inf")
+        edge = self._density_map.boards_edge()
+        hits = self._density_map.hits()
+        occupied = np.zeros(edge * edge, dtype=bool)
+        layout = [None] * len(self._sizes)
+        steps = [CONSTRUCTION_STEPS]
+
+        def options():
+            unplaced = {}
+            for ship, size in enumerate(self._sizes):
+                if layout[ship] is None:
+                    unplaced.setdefault(size, ship)
+            uncovered = np.flatnonzero(hits & ~occupied)
+            if not len(uncovered) and unplaced:
+                unplaced = dict([next(iter(unplaced.items()))])
+            choices = []
+            for size, ship in unplaced.items():
+                table = placement_table(edge, size)
+                legal = self._allowed(size) & table.legal(occupied)
+                if len(uncovered):
+                    legal &= (table.cells() == uncovered[0]).any(axis=1)
+                choices += [(ship, placement)
+                            for placement in np.flatnonzero(legal)]
+            self._rng.shuffle(choices)
+            return choices
+
+        def place():
+            if all(placement is not None for placement in layout):
+                return not (hits & ~occupied).any()
+            for ship, placement in options():
+                steps[0] -= 1
+                if steps[0] < 0 or time.perf_counter() > deadline:
+                    return False
+                cells = self._cells(ship, placement)
+                layout[ship] = placement
+                occupied[cells] = True
+                if place():
+                    return True
+                layout[ship] = None
+                occupied[cells] = False
+            return False
+
+        if not place():
+            return None
+        return np.array(layout, dtype=np.int64)
+
+
+class MonteCarloBotPlayer(DensityBotPlayer):
+    """
+    Class MonteCarloBotPlayer. Subclass of DensityBotPlayer.
+    Contains all the attributes inherited from DensityBotPlayer.
+    It fires at the field with the highest hit probability estimated
+    by BeliefSampler (sweeps per move bound the time of a move).
+    """
+    __slots__ = ("_belief_sampler", "_sweeps")
+
+    def __init__(self, name: str, game_board: GameBoard,
+                 hits_memory: List[tuple] = None, rng: Random = None,
+                 fleet: dict = None, sweeps: int = SWEEPS_PER_MOVE):
+        super().__init__(name, game_board, hits_memory, rng, fleet)
+        self._belief_sampler = None
+        self._sweeps = sweeps
+
+    def belief_sampler(self, player: HumanPlayer = None):
+        """
+        Method that return player's belief_sampler attribute.
+        If it doesn't exist yet it is created for the given opponent.
+        """
+        if self._belief_sampler is None and player is not None:
+            self._belief_sampler = BeliefSampler(
+                self.density_map(player), rng=self.rng().getrandbits(64))
+        return self._belief_sampler
+
+    def choose_new_hit(self, player: HumanPlayer):
+        """
+        Method that chooses one of the fields with the highest
+        estimated hit probability (or uses the density map, if the
+        sampler has no consistent layouts). Bringing the chains up
+        to date takes at most UPDATE_TIME_BUDGET.
+        """
+        sampler = self.belief_sampler(player)
+        sampler.update(time.perf_counter() + UPDATE_TIME_BUDGET)
+        sampler.sample(self._sweeps)
+        shot = self.most_likely_shot()
+        if shot is None:
+            return super().choose_new_hit(player)
+        return shot
+
+    def most_likely_shot(self):
+        """
+        Method that returns one of the coordinates with the highest
+        estimated hit probability (None if there are no samples).
+        """
+        probabilities = self.belief_sampler().hit_probabilities()
+        if probabilities is None:
+            return None
+        best_fields = np.flatnonzero(probabilities == probabilities.max())
+        cell = int(best_fields[self.rng().randrange(len(best_fields))])
+        return divmod(cell, self.game_board().boards_edge())
+
+    def refine_shots(self, player: HumanPlayer, deadline: float):
+        """
+        Method that yields the density map's shot and then, after each
+        sweep of the sampler (at most sweeps of them), the most likely
+        shot according to the samples gathered so far. It also yields
+        None after each Gibbs step, so a sweep can be cut short.
+        """
+        yield from super().refine_shots(player, deadline)
+        sampler = self.belief_sampler(player)
+        sampler.update(deadline)
+        if not sampler.consistent() or not sampler.sizes():
+            return
+        for _ in range(self._sweeps):
+            for ship in range(len(sampler.sizes())):
+                yield None
+                sampler.step(ship)
+            sampler.count_layouts()
+            yield self.most_likely_shot()
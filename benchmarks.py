@@ -0,0 +1,664 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from random import Random
+import numpy as np
+from game_board import GameBoard
+from players import BotPlayer
+from ship import Ship, naval_fleet
+
+"""
+This file contains benchmarks of the game engine.
+
+The benchmark suite times the engine's hot paths, each operation
+on boards of different sizes, and reports median time of the operation
+(in seconds) over repetitions. Results are stored as JSON, so runs
+of two revisions can be compared and regressions flagged:
+
+    python benchmarks.py run --output new.json
+    python benchmarks.py compare old.json new.json
+    python benchmarks.py revisions HEAD~1 HEAD
+
+The suite uses only the public API of game board, ship and players,
+so it can be run against older revisions of the game (ones in which
+Bot Player takes its random number generator). The other benchmarks
+compare backends and measure newer parts of the engine - they import
+those parts when they are run, so the file can still be copied into
+older trees. "python benchmarks.py report" (or no command) prints
+their results.
+"""
+
+"""
+Boards' edges the benchmarks are run for by default.
+"""
+DEFAULT_EDGES = (8, 16, 32, 64, 128, 256, 512, 1024)
+
+"""
+Largest boards' edge of the full game benchmark (a game on a board
+with edge n takes up to n * n shots from each player).
+"""
+FULL_GAME_MAX_EDGE = 256
+
+"""
+Number of shots fired in one repetition of the shot benchmarks
+(or fewer, when the board has fewer fields).
+"""
+SHOTS_PER_REPETITION = 1000
+
+"""
+Relative slow down above which a benchmark is flagged as a regression.
+"""
+DEFAULT_THRESHOLD = 0.10
+
+RESULTS_VERSION = 1
+
+
+def arranged_board(board_class, boards_edge: int, seed: int = 0):
+    """
+    Function that creates game board of given class with
+    a randomly arranged fleet.
+    """
+    bot = BotPlayer("Opponent", board_class(boards_edge), rng=Random(seed))
+    bot.opponent_arranges_ships_on_board()
+    return bot.game_board()
+
+
+def board_bytes(board):
+    """
+    Function that returns number of bytes taken by board's fields
+    and by the memory of a player attacking the board.
+    """
+    from bitboard import BitGameBoard
+    memory = board.new_memory()
+    if isinstance(board, BitGameBoard):
+        memory[(0, 0)] = 1
+        layers = (board.ships(), board.hits(), board.misses(), memory.bits())
+        return sum(sys.getsizeof(layer) for layer in layers)
+    return board.ocean_grid().nbytes + memory.nbytes
+
+
+def bench_board_backends(boards_edge: int = 10, repeat: int = 200):
+    """
+    Function that measures average time of resolving a shot
+    (resolve_shot plus marking the shot in player's memory)
+    on the Numpy and on the bitboard game board.
+    Every field of the board is shot once in each repetition.
+    Returns dictionary: backend's name -> (seconds per shot, bytes).
+    """
+    from bitboard import BitGameBoard
+    shots = [(y_coordinate, x_coordinate)
+             for y_coordinate in range(boards_edge)
+             for x_coordinate in range(boards_edge)]
+    Random(0).shuffle(shots)
+    results = {}
+    backends = (("numpy", GameBoard), ("bitboard", BitGameBoard))
+    for name, board_class in backends:
+        elapsed = 0.0
+        for repetition in range(repeat):
+            board = arranged_board(board_class, boards_edge, repetition)
+            memory = board.new_memory()
+            start = time.perf_counter()
+            for shot in shots:
+                memory[shot] = 1
+                board.resolve_shot(shot)
+            elapsed += time.perf_counter() - start
+        results[name] = (elapsed / (repeat * len(shots)),
+                         board_bytes(arranged_board(board_class, boards_edge)))
+    return results
+
+
+def numpy_hits_neighbours(ocean_grid):
+    """
+    Function that returns number of fields that have been shot at and
+    boolean array of not shot fields next to hits, using Numpy slicing.
+    """
+    hits = ocean_grid == 2
+    near_hits = np.zeros_like(hits)
+    near_hits[1:, :] |= hits[:-1, :]
+    near_hits[:-1, :] |= hits[1:, :]
+    near_hits[:, 1:] |= hits[:, :-1]
+    near_hits[:, :-1] |= hits[:, 1:]
+    return np.count_nonzero(ocean_grid >= 2), near_hits & (ocean_grid < 2)
+
+
+def bitboard_hits_neighbours(board: "BitGameBoard"):
+    """
+    Function that returns number of fields that have been shot at and
+    bitboard of not shot fields next to hits, using bitboard shifts.
+    """
+    from bitboard import neighbours, popcount
+    shot_before = board.shot_before()
+    near_hits = neighbours(board.hits(), board.boards_edge())
+    return popcount(shot_before), near_hits & ~shot_before
+
+
+def bench_bulk_queries(boards_edge: int = 10, repeat: int = 2000):
+    """
+    Function that measures average time of a whole board query
+    (counting shot fields and finding not shot fields next to hits)
+    in the middle of a game on the Numpy and on the bitboard game board.
+    Returns dictionary: backend's name -> seconds per query.
+    """
+    from bitboard import BitGameBoard
+    shots = [(y_coordinate, x_coordinate)
+             for y_coordinate in range(boards_edge)
+             for x_coordinate in range(boards_edge)]
+    Random(0).shuffle(shots)
+    numpy_board = arranged_board(GameBoard, boards_edge)
+    bit_board = arranged_board(BitGameBoard, boards_edge)
+    for shot in shots[:len(shots) // 2]:
+        numpy_board.resolve_shot(shot)
+        bit_board.resolve_shot(shot)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        numpy_hits_neighbours(numpy_board.ocean_grid())
+    numpy_time = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        bitboard_hits_neighbours(bit_board)
+    bitboard_time = (time.perf_counter() - start) / repeat
+    return {"numpy": numpy_time, "bitboard": bitboard_time}
+
+
+def bench_batch_board(boards_edge: int = 10, games: int = 10000,
+                      rounds: int = 50):
+    """
+    Function that measures how many shots per second BatchGameBoard
+    resolves when every game of the batch gets a random shot each round.
+    """
+    from batch_board import batch_from_layouts
+    from placements import random_fleet_layouts
+    batch = batch_from_layouts(
+        boards_edge, random_fleet_layouts(boards_edge, games, rng=0))
+    rng = np.random.default_rng(0)
+    shots = [(rng.integers(0, boards_edge, games),
+              rng.integers(0, boards_edge, games)) for _ in range(rounds)]
+    start = time.perf_counter()
+    for y_coordinates, x_coordinates in shots:
+        batch.fire(y_coordinates, x_coordinates)
+    return games * rounds / (time.perf_counter() - start)
+
+
+def live_game(boards_edge: int, rng: Random, board_class=GameBoard):
+    """
+    Function that creates a live game: two Bot Players, each with
+    its own game board (of given class), arranged fleet and memory.
+    """
+    from simulation import new_bot_player
+    return (new_bot_player(boards_edge, rng, board_class),
+            new_bot_player(boards_edge, rng, board_class))
+
+
+def bench_live_game_memory(boards_edge: int = 10, games: int = 2000,
+                           board_class=GameBoard):
+    """
+    Function that measures memory taken by live games (all the objects
+    allocated while creating them, traced by tracemalloc).
+    Returns number of bytes per live game.
+    """
+    rng = Random(0)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        live_games = [live_game(boards_edge, rng, board_class)
+                      for _ in range(games)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(live_games)
+
+
+def bench_position_hash(boards_edge: int = 10, repeat: int = 2000):
+    """
+    Function that measures time (in seconds) of getting identity
+    of a board's position: hashing bytes of the ocean grid
+    and reading the board's Zobrist hash.
+    """
+    board = arranged_board(GameBoard, boards_edge)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        hash(board.ocean_grid().tobytes())
+    grid_bytes = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        board.zobrist_hash()
+    zobrist = (time.perf_counter() - start) / repeat
+    return {"tobytes": grid_bytes, "zobrist": zobrist}
+
+
+def bench_belief_sampler(boards_edge: int = 10, sweeps: int = 50):
+    """
+    Function that measures how many layouts per second the belief
+    sampler draws for naval fleet on an empty board.
+    """
+    from belief_sampler import BeliefSampler
+    from density_bot import DensityMap
+    sampler = BeliefSampler(DensityMap(boards_edge, [5, 4, 3, 3, 2]), rng=0)
+    start = time.perf_counter()
+    sampler.sample(sweeps)
+    return sampler.samples() / (time.perf_counter() - start)
+
+
+def bench_layout_keys(boards_edge: int = 10, count: int = 100000):
+    """
+    Function that measures how many layouts per second get their
+    symmetry-canonical keys.
+    """
+    from placements import random_fleet_layouts
+    from symmetry import layout_keys
+    layouts = random_fleet_layouts(boards_edge, count, rng=0)
+    start = time.perf_counter()
+    layout_keys(boards_edge, layouts)
+    return count / (time.perf_counter() - start)
+
+
+def median_time(operation, setup, repeat: int):
+    """
+    Function that runs setup and then times operation (called with
+    setup's result) given number of times. operation returns number
+    of the timed operations it has performed.
+    Returns median time of one operation.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        operations = operation(state)
+        times.append((time.perf_counter() - start) / operations)
+    return statistics.median(times)
+
+
+def arranged_bot(boards_edge: int, rng: Random):
+    """
+    Function that creates Bot Player with randomly arranged fleet.
+    """
+    bot = BotPlayer("Opponent", GameBoard(boards_edge), rng=rng)
+    bot.opponent_arranges_ships_on_board()
+    return bot
+
+
+def stacked_fleet():
+    """
+    Function that creates ships of the fleet placed horizontally
+    one under another, starting from the top left corner.
+    """
+    return [Ship(name, size, [(row, column) for column in range(size)])
+            for row, (name, size) in enumerate(naval_fleet.items())]
+
+
+def bench_add_ship(boards_edge: int, repeat: int, rng: Random):
+    """
+    Function that times GameBoard.add_ship.
+    """
+    def setup():
+        return GameBoard(boards_edge), stacked_fleet()
+
+    def operation(state):
+        board, fleet = state
+        for each_ship in fleet:
+            board.add_ship(each_ship)
+        return len(fleet)
+    return median_time(operation, setup, repeat)
+
+
+def random_shots(boards_edge: int, rng: Random):
+    """
+    Function that returns distinct random coordinates for the shot
+    benchmarks.
+    """
+    fields = boards_edge * boards_edge
+    shots = rng.sample(range(fields), min(fields, SHOTS_PER_REPETITION))
+    return [divmod(field, boards_edge) for field in shots]
+
+
+def bench_set_new_board_status(boards_edge: int, repeat: int, rng: Random):
+    """
+    Function that times GameBoard.set_new_board_status.
+    """
+    def setup():
+        return arranged_bot(boards_edge, rng).game_board(), \
+            random_shots(boards_edge, rng)
+
+    def operation(state):
+        board, shots = state
+        for shot in shots:
+            board.set_new_board_status(shot)
+        return len(shots)
+    return median_time(operation, setup, repeat)
+
+
+def bench_ship_hull_placement(boards_edge: int, repeat: int, rng: Random):
+    """
+    Function that times Player.ship_hull_placement on a board
+    with arranged fleet.
+    """
+    def setup():
+        return arranged_bot(boards_edge, rng), random_shots(boards_edge, rng)
+
+    def operation(state):
+        bot, bows = state
+        for bow in bows:
+            bot.ship_hull_placement(bow, 3)
+        return len(bows)
+    return median_time(operation, setup, repeat)
+
+
+def bench_arrange_ships(boards_edge: int, repeat: int, rng: Random):
+    """
+    Function that times BotPlayer.opponent_arranges_ships_on_board
+    (the whole fleet).
+    """
+    def setup():
+        return BotPlayer("Opponent", GameBoard(boards_edge), rng=rng)
+
+    def operation(bot):
+        bot.opponent_arranges_ships_on_board()
+        return 1
+    return median_time(operation, setup, repeat)
+
+
+def bench_attack_player(boards_edge: int, repeat: int, rng: Random):
+    """
+    Function that times BotPlayer.attack_player (until its opponent
+    loses or the shots of a repetition are fired).
+    """
+    def setup():
+        shots = min(boards_edge * boards_edge, SHOTS_PER_REPETITION)
+        return (arranged_bot(boards_edge, rng), arranged_bot(boards_edge, rng),
+                shots)
+
+    def operation(state):
+        bot, opponent, shots = state
+        for shot in range(shots):
+            if bot.attack_player(opponent)[3]:
+                return shot + 1
+        return shots
+    return median_time(operation, setup, repeat)
+
+
+def bench_full_game(boards_edge: int, repeat: int, rng: Random):
+    """
+    Function that times a full game of two Bot Players
+    (arranging fleets included).
+    """
+    def setup():
+        return None
+
+    def operation(_):
+        first = arranged_bot(boards_edge, rng)
+        second = arranged_bot(boards_edge, rng)
+        while True:
+            if first.attack_player(second)[3]:
+                return 1
+            if second.attack_player(first)[3]:
+                return 1
+    return median_time(operation, setup, repeat)
+
+
+"""
+Benchmarks of the suite: name -> (benchmark, largest boards' edge).
+"""
+BENCHMARKS = {
+    "add_ship": (bench_add_ship, None),
+    "set_new_board_status": (bench_set_new_board_status, None),
+    "ship_hull_placement": (bench_ship_hull_placement, None),
+    "arrange_ships": (bench_arrange_ships, None),
+    "attack_player": (bench_attack_player, None),
+    "full_game": (bench_full_game, FULL_GAME_MAX_EDGE),
+}
+
+
+def repetitions(boards_edge: int, repeat: int):
+    """
+    Function that returns number of repetitions on the board - fewer
+    on big boards, whose setup is expensive (at least 3).
+    """
+    return max(3, repeat * 64 // max(64, boards_edge))
+
+
+def run_suite(edges=DEFAULT_EDGES, repeat: int = 20, names=None,
+              seed: int = 0):
+    """
+    Function that runs the benchmarks of the suite for given boards'
+    edges. Each benchmark draws from its own Random(seed), so runs
+    are repeatable. Returns dictionary: benchmark's name ->
+    {edge: seconds} (edges as strings, the way they are stored in JSON).
+    """
+    results = {}
+    for name, (benchmark, max_edge) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        results[name] = {}
+        for boards_edge in edges:
+            if max_edge is not None and boards_edge > max_edge:
+                continue
+            results[name][str(boards_edge)] = benchmark(
+                boards_edge, repetitions(boards_edge, repeat), Random(seed))
+    return results
+
+
+def git_revision(path: str = None):
+    """
+    Function that returns current git revision of the tree
+    (None outside of a git repository).
+    """
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=path, capture_output=True,
+            text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def results_document(results: dict, revision: str = None):
+    """
+    Function that wraps results with information about the run.
+    """
+    return {
+        "version": RESULTS_VERSION,
+        "revision": revision or git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare_results(base: dict, new: dict,
+                    threshold: float = DEFAULT_THRESHOLD):
+    """
+    Function that compares two results documents. Returns list of rows
+    (benchmark, edge, base seconds, new seconds, ratio, regression)
+    for benchmarks present in both of them. Regression is flagged when
+    the new time is slower by more than threshold.
+    """
+    rows = []
+    for name, base_times in base["results"].items():
+        new_times = new["results"].get(name, {})
+        for edge, base_time in base_times.items():
+            if edge not in new_times:
+                continue
+            ratio = new_times[edge] / base_time
+            rows.append((name, int(edge), base_time, new_times[edge],
+                         ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_results(results: dict):
+    """
+    Function that formats results as a table.
+    """
+    lines = []
+    for name, times in results.items():
+        for edge, seconds in times.items():
+            lines.append(f"{name:22} edge {int(edge):5} "
+                         f"{seconds * 1e6:14.2f} us")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list):
+    """
+    Function that formats compared results as a table.
+    """
+    lines = []
+    for name, edge, base_time, new_time, ratio, regression in rows:
+        flag = "REGRESSION" if regression else ""
+        lines.append(f"{name:22} edge {edge:5} {base_time * 1e6:14.2f} us "
+                     f"{new_time * 1e6:14.2f} us {ratio:7.2f}x {flag}")
+    return "\n".join(lines)
+
+
+def run_revision(revision: str, arguments: list):
+    """
+    Function that runs this suite against the given git revision,
+    checked out in a temporary worktree. Returns results document.
+    """
+    directory = tempfile.mkdtemp(prefix="battleships-bench-")
+    tree = os.path.join(directory, "tree")
+    output = os.path.join(directory, "results.json")
+    subprocess.run(["git", "worktree", "add", "--detach", tree, revision],
+                   check=True, capture_output=True)
+    try:
+        shutil.copy(os.path.abspath(__file__),
+                    os.path.join(tree, "benchmarks.py"))
+        subprocess.run([sys.executable, "benchmarks.py", "run",
+                        "--output", output, "--revision",
+                        git_revision(tree)] + arguments,
+                       cwd=tree, check=True)
+        with open(output) as results_file:
+            return json.load(results_file)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", tree],
+                       check=False, capture_output=True)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def save(document: dict, path: str):
+    """
+    Function that writes results document as JSON.
+    """
+    with open(path, "w") as results_file:
+        json.dump(document, results_file, indent=2)
+
+
+def load(path: str):
+    """
+    Function that reads results document.
+    """
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def suite_arguments(arguments):
+    """
+    Function that turns parsed options of the run back into
+    command line arguments (passed to runs of other revisions).
+    """
+    options = ["--repeat", str(arguments.repeat), "--edges"]
+    options += [str(edge) for edge in arguments.edges]
+    if arguments.only:
+        options += ["--only"] + arguments.only
+    return options
+
+
+def print_report():
+    """
+    Function that prints results of the benchmarks that aren't
+    in the suite.
+    """
+    from sparse_board import SparseGameBoard
+    for boards_edge in (8, 10, 16):
+        results = bench_board_backends(boards_edge)
+        for name, (seconds_per_shot, size) in results.items():
+            print(f"edge {boards_edge:3} {name:9} "
+                  f"{seconds_per_shot * 1e9:8.0f} ns/shot {size:6} bytes")
+        for name, seconds in bench_bulk_queries(boards_edge).items():
+            print(f"edge {boards_edge:3} {name:9} "
+                  f"{seconds * 1e9:8.0f} ns/board query")
+        print(f"edge {boards_edge:3} batch     "
+              f"{bench_batch_board(boards_edge):10.0f} shots/s")
+        for name, seconds in bench_position_hash(boards_edge).items():
+            print(f"edge {boards_edge:3} {name:9} "
+                  f"{seconds * 1e9:8.0f} ns/position hash")
+        print(f"edge {boards_edge:3} keys      "
+              f"{bench_layout_keys(boards_edge):10.0f} layouts/s")
+        print(f"edge {boards_edge:3} sampler   "
+              f"{bench_belief_sampler(boards_edge):10.0f} layouts/s")
+        print(f"edge {boards_edge:3} live game "
+              f"{bench_live_game_memory(boards_edge):10.0f} bytes")
+    for boards_edge in (10, 1000, 10000):
+        games = max(1, 2000 // boards_edge)
+        for name, board_class in (("numpy", GameBoard),
+                                  ("sparse", SparseGameBoard)):
+            size = bench_live_game_memory(boards_edge, games, board_class)
+            print(f"edge {boards_edge:5} {name:6} live game "
+                  f"{size:12.0f} bytes")
+
+
+def main(argv: list = None):
+    """
+    Function that runs the benchmarks from the command line.
+    Returns exit status (1 when a regression has been found).
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmarks of the game engine")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("report", help="print results of the benchmarks "
+                                       "that aren't in the suite")
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    compare_parser = commands.add_parser(
+        "compare", help="compare two results files")
+    revisions_parser = commands.add_parser(
+        "revisions", help="run the benchmarks on two git revisions "
+                          "and compare them")
+    for each_parser in (run_parser, revisions_parser):
+        each_parser.add_argument("--edges", type=int, nargs="+",
+                                 default=list(DEFAULT_EDGES))
+        each_parser.add_argument("--repeat", type=int, default=20)
+        each_parser.add_argument("--only", nargs="+",
+                                 choices=list(BENCHMARKS))
+    run_parser.add_argument("--output")
+    run_parser.add_argument("--revision", help=argparse.SUPPRESS)
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    revisions_parser.add_argument("base")
+    revisions_parser.add_argument("new")
+    for each_parser in (compare_parser, revisions_parser):
+        each_parser.add_argument("--threshold", type=float,
+                                 default=DEFAULT_THRESHOLD)
+    arguments = parser.parse_args(argv)
+
+    if arguments.command in (None, "report"):
+        print_report()
+        return 0
+    if arguments.command == "run":
+        results = run_suite(arguments.edges, arguments.repeat,
+                            arguments.only)
+        print(format_results(results))
+        if arguments.output:
+            save(results_document(results, arguments.revision),
+                 arguments.output)
+        return 0
+    if arguments.command == "compare":
+        base, new = load(arguments.base), load(arguments.new)
+    else:
+        options = suite_arguments(arguments)
+        base = run_revision(arguments.base, options)
+        new = run_revision(arguments.new, options)
+    rows = compare_results(base, new, arguments.threshold)
+    print(format_comparison(rows))
+    if any(row[-1] for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
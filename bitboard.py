@@ -0,0 +1,278 @@
+from typing import List
+import numpy as np
+from game_board import GameBoard
+from ship import Ship
+
+"""
+This file contains bitboard backend of the game board. Instead of one
+integer per field it keeps each layer of the board (ships, hits, misses,
+fields chosen before) as a single Python int, in which the field (y, x)
+is the bit number y * boards_edge + x.
+A layer of a 10*10 board takes 40 bytes instead of 800 and questions
+about many fields at once (how many, which of them, which are next to
+them) are answered with a few integer operations.
+"""
+
+
+def bit_of(coordinate: tuple, boards_edge: int):
+    """
+    Function that returns mask with only the bit of the given field set.
+    """
+    y_coordinate, x_coordinate = coordinate
+    return 1 << (y_coordinate * boards_edge + x_coordinate)
+
+
+def popcount(mask: int):
+    """
+    Function that returns number of fields set in a mask.
+    """
+    return mask.bit_count()
+
+
+def mask_to_array(mask: int, boards_edge: int):
+    """
+    Function that turns a mask into a boolean Numpy array
+    of shape (boards_edge, boards_edge).
+    """
+    fields = boards_edge * boards_edge
+    mask_bytes = mask.to_bytes((fields + 7) // 8, "little")
+    bits = np.unpackbits(np.frombuffer(mask_bytes, dtype=np.uint8),
+                         bitorder="little")
+    return bits[:fields].astype(bool).reshape(boards_edge, boards_edge)
+
+
+def array_to_mask(array: np.ndarray):
+    """
+    Function that turns a boolean Numpy array of board's fields
+    (of shape (boards_edge, boards_edge) or flat) into a mask.
+    """
+    packed = np.packbits(np.ravel(array).astype(bool), bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def column_mask(boards_edge: int, x_coordinate: int):
+    """
+    Function that returns mask of all the fields in the given column.
+    """
+    row_step = (1 << (boards_edge * boards_edge)) - 1
+    row_step //= (1 << boards_edge) - 1
+    return row_step << x_coordinate
+
+
+def neighbours(mask: int, boards_edge: int):
+    """
+    Function that returns mask of fields which are one field
+    to the left/right/up/down from any field of the given mask
+    (without the fields of the mask itself).
+    """
+    full_board = (1 << (boards_edge * boards_edge)) - 1
+    not_first_column = full_board ^ column_mask(boards_edge, 0)
+    not_last_column = full_board ^ column_mask(boards_edge, boards_edge - 1)
+    neighbours_mask = (mask & not_first_column) >> 1
+    neighbours_mask |= (mask & not_last_column) << 1
+    neighbours_mask |= mask >> boards_edge
+    neighbours_mask |= mask << boards_edge
+    return neighbours_mask & full_board & ~mask
+
+
+class BitMemory:
+    """
+    Class BitMemory. Player's memory of chosen coordinates kept as
+    a bitboard. It can be indexed with a coordinate just like
+    the Numpy array memory (1 - chosen before, 0 - not chosen).
+    Contains attributes:
+    :param boards_edge: length of Game Board's edge.
+    :type boards_edge: int
+
+    :param bits: chosen before fields
+    :type bits: int (bitboard)
+    """
+    __slots__ = ("_boards_edge", "_bits")
+
+    def __init__(self, boards_edge: int, bits: int = 0):
+        """
+        Creates instance of a bitboard memory.
+        """
+        self._boards_edge = boards_edge
+        self._bits = bits
+
+    def boards_edge(self):
+        """
+        Method that return memory's boards_edge attribute.
+        """
+        return self._boards_edge
+
+    def bits(self):
+        """
+        Method that return memory's bits attribute.
+        """
+        return self._bits
+
+    def popcount(self):
+        """
+        Method that returns number of chosen before fields.
+        """
+        return popcount(self._bits)
+
+    def __getitem__(self, coordinate: tuple):
+        y_coordinate, x_coordinate = coordinate
+        field = y_coordinate * self._boards_edge + x_coordinate
+        return self._bits >> field & 1
+
+    def __setitem__(self, coordinate: tuple, value: int):
+        y_coordinate, x_coordinate = coordinate
+        bit = 1 << (y_coordinate * self._boards_edge + x_coordinate)
+        if value:
+            self._bits |= bit
+        else:
+            self._bits &= ~bit
+
+
+class BitGameBoard(GameBoard):
+    """
+    Class BitGameBoard. Subclass of GameBoard that keeps ships, hits and
+    misses as bitboards. It is a drop-in replacement of GameBoard -
+    ocean_grid() returns a Numpy array built from the bitboards,
+    which is a snapshot, so the board has to be changed only through
+    its methods (add_ship, set_new_board_status, resolve_shot).
+    Players using this board get BitMemory as their memory.
+    """
+    __slots__ = ("_ships", "_hits", "_misses", "_ship_index")
+
+    def __init__(self, boards_edge: int, fleet: List["Ship"] = None):
+        """
+        Creates instance of a bitboard game board.
+        """
+        self._boards_edge = boards_edge
+        self._ships = 0
+        self._hits = 0
+        self._misses = 0
+        self._ship_index = {}
+        self._ships_afloat = 0
+        self._zobrist_hash = 0
+        if not fleet:
+            self._fleet = []
+        else:
+            self._fleet = fleet
+        for ship_number, each_ship in enumerate(self._fleet, 1):
+            self._place_ship(each_ship, ship_number)
+
+    def ships(self):
+        """
+        Method that return game board's ships attribute (bitboard).
+        """
+        return self._ships
+
+    def hits(self):
+        """
+        Method that return game board's hits attribute (bitboard).
+        """
+        return self._hits
+
+    def misses(self):
+        """
+        Method that return game board's misses attribute (bitboard).
+        """
+        return self._misses
+
+    def shot_before(self):
+        """
+        Method that returns bitboard of fields that have been shot at.
+        """
+        return self._hits | self._misses
+
+    def ocean_grid(self):
+        """
+        Method that returns ocean grid built from the bitboards
+        (0 - empty, 1 - ship, 2 - successful hit, 3 - missed shot).
+        """
+        edge = self.boards_edge()
+        ocean_grid = mask_to_array(self._ships, edge).astype(np.uint8)
+        ocean_grid[mask_to_array(self._hits, edge)] = 2
+        ocean_grid[mask_to_array(self._misses, edge)] = 3
+        return ocean_grid
+
+    def new_memory(self):
+        """
+        Method that creates an empty bitboard player's memory.
+        """
+        return BitMemory(self.boards_edge())
+
+    def field_status(self, coordinate: tuple):
+        """
+        Method that returns status of a single field:
+        0 - empty, 1 - ship, 2 - successful hit, 3 - missed shot.
+        """
+        y_coordinate, x_coordinate = coordinate
+        bit = 1 << (y_coordinate * self._boards_edge + x_coordinate)
+        if self._hits & bit:
+            return 2
+        if self._misses & bit:
+            return 3
+        if self._ships & bit:
+            return 1
+        return 0
+
+    def occupied_fields(self):
+        """
+        Method that returns flat boolean array (field number
+        y * boards_edge + x) of fields occupied by ships.
+        """
+        return mask_to_array(self._ships, self.boards_edge()).ravel()
+
+    def ship_at(self, coordinate: tuple):
+        """
+        Method that returns ship placed at the given coordinate
+        (None if the field is empty).
+        """
+        return self._ship_index.get(tuple(coordinate))
+
+    def _place_ship(self, new_ship: "Ship", ship_number: int):
+        """
+        Helper method of add_ship. Marks ship's fields on ships bitboard
+        and in the index of occupied fields (a dictionary, so the ship's
+        number is not needed).
+        """
+        for each_ship_coordinate in new_ship.coordinates():
+            self._rehash(each_ship_coordinate,
+                         self.field_status(each_ship_coordinate), 1)
+            self._ships |= bit_of(each_ship_coordinate, self.boards_edge())
+            self._ship_index[each_ship_coordinate] = new_ship
+        if new_ship.is_it_afloat():
+            self._ships_afloat += 1
+
+    def add_ship(self, new_ship: "Ship"):
+        """
+        Method that adds a new ship to a list of ships on game board.
+        """
+        self.fleet().append(new_ship)
+        self._place_ship(new_ship, len(self.fleet()))
+        return self.ocean_grid()
+
+    def resolve_shot(self, new_hit: tuple):
+        """
+        Method that marks the result of a shot on hits or misses bitboard
+        and returns the ship that has been hit (None if the shot missed).
+        The first hit at each of ship's fields takes its hit point.
+        """
+        y_coordinate, x_coordinate = new_hit
+        bit = 1 << (y_coordinate * self._boards_edge + x_coordinate)
+        damaged_ship = self._ship_index.get(new_hit)
+        if damaged_ship:
+            if not self._hits & bit:
+                self._hits |= bit
+                self._rehash(new_hit, 1, 2)
+                if not damaged_ship.register_hit():
+                    self._ships_afloat -= 1
+        elif not self._misses & bit:
+            self._misses |= bit
+            self._rehash(new_hit, 0, 3)
+        return damaged_ship
+
+    def set_new_board_status(self, new_hit: tuple):
+        """
+        Method that sets new board status. It is performed after player's move.
+        Returns ocean grid, like GameBoard's method.
+        """
+        self.resolve_shot(new_hit)
+        return self.ocean_grid()
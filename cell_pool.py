@@ -0,0 +1,105 @@
+from array import array
+from random import Random
+
+"""
+This file contains pool of fields that haven't been chosen yet.
+"""
+
+"""
+Largest pool whose field numbers fit in unsigned 2-byte items.
+Bigger pools start sparse.
+"""
+SHORT_POOL_SIZE = 1 << 16
+
+
+class CellPool:
+    """
+    Class CellPool. Set of field numbers (y * boards_edge + x) from which
+    a random field can be drawn and removed in constant time.
+    Fields are kept in an array, and the removed field's place is taken
+    by the last one (swap-remove), so the array never has gaps.
+    Contains attributes:
+    :param size: number of fields in the pool at the beginning
+    (fields 0, 1, ..., size - 1)
+    :type size: int
+
+    Field numbers are kept in 2-byte items when they fit in them.
+    Pools of huge boards start sparse - only removed fields are kept
+    (in a set) and a field is drawn by drawing any field until it hasn't
+    been removed. When half of the fields have been removed the pool
+    switches to the arrays, so a draw never needs more than two tries
+    on average.
+    """
+    __slots__ = ("_size", "_cells", "_positions", "_removed")
+
+    def __init__(self, size: int):
+        """
+        Creates pool of all the fields.
+        """
+        self._size = size
+        self._cells = None
+        self._positions = None
+        self._removed = None
+        if size <= SHORT_POOL_SIZE:
+            self._cells = array("H", range(size))
+            self._positions = array("H", range(size))
+        else:
+            self._removed = set()
+
+    def sparse(self):
+        """
+        Method that checks whether the pool keeps only removed fields.
+        """
+        return self._removed is not None
+
+    def _make_dense(self):
+        """
+        Helper method of remove. Switches sparse pool to the arrays.
+        """
+        removed = self._removed
+        self._removed = None
+        self._cells = array("l", range(self._size))
+        self._positions = array("l", range(self._size))
+        for cell in removed:
+            self.remove(cell)
+
+    def __len__(self):
+        if self.sparse():
+            return self._size - len(self._removed)
+        return len(self._cells)
+
+    def __contains__(self, cell: int):
+        if self.sparse():
+            return 0 <= cell < self._size and cell not in self._removed
+        position = self._positions[cell]
+        return position < len(self._cells) and self._cells[position] == cell
+
+    def remove(self, cell: int):
+        """
+        Method that removes the field from the pool.
+        Returns False if the field has been removed before.
+        """
+        if cell not in self:
+            return False
+        if self.sparse():
+            self._removed.add(cell)
+            if 2 * len(self._removed) > self._size:
+                self._make_dense()
+            return True
+        position = self._positions[cell]
+        last_cell = self._cells.pop()
+        if last_cell != cell:
+            self._cells[position] = last_cell
+            self._positions[last_cell] = position
+        return True
+
+    def draw(self, rng: Random):
+        """
+        Method that returns random field of the pool (without removing it).
+        """
+        if self.sparse():
+            cell = rng.randrange(self._size)
+            while cell in self._removed:
+                cell = rng.randrange(self._size)
+            return cell
+        return self._cells[rng.randrange(len(self._cells))]
@@ -0,0 +1,90 @@
+"""
+This file contains codec of coordinates entered by players.
+Columns are labeled with letters like in a spreadsheet
+(A, B, ..., Z, AA, AB, ..., ZZ, AAA, ...) and rows with numbers from 1,
+so "AB12" is the field in the 28th column of the 12th row.
+A coordinate can also be given as two numbers, row and column
+(both from 1), e.g. "12,28" - the same field as "AB12".
+"""
+
+"""
+Number of letters used in column labels.
+"""
+LETTERS = 26
+
+"""
+Longest accepted coordinate (in characters).
+"""
+MAX_COORDINATE_LENGTH = 16
+
+
+def column_label(x_coordinate: int):
+    """
+    Function that returns label of the column (x_coordinate from 0).
+    """
+    label = ""
+    number = x_coordinate + 1
+    while number:
+        number, letter = divmod(number - 1, LETTERS)
+        label = chr(letter + 65) + label
+    return label
+
+
+def column_number(label: str):
+    """
+    Function that returns x coordinate of the column with given label
+    (letters of any case).
+    """
+    number = 0
+    for letter in label.upper():
+        number = number * LETTERS + ord(letter) - 64
+    return number - 1
+
+
+def encode_coordinate(coordinate: tuple):
+    """
+    Function that encodes coordinate the way players enter it ("AB12").
+    """
+    y_coordinate, x_coordinate = coordinate
+    return f"{column_label(x_coordinate)}{y_coordinate + 1}"
+
+
+def is_letter(character: str):
+    """
+    Function that checks whether the character is a latin letter.
+    """
+    return character.isascii() and character.isalpha()
+
+
+def is_number(text: str):
+    """
+    Function that checks whether the text is made of digits 0-9 only.
+    """
+    return text.isascii() and text.isdecimal()
+
+
+def decode_coordinate(text: str):
+    """
+    Function that decodes coordinate entered by a player
+    (letters and row's number, or row's and column's numbers separated
+    with a comma). Returns coordinate (y, x) counted from 0.
+    Raises ValueError with a message for the player if the text
+    is not a coordinate (it doesn't check whether it is on the board).
+    """
+    if text is None or not 2 <= len(text) <= MAX_COORDINATE_LENGTH:
+        raise ValueError("Improper coordinate's length. Try again.")
+    if "," in text:
+        row, _, column = text.partition(",")
+        row, column = row.strip(), column.strip()
+        if not is_number(row) or not is_number(column):
+            raise ValueError("Row and column should be integers. Try again.")
+        return int(row) - 1, int(column) - 1
+    letters = 0
+    while letters < len(text) and is_letter(text[letters]):
+        letters += 1
+    if not letters:
+        raise ValueError("First coordinate should be a letter. Try again.")
+    row = text[letters:]
+    if not is_number(row):
+        raise ValueError("Second coordinate should be an integer. Try again.")
+    return int(row) - 1, column_number(text[:letters])
@@ -0,0 +1,298 @@
+from collections import Counter
+from typing import List
+from random import Random
+import numpy as np
+from game_board import GameBoard
+from placements import placement_table
+from players import BotPlayer, HumanPlayer
+
+"""
+This file contains probability density targeting. For every field
+it counts how many placements of the ships that are still afloat
+are consistent with known hits and misses, and the bot fires at
+the field with the highest count.
+"""
+
+
+class DensityMap:
+    """
+    Class DensityMap. Knowledge about opponent's board gathered from
+    shots and number of consistent ship placements covering each field.
+    Fields are numbered y * boards_edge + x.
+    Contains attributes:
+    :param boards_edge: length of Game Board's edge.
+    :type boards_edge: int
+
+    :param ship_sizes: sizes of opponent's ships
+    :type ship_sizes: List of ints
+
+    Placements are taken from placement tables. For each ship's size
+    the map keeps which placements are still possible (don't cover
+    a missed shot or a sunk ship) and how many of them cover each field.
+    A miss or a sinking only removes placements covering the new blocked
+    fields, so the map is updated, not rebuilt, after each shot.
+    The same is done for target density: for each size the map keeps
+    how many hits the possible placements covering each field cover,
+    and a hit or a sinking changes only placements covering its fields.
+    """
+    def __init__(self, boards_edge: int, ship_sizes: List[int]):
+        """
+        Creates density map of a board without any shots.
+        """
+        self._boards_edge = boards_edge
+        fields = boards_edge * boards_edge
+        self._remaining = Counter(ship_sizes)
+        self._tried = np.zeros(fields, dtype=bool)
+        self._blocked = np.zeros(fields, dtype=bool)
+        self._hits = np.zeros(fields, dtype=bool)
+        self._hit_count = 0
+        self._sunk = np.zeros(fields, dtype=bool)
+        self._possible = {}
+        self._size_density = {}
+        self._size_target = {}
+        for size in self._remaining:
+            table = placement_table(boards_edge, size)
+            self._possible[size] = np.ones(len(table), dtype=bool)
+            self._size_density[size] = np.bincount(
+                table.cells().ravel(), minlength=fields)
+            self._size_target[size] = np.zeros(fields, dtype=np.int64)
+
+    def boards_edge(self):
+        """
+        Method that return map's boards_edge attribute.
+        """
+        return self._boards_edge
+
+    def remaining(self):
+        """
+        Method that return map's remaining attribute
+        (sizes of ships that are still afloat and how many of them).
+        """
+        return self._remaining
+
+    def tried(self):
+        """
+        Method that return map's tried attribute
+        (fields that have been shot at).
+        """
+        return self._tried
+
+    def blocked(self):
+        """
+        Method that return map's blocked attribute
+        (missed shots and fields of sunk ships).
+        """
+        return self._blocked
+
+    def hits(self):
+        """
+        Method that return map's hits attribute
+        (hit fields of ships that haven't sunk yet).
+        """
+        return self._hits
+
+    def sunk(self):
+        """
+        Method that return map's sunk attribute
+        (fields of sunk ships).
+        """
+        return self._sunk
+
+    def possible(self, size: int):
+        """
+        Method that returns boolean array of placements of a ship of given
+        size that don't cover any blocked field.
+        """
+        return self._possible[size]
+
+    def _block(self, cell: int):
+        """
+        Helper method. Blocks the field and removes placements covering it.
+        """
+        if self._blocked[cell]:
+            return
+        self._blocked[cell] = True
+        fields = len(self._blocked)
+        for size, possible in self._possible.items():
+            table = placement_table(self.boards_edge(), size)
+            covering = table.covering_field(cell)
+            removed = covering[possible[covering]]
+            if len(removed):
+                possible[removed] = False
+                cells = table.cells()[removed]
+                self._size_density[size] -= np.bincount(
+                    cells.ravel(), minlength=fields)
+                if not self._hit_count:
+                    continue
+                covered_hits = self._hits[cells].sum(axis=1)
+                if covered_hits.any():
+                    self._size_target[size] -= np.bincount(
+                        cells.ravel(),
+                        weights=np.repeat(covered_hits, size),
+                        minlength=fields).astype(np.int64)
+
+    def _count_hit(self, cell: int, change: int):
+        """
+        Helper method. Adds change (1 for a new hit, -1 for a hit
+        of a sunk ship) to target counts of fields of possible
+        placements covering the field.
+        """
+        self._hit_count += change
+        fields = len(self._blocked)
+        for size, possible in self._possible.items():
+            table = placement_table(self.boards_edge(), size)
+            covering = table.covering_field(cell)
+            present = covering[possible[covering]]
+            if len(present):
+                self._size_target[size] += change * np.bincount(
+                    table.cells()[present].ravel(), minlength=fields)
+
+    def record_miss(self, cell: int):
+        """
+        Method that updates the map after a missed shot.
+        """
+        self._tried[cell] = True
+        self._block(cell)
+
+    def record_hit(self, cell: int):
+        """
+        Method that updates the map after a successful hit.
+        """
+        self._tried[cell] = True
+        if not self._hits[cell]:
+            self._hits[cell] = True
+            self._count_hit(cell, 1)
+
+    def record_sunk(self, cells: List[int], size: int):
+        """
+        Method that updates the map after a ship of given size
+        has sunk at the given fields.
+        """
+        for cell in cells:
+            self._tried[cell] = True
+            if self._hits[cell]:
+                self._hits[cell] = False
+                self._count_hit(cell, -1)
+            self._sunk[cell] = True
+            self._block(cell)
+        self._remaining[size] -= 1
+        if not self._remaining[size]:
+            del self._remaining[size]
+
+    def hunt_density(self):
+        """
+        Method that returns number of possible placements of remaining
+        ships covering each field (each ship counted separately).
+        """
+        density = np.zeros(len(self._blocked), dtype=np.int64)
+        for size, count in self._remaining.items():
+            density += count * self._size_density[size]
+        return density
+
+    def target_density(self):
+        """
+        Method that returns density counting only possible placements
+        that cover hits of ships that haven't sunk yet. Each placement
+        is weighted by number of hits it covers.
+        """
+        density = np.zeros(len(self._blocked), dtype=np.int64)
+        for size, count in self._remaining.items():
+            density += count * self._size_target[size]
+        return density
+
+    def density(self):
+        """
+        Method that returns density of fields that haven't been shot at
+        (-1 for fields that have been). While there are hits of ships
+        that haven't sunk, target density is used, otherwise
+        hunt density.
+        """
+        density = None
+        if self._hits.any():
+            density = self.target_density()
+            if not density[~self._tried].any():
+                density = None
+        if density is None:
+            density = self.hunt_density()
+        density[self._tried] = -1
+        return density
+
+    def best_fields(self):
+        """
+        Method that returns fields with the highest density.
+        """
+        density = self.density()
+        return np.flatnonzero(density == density.max())
+
+
+class DensityBotPlayer(BotPlayer):
+    """
+    Class DensityBotPlayer. Subclass of BotPlayer.
+    Contains all the attributes inherited from BotPlayer.
+    Instead of hunting randomly and searching around hits it fires
+    at the field where opponent's remaining ships are most likely to be
+    (see DensityMap). The map is created on the first attack, when
+    sizes of opponent's ships are known.
+    """
+    __slots__ = ("_density_map",)
+
+    def __init__(self, name: str, game_board: GameBoard,
+                 hits_memory: List[tuple] = None, rng: Random = None,
+                 fleet: dict = None):
+        super().__init__(name, game_board, hits_memory, rng, fleet)
+        self._density_map = None
+
+    def density_map(self, player: HumanPlayer = None):
+        """
+        Method that return player's density_map attribute.
+        If it doesn't exist yet it is created for the given opponent.
+        """
+        if self._density_map is None and player is not None:
+            ship_sizes = [each_ship.size()
+                          for each_ship in player.game_board().fleet()]
+            self._density_map = DensityMap(
+                self.game_board().boards_edge(), ship_sizes)
+        return self._density_map
+
+    def choose_new_hit(self, player: HumanPlayer):
+        """
+        Method that chooses one of the fields with the highest density.
+        """
+        return self.density_shot(player)
+
+    def density_shot(self, player: HumanPlayer):
+        """
+        Method that returns one of the fields with the highest density
+        (also in subclasses choosing their shots differently).
+        """
+        best_fields = self.density_map(player).best_fields()
+        cell = int(best_fields[self.rng().randrange(len(best_fields))])
+        return divmod(cell, self.game_board().boards_edge())
+
+    def refine_shots(self, player: HumanPlayer, deadline: float):
+        """
+        Method that yields the shot chosen with the density map
+        (it takes bounded time, so it is the only refinement).
+        """
+        yield self.density_shot(player)
+
+    def fire_at(self, player: HumanPlayer, possible_hit: tuple):
+        """
+        Method that fires at the given coordinate and updates
+        density map with the result.
+        """
+        density_map = self.density_map(player)
+        status = super().fire_at(player, possible_hit)
+        _, damaged_ship, shipwreck, _ = status
+        edge = self.game_board().boards_edge()
+        y_coordinate, x_coordinate = possible_hit
+        cell = y_coordinate * edge + x_coordinate
+        if shipwreck:
+            density_map.record_sunk(
+                [y * edge + x for y, x in shipwreck.coordinates()],
+                shipwreck.size())
+        elif damaged_ship:
+            density_map.record_hit(cell)
+        else:
+            density_map.record_miss(cell)
+        return status
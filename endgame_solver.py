@@ -0,0 +1,378 @@
+import time
+from typing import List
+from random import Random
+from bitboard import array_to_mask, popcount
+from density_bot import DensityBotPlayer, DensityMap
+from game_board import GameBoard
+from placements import placement_table
+from players import HumanPlayer
+
+"""
+This file contains exact endgame solver. When few layouts of
+opponent's remaining ships are consistent with the shots so far,
+it enumerates all of them and finds the shot minimizing the expected
+number of shots needed to sink the whole fleet (every consistent
+layout is taken as equally likely).
+
+Fields are kept as bitboards (see bitboard.py). Each shot splits
+the layouts by its outcome (miss, hit, or sinking of a particular
+ship) and every outcome is solved recursively. Positions that have
+been evaluated are kept in a transposition table. A position is
+the hits of ships afloat and the layouts still consistent with
+the misses and sunk ships (misses matter only through the layouts
+they rule out), so the same position reached by shots in a different
+order is solved only once - also in later moves of the same game.
+"""
+
+"""
+Largest number of consistent layouts the solver works with.
+With more of them the position isn't an endgame yet.
+"""
+ENDGAME_MAX_LAYOUTS = 32
+
+"""
+Time (in seconds) the solver may use for one move by default.
+"""
+ENDGAME_TIME_BUDGET = 0.05
+
+"""
+Number of positions after which the transposition table is cleared.
+"""
+TRANSPOSITION_TABLE_SIZE = 1 << 18
+
+
+class EndgameTimeout(TimeoutError):
+    """
+    Exception raised when the solver runs out of time.
+    """
+
+
+def lowest_field(mask: int):
+    """
+    Function that returns number of the lowest field set in the mask.
+    """
+    return (mask & -mask).bit_length() - 1
+
+
+def fields_of(mask: int):
+    """
+    Function that yields numbers of fields set in the mask.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class EndgameSolver:
+    """
+    Class EndgameSolver. Finds shots minimizing expected number
+    of shots left. Solver keeps its transposition table between moves,
+    so one solver should be used for one opponent's board.
+    Contains attributes:
+    :param boards_edge: length of Game Board's edge.
+    :type boards_edge: int
+
+    :param max_layouts: largest number of consistent layouts solved
+    :type max_layouts: int
+
+    :param table: transposition table: position (hits, set of
+    layouts) -> (expected number of shots left, best field)
+    :type table: dict
+    """
+    __slots__ = ("_boards_edge", "_max_layouts", "_table", "_deadline")
+
+    def __init__(self, boards_edge: int,
+                 max_layouts: int = ENDGAME_MAX_LAYOUTS):
+        """
+        Creates solver with empty transposition table.
+        """
+        self._boards_edge = boards_edge
+        self._max_layouts = max_layouts
+        self._table = {}
+        self._deadline = None
+
+    def boards_edge(self):
+        """
+        Method that return solver's boards_edge attribute.
+        """
+        return self._boards_edge
+
+    def max_layouts(self):
+        """
+        Method that return solver's max_layouts attribute.
+        """
+        return self._max_layouts
+
+    def table(self):
+        """
+        Method that return solver's table attribute.
+        """
+        return self._table
+
+    def placements(self, density_map: DensityMap, hits: int):
+        """
+        Method that returns masks of different placements still
+        possible for each size of ships afloat. Placements covering
+        only hits are left out - such a ship would have sunk already.
+        """
+        placements = {}
+        for size in density_map.remaining():
+            table = placement_table(self.boards_edge(), size)
+            cells = table.cells()[density_map.possible(size)]
+            masks = []
+            for placement_cells in cells.tolist():
+                mask = 0
+                for cell in placement_cells:
+                    mask |= 1 << cell
+                if mask & ~hits:
+                    masks.append(mask)
+            # placements of one field ships are in the table twice
+            placements[size] = list(dict.fromkeys(masks))
+        return placements
+
+    def layouts(self, placements: dict, remaining: dict, hits: int):
+        """
+        Method that enumerates layouts of the remaining ships
+        (size -> number of ships) made of the placements that cover
+        all the hits and don't overlap. Each layout is a pair:
+        mask of all its fields, tuple of masks of its ships.
+        Ships covering hits are placed first (the one covering
+        the lowest uncovered hit), then the others, each size
+        in increasing order of placements, so every layout is made once.
+        Returns None if there are more than max_layouts of them
+        (the helpers return False to stop the enumeration).
+        """
+        layouts = []
+        left = dict(remaining)
+        sizes = sorted(left)
+        ships = []
+
+        def place_free(size_number: int, first: int, occupied: int):
+            while size_number < len(sizes) and not left[sizes[size_number]]:
+                size_number += 1
+                first = 0
+            if size_number == len(sizes):
+                layouts.append((occupied, tuple(sorted(ships))))
+                return len(layouts) <= self._max_layouts
+            size = sizes[size_number]
+            masks = placements[size]
+            left[size] -= 1
+            for number in range(first, len(masks)):
+                mask = masks[number]
+                if mask & occupied:
+                    continue
+                ships.append(mask)
+                carry_on = place_free(size_number, number + 1,
+                                      occupied | mask)
+                ships.pop()
+                if not carry_on:
+                    return False
+            left[size] += 1
+            return True
+
+        def cover(uncovered: int, occupied: int):
+            if time.perf_counter() > self._deadline:
+                raise EndgameTimeout("Endgame solver ran out of time")
+            if not uncovered:
+                return place_free(0, 0, occupied)
+            lowest = uncovered & -uncovered
+            for size in sizes:
+                if not left[size]:
+                    continue
+                left[size] -= 1
+                for mask in placements[size]:
+                    if not mask & lowest or mask & occupied:
+                        continue
+                    ships.append(mask)
+                    carry_on = cover(uncovered & ~mask, occupied | mask)
+                    ships.pop()
+                    if not carry_on:
+                        return False
+                left[size] += 1
+            return True
+
+        if not cover(hits, 0):
+            return None
+        return layouts
+
+    def best_shot(self, density_map: DensityMap, time_budget: float = None):
+        """
+        Method that finds the best shot in the position described
+        by the density map. Returns pair: field's number and expected
+        number of shots left, or None if the position has too many
+        consistent layouts or the solver runs out of time_budget
+        (in seconds, by default ENDGAME_TIME_BUDGET).
+        """
+        if time_budget is None:
+            time_budget = ENDGAME_TIME_BUDGET
+        self._deadline = time.perf_counter() + time_budget
+        remaining = density_map.remaining()
+        if not remaining:
+            return None
+        hits = array_to_mask(density_map.hits())
+        try:
+            layouts = self.layouts(self.placements(density_map, hits),
+                                   remaining, hits)
+            if not layouts:
+                return None
+            expected, field = self.solve(layouts, hits)
+        except EndgameTimeout:
+            return None
+        return field, expected
+
+    def solve(self, layouts: List[tuple], hits: int):
+        """
+        Method that returns expected number of shots needed to sink
+        the ships afloat and the field to shoot first, when
+        the consistent layouts (of ships afloat) are equally likely.
+        Raises EndgameTimeout when the solver runs out of time.
+        """
+        if not layouts[0][0]:
+            return 0.0, None
+        key = (hits, frozenset(layouts))
+        known = self._table.get(key)
+        if known is not None:
+            return known
+        if time.perf_counter() > self._deadline:
+            raise EndgameTimeout("Endgame solver ran out of time")
+        shots_left = [popcount(fields & ~hits) for fields, _ in layouts]
+        if len(layouts) == 1:
+            result = (float(shots_left[0]),
+                      lowest_field(layouts[0][0] & ~hits))
+        else:
+            result = self._best_field(layouts, shots_left, hits)
+        if len(self._table) >= TRANSPOSITION_TABLE_SIZE:
+            self._table.clear()
+        self._table[key] = result
+        return result
+
+    def _best_field(self, layouts: List[tuple], shots_left: List[int],
+                    hits: int):
+        """
+        Helper method of solve. Tries fields covered by any layout,
+        the most likely hits first. Fields that are in the same ship
+        in every layout are alike (the positions after shooting one
+        or the other are mirror images), so only one of them is tried,
+        and if some field is a sure hit only it is tried - it has to be
+        shot anyway and shooting it first only gives its outcome
+        earlier. A field is abandoned as soon as its expected value
+        can't be better than the best one found (every layout needs
+        at least as many shots as it has fields not hit yet, which
+        bounds outcomes not solved yet).
+        """
+        total = len(layouts)
+        ships_at = {}
+        for number, (_, ships) in enumerate(layouts):
+            for ship in ships:
+                for field in fields_of(ship & ~hits):
+                    ships_at.setdefault(field, []).append((number, ship))
+        candidates = {}
+        for field, ships in ships_at.items():
+            candidates.setdefault(tuple(ships), field)
+        candidates = sorted(candidates.items(),
+                            key=lambda candidate: -len(candidate[0]))
+        if len(candidates[0][0]) == total:
+            candidates = candidates[:1]
+        lower_bound = sum(shots_left) / total
+        best_expected, best_field = float("inf"), None
+        for _, field in candidates:
+            if best_expected <= lower_bound:
+                break
+            outcomes = self._outcomes(layouts, shots_left, field, hits)
+            bound = 1.0 + sum(left for _, left in outcomes.values()) / total
+            if bound >= best_expected:
+                continue
+            expected = bound
+            for (sub_hits, _), (sub_layouts, left) in outcomes.items():
+                value, _ = self.solve(sub_layouts, sub_hits)
+                expected += (len(sub_layouts) * value - left) / total
+                if expected >= best_expected:
+                    break
+            if expected < best_expected:
+                best_expected, best_field = expected, field
+        return best_expected, best_field
+
+    def _outcomes(self, layouts: List[tuple], shots_left: List[int],
+                  field: int, hits: int):
+        """
+        Helper method of _best_field. Splits layouts by outcome
+        of a shot at the field: miss, hit, or sinking of one of
+        the ships (which then is taken out of the layout, and its
+        fields out of the hits). Returns dictionary: outcome
+        (hits after the shot, mask of the sunk ship or 0) -> (layouts
+        after the shot, their sum of shots left).
+        """
+        bit = 1 << field
+        hits_after = hits | bit
+        outcomes = {}
+        for (fields, ships), left in zip(layouts, shots_left):
+            if not fields & bit:
+                outcome, layout = (hits, 0), (fields, ships)
+            else:
+                left -= 1
+                ship = next(mask for mask in ships if mask & bit)
+                if ship & ~hits_after:
+                    outcome, layout = (hits_after, 0), (fields, ships)
+                else:
+                    outcome = (hits_after & ~ship, ship)
+                    layout = (fields & ~ship,
+                              tuple(mask for mask in ships if mask != ship))
+            sub_layouts, sum_left = outcomes.get(outcome, ([], 0))
+            sub_layouts.append(layout)
+            outcomes[outcome] = (sub_layouts, sum_left + left)
+        return outcomes
+
+
+class EndgameBotPlayer(DensityBotPlayer):
+    """
+    Class EndgameBotPlayer. Subclass of DensityBotPlayer.
+    Contains all the attributes inherited from DensityBotPlayer.
+    While there are too many layouts consistent with its shots it fires
+    like DensityBotPlayer, in the endgame it fires at the field chosen
+    by EndgameSolver (within time_budget seconds per move).
+    """
+    __slots__ = ("_endgame_solver", "_time_budget")
+
+    def __init__(self, name: str, game_board: GameBoard,
+                 hits_memory: List[tuple] = None, rng: Random = None,
+                 fleet: dict = None, time_budget: float = None):
+        super().__init__(name, game_board, hits_memory, rng, fleet)
+        self._endgame_solver = EndgameSolver(game_board.boards_edge())
+        self._time_budget = time_budget
+
+    def endgame_solver(self):
+        """
+        Method that return player's endgame_solver attribute.
+        """
+        return self._endgame_solver
+
+    def choose_new_hit(self, player: HumanPlayer):
+        """
+        Method that chooses the field given by the endgame solver
+        (or by the density map, if the solver gives none).
+        """
+        shot = self.endgame_solver().best_shot(self.density_map(player),
+                                               self._time_budget)
+        if shot is None:
+            return super().choose_new_hit(player)
+        field, _ = shot
+        return divmod(field, self.game_board().boards_edge())
+
+    def refine_shots(self, player: HumanPlayer, deadline: float):
+        """
+        Method that yields the density map's shot and then the endgame
+        solver's one, if the solver finds it in the time left before
+        the deadline (and within time_budget, if it is set).
+        """
+        yield from super().refine_shots(player, deadline)
+        time_left = deadline - time.perf_counter()
+        if self._time_budget is not None:
+            time_left = min(time_left, self._time_budget)
+        if time_left <= 0:
+            return
+        shot = self.endgame_solver().best_shot(self.density_map(player),
+                                               time_left)
+        if shot is not None:
+            field, _ = shot
+            yield divmod(field, self.game_board().boards_edge())
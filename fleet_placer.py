@@ -0,0 +1,267 @@
+import time
+from random import Random
+from bitboard import column_mask, popcount
+from ship import Ship, naval_fleet
+
+"""
+This file contains fleet placer solving ship placement as a constraint
+problem, so that any fleet (also a big or custom one on a small board)
+is either placed or proven impossible to place.
+
+Board's fields are kept as a bitboard (the field (y, x) is the bit
+number y * boards_edge + x, like in bitboard.py). Legal placements
+of all ships of one size are found at once: a field is a legal start
+of a horizontal placement when it and the next size - 1 fields
+are free, so it is a few shifts and ANDs of the free fields' mask.
+
+The search is a backtracking one. In every step the ship with the
+fewest legal placements is placed first (most constrained ship first)
+and a branch is abandoned as soon as some remaining ship has no room
+left or free fields that can still be covered by the remaining ships
+are fewer than their fields.
+Ships of the same size are interchangeable, so their placements
+are tried only in increasing order - each layout is visited once.
+"""
+
+"""
+Time (in seconds) after which place_fleet gives up by default.
+"""
+PLACEMENT_TIME_BUDGET = 1.0
+
+
+class PlacementTimeout(TimeoutError):
+    """
+    Exception raised when the fleet placer runs out of time before
+    finding a layout or proving that none exists.
+    """
+
+
+def bits_from(mask: int, start: int):
+    """
+    Function that yields numbers of bits set in the mask, starting
+    from bit start, going up and then wrapping around to bit 0.
+    """
+    higher = mask >> start << start
+    for part in (higher, mask ^ higher):
+        while part:
+            lowest = part & -part
+            yield lowest.bit_length() - 1
+            part ^= lowest
+
+
+class FleetPlacer:
+    """
+    Class FleetPlacer. Backtracking search of a fleet's layout.
+    Contains attributes:
+    :param boards_edge: length of Game Board's edge.
+    :type boards_edge: int
+
+    :param fleet: names of ships (keys) and their sizes (values)
+    :type fleet: dict
+
+    :param rng: random number generator choosing where the search
+    starts (so that different layouts are found)
+    :type rng: instance of random.Random
+    """
+    __slots__ = ("_boards_edge", "_fleet", "_rng", "_deadline",
+                 "_nodes", "_shapes", "_starts")
+
+    def __init__(self, boards_edge: int, fleet: dict = None,
+                 rng: Random = None):
+        """
+        Creates instance of a fleet placer.
+        """
+        if fleet is None:
+            fleet = naval_fleet
+        for name, ship_size in fleet.items():
+            if ship_size < 1:
+                raise ValueError(f"{name} has to have at least one field")
+        self._boards_edge = boards_edge
+        self._fleet = fleet
+        if not rng:
+            rng = Random()
+        self._rng = rng
+        self._deadline = None
+        self._nodes = 0
+        self._shapes = {}
+        self._starts = {}
+        first_column = column_mask(boards_edge, 0)
+        for ship_size in set(fleet.values()):
+            starts_in_line = max(boards_edge - ship_size + 1, 0)
+            vertical_shape = sum(1 << (offset * boards_edge)
+                                 for offset in range(ship_size))
+            self._shapes[ship_size] = ((1 << ship_size) - 1, vertical_shape)
+            vertical_starts = (1 << (starts_in_line * boards_edge)) - 1
+            if ship_size == 1:  # the same fields as horizontal ones
+                vertical_starts = 0
+            self._starts[ship_size] = (
+                first_column * ((1 << starts_in_line) - 1), vertical_starts)
+
+    def boards_edge(self):
+        """
+        Method that return placer's boards_edge attribute.
+        """
+        return self._boards_edge
+
+    def fleet(self):
+        """
+        Method that return placer's fleet attribute.
+        """
+        return self._fleet
+
+    def nodes(self):
+        """
+        Method that returns number of ships placed (and taken back)
+        during the last search.
+        """
+        return self._nodes
+
+    def legal_starts(self, free: int, ship_size: int, after: int = -1):
+        """
+        Method that returns masks of legal starts (leftmost or top
+        fields) of horizontal and vertical placements of a ship
+        on the free fields. Only placements numbered (start * 2,
+        plus 1 for vertical ones) above after are included.
+        """
+        horizontal, vertical = self._starts[ship_size]
+        horizontal &= free
+        vertical &= free
+        for offset in range(1, ship_size):
+            horizontal &= free >> offset
+            vertical &= free >> (offset * self._boards_edge)
+        first_start = after // 2 + 1
+        horizontal = horizontal >> first_start << first_start
+        first_start -= after % 2 == 0
+        vertical = vertical >> first_start << first_start
+        return horizontal, vertical
+
+    def place(self, occupied: int = 0, time_budget: float = None):
+        """
+        Method that searches for a layout of the fleet on the board
+        with occupied fields (a bitboard). Returns list of ships
+        in fleet's order, None if the fleet can't be placed.
+        Raises PlacementTimeout if time_budget (in seconds,
+        by default PLACEMENT_TIME_BUDGET) runs out.
+        """
+        if time_budget is None:
+            time_budget = PLACEMENT_TIME_BUDGET
+        self._deadline = time.perf_counter() + time_budget
+        self._nodes = 0
+        remaining = {}
+        for ship_size in self._fleet.values():
+            remaining[ship_size] = remaining.get(ship_size, 0) + 1
+        full_board = (1 << (self._boards_edge * self._boards_edge)) - 1
+        layout = {ship_size: [] for ship_size in remaining}
+        if not self._search(full_board & ~occupied, remaining, layout):
+            return None
+        ships = []
+        for name, ship_size in self._fleet.items():
+            placement = layout[ship_size].pop(0)
+            ships.append(Ship(name, ship_size,
+                              self.placement_coordinates(ship_size,
+                                                         placement)))
+        return ships
+
+    def placement_coordinates(self, ship_size: int, placement: int):
+        """
+        Method that returns fields of the placement (start * 2,
+        plus 1 for vertical ones) as list of tuples.
+        """
+        start, vertical = divmod(placement, 2)
+        y_coordinate, x_coordinate = divmod(start, self._boards_edge)
+        if vertical:
+            return [(y_coordinate + offset, x_coordinate)
+                    for offset in range(ship_size)]
+        return [(y_coordinate, x_coordinate + offset)
+                for offset in range(ship_size)]
+
+    def covered_fields(self, ship_size: int, starts: tuple):
+        """
+        Method that returns mask of fields covered by any of the
+        placements with given starts (horizontal and vertical).
+        """
+        horizontal, vertical = starts
+        covered = 0
+        for offset in range(ship_size):
+            covered |= horizontal << offset
+            covered |= vertical << (offset * self._boards_edge)
+        return covered
+
+    def _most_constrained(self, free: int, remaining: dict,
+                          layout: dict, fields_needed: int):
+        """
+        Helper method of _search. Returns size of the ships with
+        the fewest legal placements and masks of their starts
+        (None if the remaining ships can't be placed).
+        """
+        chosen = None
+        fewest = None
+        covered = 0
+        for ship_size, ships_left in remaining.items():
+            if not ships_left:
+                continue
+            placed = layout[ship_size]
+            after = placed[-1] if placed else -1
+            starts = self.legal_starts(free, ship_size, after)
+            count = popcount(starts[0]) + popcount(starts[1])
+            if count < ships_left:
+                return None
+            covered |= self.covered_fields(ship_size, starts)
+            if fewest is None or count < fewest:
+                chosen, fewest = (ship_size, starts), count
+        if popcount(covered) < fields_needed:
+            return None
+        return chosen
+
+    def _search(self, free: int, remaining: dict, layout: dict):
+        """
+        Helper method of place. Places the remaining ships on the free
+        fields, adding their placements to layout. Returns True
+        if all of them have been placed.
+        """
+        fields_needed = sum(ship_size * ships_left
+                            for ship_size, ships_left in remaining.items())
+        if not fields_needed:
+            return True
+        if popcount(free) < fields_needed:
+            return False
+        if time.perf_counter() > self._deadline:
+            raise PlacementTimeout("Fleet placement ran out of time")
+        chosen = self._most_constrained(free, remaining, layout,
+                                        fields_needed)
+        if chosen is None:
+            return False
+        ship_size, starts = chosen
+        orientations = [0, 1]
+        self._rng.shuffle(orientations)
+        fields = self._boards_edge * self._boards_edge
+        remaining[ship_size] -= 1
+        for vertical in orientations:
+            shape = self._shapes[ship_size][vertical]
+            for start in bits_from(starts[vertical],
+                                   self._rng.randrange(fields)):
+                self._nodes += 1
+                layout[ship_size].append(start * 2 + vertical)
+                if self._search(free & ~(shape << start), remaining,
+                                layout):
+                    return True
+                layout[ship_size].pop()
+        remaining[ship_size] += 1
+        return False
+
+
+def place_fleet(boards_edge: int, fleet: dict = None,
+                occupied=(), rng: Random = None,
+                time_budget: float = None):
+    """
+    Function that places the fleet (names -> sizes, by default
+    naval_fleet) on a board with given edge, avoiding occupied fields
+    (coordinates). Returns list of ships in fleet's order or None
+    if no layout exists. Raises PlacementTimeout if time_budget
+    (in seconds) runs out first.
+    """
+    occupied_mask = 0
+    for y_coordinate, x_coordinate in occupied:
+        occupied_mask |= 1 << (y_coordinate * boards_edge + x_coordinate)
+    placer = FleetPlacer(boards_edge, fleet, rng)
+    return placer.place(occupied_mask, time_budget)
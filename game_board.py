@@ -1,6 +1,7 @@
 from typing import List
 import numpy as np
 from ship import Ship
+from zobrist import status_change
 
 
 class GameBoard:
@@ -12,18 +13,36 @@ class GameBoard:
 
     :param fleet:  Fleet on Game Board of a player.
     :type fleet: List of Ships
+
+    Game Board also keeps an index of occupied fields - a grid with
+    the number of the ship (its position in the fleet plus one, 0 for
+    empty fields) placed at each field, so that the ship placed at
+    a given field is found with a single lookup.
+    It also counts ships that are still afloat.
+    Grids hold unsigned bytes (field statuses fit in them).
+    Game Board keeps Zobrist hash of its fields' statuses, updated
+    whenever a status changes (see zobrist.py).
     """
+    __slots__ = ("_boards_edge", "_ocean_grid", "_ship_numbers",
+                 "_ships_afloat", "_fleet", "_zobrist_hash")
 
     def __init__(self, boards_edge: int, fleet: List["Ship"] = None):
         """
         Creates instance of a game board.
         """
         self._boards_edge = boards_edge
-        self._ocean_grid = np.zeros((boards_edge, boards_edge), dtype=int)
+        self._ocean_grid = np.zeros((boards_edge, boards_edge),
+                                    dtype=np.uint8)
+        self._ship_numbers = np.zeros((boards_edge, boards_edge),
+                                      dtype=np.uint8)
+        self._ships_afloat = 0
+        self._zobrist_hash = 0
         if not fleet:
             self._fleet = []
         else:
             self._fleet = fleet
+        for ship_number, each_ship in enumerate(self._fleet, 1):
+            self._place_ship(each_ship, ship_number)
 
     def boards_edge(self):
         """
@@ -37,34 +56,125 @@ class GameBoard:
         """
         return self._ocean_grid
 
+    def ocean_window(self, top: int, left: int, height: int, width: int):
+        """
+        Method that returns ocean grid of the window of the board
+        (rows from top, columns from left).
+        """
+        return self.ocean_grid()[top:top + height, left:left + width]
+
     def fleet(self):
         """
         Method that return game boards's fleet attribute.
         """
         return self._fleet
 
+    def ships_afloat(self):
+        """
+        Method that return game board's ships_afloat attribute.
+        """
+        return self._ships_afloat
+
+    def zobrist_hash(self):
+        """
+        Method that return game board's zobrist_hash attribute.
+        """
+        return self._zobrist_hash
+
+    def _rehash(self, coordinate: tuple, old_status: int, new_status: int):
+        """
+        Helper method. Updates Zobrist hash after the field's status
+        has changed.
+        """
+        y_coordinate, x_coordinate = coordinate
+        self._zobrist_hash ^= status_change(
+            y_coordinate * self._boards_edge + x_coordinate,
+            old_status, new_status)
+
+    def new_memory(self):
+        """
+        Method that creates an empty player's memory of chosen
+        coordinates, matching this board's representation.
+        """
+        return np.zeros((self.boards_edge(), self.boards_edge()),
+                        dtype=np.uint8)
+
+    def field_status(self, coordinate: tuple):
+        """
+        Method that returns status of a single field:
+        0 - empty, 1 - ship, 2 - successful hit, 3 - missed shot.
+        """
+        return int(self.ocean_grid()[coordinate])
+
+    def occupied_fields(self):
+        """
+        Method that returns flat boolean array (field number
+        y * boards_edge + x) of fields occupied by ships.
+        """
+        flat_grid = self.ocean_grid().ravel()
+        return (flat_grid == 1) | (flat_grid == 2)
+
+    def ship_at(self, coordinate: tuple):
+        """
+        Method that returns ship placed at the given coordinate
+        (None if the field is empty).
+        """
+        ship_number = self._ship_numbers[coordinate]
+        if ship_number:
+            return self._fleet[ship_number - 1]
+
+    def _place_ship(self, new_ship: "Ship", ship_number: int):
+        """
+        Helper method of add_ship. Marks ship's fields on ocean grid
+        and in the index of occupied fields under the given number.
+        """
+        if ship_number >> (8 * self._ship_numbers.itemsize):
+            self._ship_numbers = self._ship_numbers.astype(
+                np.min_scalar_type(ship_number))
+        for each_ship_coordinate in new_ship.coordinates():
+            self._rehash(each_ship_coordinate,
+                         self.field_status(each_ship_coordinate), 1)
+            self.ocean_grid()[each_ship_coordinate] = 1
+            self._ship_numbers[each_ship_coordinate] = ship_number
+        if new_ship.is_it_afloat():
+            self._ships_afloat += 1
+
     def add_ship(self, new_ship: "Ship"):
         """
         Method that adds a new ship to a list of ships on game board.
         """
         self.fleet().append(new_ship)
-        for each_ship_coordinate in new_ship.coordinates():
-            self.ocean_grid()[each_ship_coordinate] = 1
+        self._place_ship(new_ship, len(self.fleet()))
         new_ocean_grid = self.ocean_grid()
         return new_ocean_grid
 
+    def resolve_shot(self, new_hit: tuple):
+        """
+        Method that marks the result of a shot on ocean grid
+        (2 - successful hit, 3 - missed shot) and returns the ship
+        that has been hit (None if the shot missed).
+        The first hit at each of ship's fields takes its hit point.
+        """
+        damaged_ship = self.ship_at(new_hit)
+        old_status = int(self._ocean_grid[new_hit])
+        if damaged_ship:
+            if old_status != 2:
+                if not damaged_ship.register_hit():
+                    self._ships_afloat -= 1
+                self.ocean_grid()[new_hit] = 2  # hit
+                self._rehash(new_hit, old_status, 2)
+        elif old_status != 3:
+            self.ocean_grid()[new_hit] = 3  # miss
+            self._rehash(new_hit, old_status, 3)
+        return damaged_ship
+
     def set_new_board_status(self, new_hit: tuple):
         """
         Method that sets new board status. It is performed after player's move.
         It's field value is changed accordingly to the result of a hit
         (whether it has been a missed shot or a successful hit).
         """
-        for each_ship in self.fleet():
-            if new_hit in each_ship.coordinates():
-                self.ocean_grid()[new_hit] = 2  # hit
-                break
-        else:
-            self.ocean_grid()[new_hit] = 3  # miss
+        self.resolve_shot(new_hit)
         new_board_status = self.ocean_grid()
         return new_board_status
 
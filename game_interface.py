@@ -1,5 +1,5 @@
-import time
-from ship import naval_fleet
+from coordinate_codec import decode_coordinate
+from pacing import pause
 
 """
 This file contains functions that are responsible for printiong out
@@ -10,17 +10,30 @@ the messages to the player and that are proccessing player's input.
 def decode_input(input_position: str, board):
     """
     Function that decodes player's input into a specific coordinate
-    in a numpy array.
+    in a numpy array (see coordinate_codec for accepted forms).
     """
-    capitalized_letter = input_position[0].upper()
-    x_coordinate = ord(capitalized_letter) - 65
-    y_coordinate = int(input_position[1:]) - 1
+    y_coordinate, x_coordinate = decode_coordinate(input_position)
     check_coordinates = board.outside_board(y_coordinate, x_coordinate)
     if check_coordinates:
         return
     return y_coordinate, x_coordinate
 
 
+def parse_coordinate(players_input: str, board):
+    """
+    Function that checks player's input and decodes it into a coordinate.
+    Returns pair: coordinate (None if the input is not valid)
+    and message explaining what is wrong with the input.
+    """
+    try:
+        coordinates = decode_input(players_input, board)
+    except ValueError as error:
+        return None, str(error)
+    if coordinates is None:
+        return None, "Wrong values. Try again."
+    return coordinates, None
+
+
 def input_coordinate(board):
     """
     Function that communicates with player while they provide an input.
@@ -29,24 +42,16 @@ def input_coordinate(board):
     """
     end_loop = 1
     while end_loop:
-        time.sleep(0.5)
+        pause(0.5)
         players_input = input("Please enter the coordinates: ")
-        if players_input is None or len(players_input) not in range(2, 3+1):
-            print("Improper coordinate's length. Try again.")
-        elif ord(players_input[0]) not in range(65, 90+1) and \
-                ord(players_input[0]) not in range(97, 122+1):
-            print("First coordinate should be a letter. Try again.")
-        else:
-            for each_number in players_input[1:]:
-                if ord(each_number) not in range(48, 57+1):
-                    print("Second coordinate should be an integer. Try again.")
-                    break
+        coordinates, message = parse_coordinate(players_input, board)
+        if coordinates is None:
+            if message == "Wrong values. Try again.":
+                print(message, end=' ')
             else:
-                coordinates = decode_input(players_input, board)
-                if coordinates is None:
-                    print("Wrong values. Try again.", end=' ')
-                else:
-                    end_loop = 0
+                print(message)
+        else:
+            end_loop = 0
     return coordinates
 
 
@@ -71,10 +76,8 @@ def new_turn_separator():
     """
     Separator that is used between game rounds.
     """
-    for _ in range(80):
-        print("*", end="")
-        time.sleep(0.05)
-    separator()
+    print("*" * 80)
+    pause(4)
 
 
 def choose_ship_placement(possible_positions: dict):
@@ -89,23 +92,23 @@ def choose_ship_placement(possible_positions: dict):
         if letter_meanings[letter] in possible_positions:
             possible_letter_meanings[letter] = letter_meanings[letter]
     end_loop = 1
-    time.sleep(0.5)
+    pause(0.5)
     separator()
     print("Please choose the direction which rest of the ship should face.")
-    time.sleep(0.5)
+    pause(0.5)
     print('To do that, write shortcuts of directions:')
     print('"u" for up, "d" for down, "l" for left and "r" for right.')
-    time.sleep(2)
+    pause(2)
     separator()
     while end_loop:
         print("Your ship can be placed in this directions:")
-        time.sleep(0.5)
+        pause(0.5)
         print(*keys, sep=', ')
         separator()
-        time.sleep(0.5)
+        pause(0.5)
         players_input = input(
             "Rest of the ship will face this direction: ")
-        time.sleep(1)
+        pause(1)
         if players_input in possible_letter_meanings:
             print("Success! Your ship is now placed in Your Ocean Grid")
             chosen_direction = letter_meanings.get(players_input)
@@ -122,28 +125,28 @@ def input_arrange_ships_on_board(human_player):
     Function that through messages navigates player
     while they choose ship placement on their board.
     """
-    time.sleep(0.5)
+    pause(0.5)
     print("Perfect! Now let's choose your ships positions!")
     separator()
-    time.sleep(2)
+    pause(2)
     print("Hint: To place your ship first You will need to choose location")
     print("for your ship's bow (the front part of the ship).")
-    time.sleep(4)
+    pause(4)
     print("If the position is correct You will be able to choose")
     print("which direction should the rest of the ship face.")
-    time.sleep(54)
+    pause(4)
     print("The directions provided will be the ones")
     print("for which Your ship placement is possible.")
-    time.sleep(2)
+    pause(2)
     separator()
-    for ship in naval_fleet:
+    for ship in human_player.fleet():
         separator()
         print(f"Let's place {ship}:")
-        time.sleep(1)
+        pause(1)
         separator()
         print("The position of ship's bow should be given as in ")
         print("a following example: 'A5', 'F3' etc.")
-        time.sleep(1)
+        pause(1)
         separator()
         human_player.graphic_rep()
         separator()
@@ -164,7 +167,7 @@ def before_players_attack(player, opponent):
     """
     new_turn_separator()
     print(f"It's {str(player)}'s turn!")
-    time.sleep(1)
+    pause(1)
     separator()
     opponent.graphic_rep()
     separator()
@@ -176,23 +179,23 @@ def result_of_players_attack(opponent, damaged_ship, shipwreck, loser):
     """
     opponent.graphic_rep()
     if damaged_ship:
-        time.sleep(1)
+        pause(1)
         separator()
-        time.sleep(0.5)
+        pause(0.5)
         print(f"{str(opponent)}'s ship has been hit!")
         separator()
         if shipwreck:
-            time.sleep(1)
+            pause(1)
             print("You successfully sunk opponent's ship!")
             separator()
             if loser:
-                time.sleep(1)
+                pause(1)
                 print(
                     "Hurray! You can proclaim Yourself as a Lord of the Seas!")
                 print("You won!")
                 return False
     else:
-        time.sleep(1)
+        pause(1)
         print("You missed! Better luck next time!")
         separator()
     return True
@@ -213,29 +216,29 @@ def result_of_enemys_attack(opponent, damaged_ship, shipwreck, loser):
     Function that based on the attacks outcome provides a suitable message.
     """
     if damaged_ship:
-        time.sleep(1)
+        pause(1)
         opponent.graphic_rep()
         separator()
-        time.sleep(1)
+        pause(1)
         print(f"The opponent has hit your {str(damaged_ship)}!")
         separator()
         if shipwreck:
-            time.sleep(0.5)
+            pause(0.5)
             print(
                 f"Houston, we have a problem. Your {str(shipwreck)} has sunk!")
             separator()
             if loser:
-                time.sleep(1)
+                pause(1)
                 print(
                     "Oh no! It turns out that... Your opponent defeated You.")
-                time.sleep(1)
+                pause(1)
                 print("It's time for Your revenge!")
                 return False
     else:
-        time.sleep(2)
+        pause(2)
         print("Phew! Lucky You! Your opponent has missed!")
         separator()
-        time.sleep(1)
+        pause(1)
         opponent.graphic_rep()
         separator()
     return True
@@ -0,0 +1,384 @@
+import mmap
+import struct
+from typing import List
+import numpy as np
+from game_board import GameBoard
+from ship import Ship
+
+"""
+This file contains compact binary format of game records.
+
+A file starts with a header (magic bytes and version) followed by
+game records. Each record holds:
+- boards' edge, number of boards and number of shots,
+- fleet of each board: number of ships (up to 65535) and for each
+  ship its name (up to 255 bytes of UTF-8), size, direction
+  and the field of its first coordinate,
+- shots, 3 bytes each: field number (21 bits), number of the board
+  that has been shot at (1 bit) and the outcome (2 bits),
+- end marker, written when the game is finished (its outcome bits
+  are 3, so it can't be taken for a shot).
+Closed file ends with an index - offsets of all the records - and
+a trailer pointing to it, so the reader finds any game at once.
+If the writer hasn't closed the file, the reader walks the records
+and stops at the first one without the end marker - a game that has
+been written only partly (its header still says 0 shots).
+Fields are numbered y * boards_edge + x.
+"""
+
+FILE_HEADER = struct.Struct("<4sB3x")
+FILE_MAGIC = b"BSGR"
+FILE_VERSION = 3
+RECORD_HEADER = struct.Struct("<HBxI")
+FLEET_HEADER = struct.Struct("<H")
+SHIP_HEADER = struct.Struct("<B")
+SHIP_BODY = struct.Struct("<HBI")
+TRAILER = struct.Struct("<QQ4s")
+TRAILER_MAGIC = b"BSIX"
+SHOT_BYTES = 3
+RECORD_END = b"\xff" * SHOT_BYTES
+MAX_FIELDS = 1 << 21
+MAX_SHIPS = (1 << 16) - 1
+MAX_NAME_BYTES = (1 << 8) - 1
+
+"""
+Outcomes of shots.
+"""
+MISS = 0
+HIT = 1
+SUNK = 2
+
+"""
+Directions in which ship's coordinates go from the first one.
+"""
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def shot_outcome(damaged_ship, shipwreck):
+    """
+    Function that turns attack's result into shot's outcome.
+    """
+    if shipwreck:
+        return SUNK
+    if damaged_ship:
+        return HIT
+    return MISS
+
+
+def check_fleet(fleet: List[Ship]):
+    """
+    Function that raises ValueError if the fleet doesn't fit
+    in a game record (too many ships or too long name).
+    """
+    if len(fleet) > MAX_SHIPS:
+        raise ValueError("Too many ships for a game record")
+    for each_ship in fleet:
+        if len(each_ship.name().encode("utf-8")) > MAX_NAME_BYTES:
+            raise ValueError("Ship's name is too long for a game record")
+
+
+def encode_ship(each_ship: Ship, boards_edge: int):
+    """
+    Function that encodes ship's name, size, direction and first field.
+    """
+    coordinates = each_ship.coordinates()
+    direction = 0
+    if len(coordinates) > 1:
+        step = (coordinates[1][0] - coordinates[0][0],
+                coordinates[1][1] - coordinates[0][1])
+        direction = DIRECTIONS.index(step)
+    y_coordinate, x_coordinate = coordinates[0]
+    name = each_ship.name().encode("utf-8")
+    return (SHIP_HEADER.pack(len(name)) + name
+            + SHIP_BODY.pack(len(coordinates), direction,
+                             y_coordinate * boards_edge + x_coordinate))
+
+
+def decode_ship(buffer, offset: int, boards_edge: int):
+    """
+    Function that decodes ship starting at the offset.
+    Returns ship and offset of the data that follows it.
+    """
+    (name_length,) = SHIP_HEADER.unpack_from(buffer, offset)
+    offset += SHIP_HEADER.size
+    name = bytes(buffer[offset:offset + name_length]).decode("utf-8")
+    offset += name_length
+    size, direction, first_field = SHIP_BODY.unpack_from(buffer, offset)
+    offset += SHIP_BODY.size
+    y_step, x_step = DIRECTIONS[direction]
+    y_coordinate, x_coordinate = divmod(first_field, boards_edge)
+    coordinates = [(y_coordinate + position * y_step,
+                    x_coordinate + position * x_step)
+                   for position in range(size)]
+    return Ship(name, size, coordinates), offset
+
+
+class GameRecordWriter:
+    """
+    Class GameRecordWriter. Writes game records to a file one shot
+    at a time, so a game is never held in memory.
+    Contains attributes:
+    :param path: path of the file
+    :type path: str
+    """
+    def __init__(self, path: str):
+        """
+        Creates the file and writes its header.
+        """
+        self._file = open(path, "wb")
+        self._file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+        self._offsets = []
+        self._record_offset = None
+        self._boards_edge = None
+        self._shots = 0
+
+    def games(self):
+        """
+        Method that returns number of games written so far.
+        """
+        return len(self._offsets)
+
+    def begin_game(self, boards: List[GameBoard]):
+        """
+        Method that starts a record of a game played on the given
+        boards (one or two) and writes their fleets. Raises ValueError
+        (before anything is written) if the game doesn't fit
+        in a record.
+        """
+        boards_edge = boards[0].boards_edge()
+        if boards_edge * boards_edge > MAX_FIELDS:
+            raise ValueError("Board is too big for a game record")
+        if len(boards) not in (1, 2):
+            raise ValueError("A game record holds one or two boards")
+        for board in boards:
+            check_fleet(board.fleet())
+        if self._record_offset is not None:
+            self.end_game()
+        self._record_offset = self._file.tell()
+        self._boards_edge = boards_edge
+        self._shots = 0
+        self._file.write(RECORD_HEADER.pack(boards_edge, len(boards), 0))
+        for board in boards:
+            self._file.write(FLEET_HEADER.pack(len(board.fleet())))
+            for each_ship in board.fleet():
+                self._file.write(encode_ship(each_ship, boards_edge))
+
+    def record_shot(self, board_number: int, coordinate: tuple,
+                    outcome: int):
+        """
+        Method that appends a shot at the given board to the game.
+        """
+        y_coordinate, x_coordinate = coordinate
+        field = y_coordinate * self._boards_edge + x_coordinate
+        packed = (field << 3) | (board_number << 2) | outcome
+        self._file.write(packed.to_bytes(SHOT_BYTES, "little"))
+        self._shots += 1
+
+    def end_game(self):
+        """
+        Method that finishes the game's record (writes the end marker
+        and number of shots into record's header).
+        """
+        self._file.write(RECORD_END)
+        end_offset = self._file.tell()
+        self._file.seek(self._record_offset + RECORD_HEADER.size - 4)
+        self._file.write(struct.pack("<I", self._shots))
+        self._file.seek(end_offset)
+        self._offsets.append(self._record_offset)
+        self._record_offset = None
+
+    def flush(self):
+        """
+        Method that writes buffered data to the file, so the finished
+        games can be read even if the writer is never closed.
+        """
+        self._file.flush()
+
+    def close(self):
+        """
+        Method that finishes the last game and writes the index.
+        """
+        if self._file.closed:
+            return
+        if self._record_offset is not None:
+            self.end_game()
+        index_offset = self._file.tell()
+        self._file.write(np.array(self._offsets, dtype="<u8").tobytes())
+        self._file.write(TRAILER.pack(index_offset, len(self._offsets),
+                                      TRAILER_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class GameRecord:
+    """
+    Class GameRecord. One game read from a record file.
+    Contains attributes:
+    :param boards_edge: length of Game Board's edge.
+    :type boards_edge: int
+
+    :param fleets: fleet of each board
+    :type fleets: List of lists of Ships
+
+    :param shots: packed shots (see the file's description)
+    :type shots: Numpy array of uint32
+    """
+    def __init__(self, boards_edge: int, fleets: List[List[Ship]],
+                 shots: np.ndarray):
+        """
+        Creates instance of a game record.
+        """
+        self._boards_edge = boards_edge
+        self._fleets = fleets
+        self._shots = shots
+
+    def boards_edge(self):
+        """
+        Method that return record's boards_edge attribute.
+        """
+        return self._boards_edge
+
+    def fleets(self):
+        """
+        Method that return record's fleets attribute.
+        """
+        return self._fleets
+
+    def shots(self):
+        """
+        Method that returns decoded shots as three arrays:
+        number of the board shot at, coordinate (y, x) and outcome.
+        """
+        fields = self._shots >> 3
+        y_coordinates, x_coordinates = np.divmod(fields, self._boards_edge)
+        return ((self._shots >> 2) & 1,
+                np.stack([y_coordinates, x_coordinates], axis=1),
+                self._shots & 3)
+
+    def board_at(self, board_number: int, turn: int):
+        """
+        Method that reconstructs the given game board after the first
+        turn shots of the game (shots at other boards included in turn).
+        """
+        board = GameBoard(self._boards_edge)
+        for each_ship in self._fleets[board_number]:
+            board.add_ship(Ship(each_ship.name(), each_ship.size(),
+                                list(each_ship.coordinates())))
+        boards, coordinates, _ = self.shots()
+        for shot_board, coordinate in zip(boards[:turn], coordinates[:turn]):
+            if shot_board == board_number:
+                board.set_new_board_status(tuple(int(each)
+                                                 for each in coordinate))
+        return board
+
+
+class GameRecordReader:
+    """
+    Class GameRecordReader. Reads game records from a file mapped into
+    memory, so only the read games are loaded.
+    Contains attributes:
+    :param path: path of the file
+    :type path: str
+
+    If the file hasn't been closed properly (it has no index) the index
+    is rebuilt by walking through the records.
+    """
+    def __init__(self, path: str):
+        """
+        Maps the file and reads its index.
+        """
+        self._file = open(path, "rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+        magic, version = FILE_HEADER.unpack_from(self._buffer, 0)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError("Not a game record file")
+        self._offsets = self._read_index()
+
+    def _read_index(self):
+        """
+        Helper method of __init__. Returns offsets of the records.
+        """
+        if len(self._buffer) >= FILE_HEADER.size + TRAILER.size:
+            index_offset, games, magic = TRAILER.unpack_from(
+                self._buffer, len(self._buffer) - TRAILER.size)
+            if magic == TRAILER_MAGIC:
+                return np.frombuffer(self._buffer, dtype="<u8",
+                                     count=games, offset=index_offset)
+        offsets = []
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= len(self._buffer):
+            _, boards, shots = RECORD_HEADER.unpack_from(self._buffer,
+                                                         offset)
+            if boards not in (1, 2):
+                break
+            try:
+                end = self._shots_offset(offset) + shots * SHOT_BYTES
+            except struct.error:
+                break
+            if self._buffer[end:end + SHOT_BYTES] != RECORD_END:
+                break
+            offsets.append(offset)
+            offset = end + SHOT_BYTES
+        return np.array(offsets, dtype="<u8")
+
+    def _shots_offset(self, offset: int):
+        """
+        Helper method. Returns offset of the shots of the record
+        starting at the offset (skips record's header and fleets).
+        """
+        _, boards, _ = RECORD_HEADER.unpack_from(self._buffer, offset)
+        offset += RECORD_HEADER.size
+        for _ in range(boards):
+            (ships,) = FLEET_HEADER.unpack_from(self._buffer, offset)
+            offset += FLEET_HEADER.size
+            for _ in range(ships):
+                (name_length,) = SHIP_HEADER.unpack_from(self._buffer, offset)
+                offset += SHIP_HEADER.size + name_length + SHIP_BODY.size
+        return offset
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def game(self, game_number: int):
+        """
+        Method that reads the game with the given number.
+        """
+        offset = int(self._offsets[game_number])
+        boards_edge, boards, shots = RECORD_HEADER.unpack_from(
+            self._buffer, offset)
+        offset += RECORD_HEADER.size
+        fleets = []
+        for _ in range(boards):
+            (ships,) = FLEET_HEADER.unpack_from(self._buffer, offset)
+            offset += FLEET_HEADER.size
+            fleet = []
+            for _ in range(ships):
+                each_ship, offset = decode_ship(self._buffer, offset,
+                                                boards_edge)
+                fleet.append(each_ship)
+            fleets.append(fleet)
+        packed = np.frombuffer(self._buffer, dtype=np.uint8,
+                               count=shots * SHOT_BYTES, offset=offset)
+        packed = packed.reshape(shots, SHOT_BYTES).astype(np.uint32)
+        shots_array = packed[:, 0] | (packed[:, 1] << 8) | (packed[:, 2] << 16)
+        return GameRecord(boards_edge, fleets, shots_array)
+
+    def close(self):
+        """
+        Method that closes the file.
+        """
+        self._offsets = None
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
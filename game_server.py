@@ -0,0 +1,350 @@
+import argparse
+import asyncio
+from random import Random
+from coordinate_codec import encode_coordinate
+from fleet_placer import PlacementTimeout, place_fleet
+from game_board import GameBoard
+from game_interface import parse_coordinate
+from game_record import SUNK, shot_outcome
+from players import BotPlayer, HumanPlayer
+from renderer import VIEWPORT_EDGE, board_symbols, render_frame
+from renderer import viewport_window
+
+"""
+This file contains asyncio server hosting games of human players
+against Bot Players. Every connection is one game session, handled by
+a coroutine, so thousands of sessions share one thread. Only placing
+Bot Player's fleet, which may take up to PLACEMENT_TIME_BUDGET, runs
+in the event loop's thread pool, so it doesn't hold up other sessions.
+
+Protocol is line based. After connecting the client gets
+"WELCOME <boards_edge>" and places its fleet, in fleet's order:
+    PLACE <coordinate> <direction>  - e.g. "PLACE A5 down",
+                                      answer "PLACED <ship>"
+    AUTO                            - places all the remaining ships
+When the whole fleet is placed the server sends "READY". Then:
+    FIRE <coordinate>  - answers "MISS", "HIT" or "SUNK <ship>",
+                         then opponent's shot "ENEMY <coordinate>
+                         <outcome>" and "TURN", or "WIN" / "LOSE"
+                         when the game is over
+    BOARD              - both boards drawn, ended with "END"
+    QUIT               - ends the session
+Wrong commands are answered with "ERROR <message>".
+"""
+
+DIRECTIONS = {"u": "up", "d": "down", "l": "left", "r": "right"}
+
+"""
+Number of connections waiting to be accepted, big enough for thousands
+of clients connecting at once.
+"""
+CONNECTIONS_BACKLOG = 4096
+
+"""
+Time (in seconds) Bot Player may take to choose its shot
+(see BotPlayer.choose_shot).
+"""
+BOT_MOVE_TIME_BUDGET = 0.05
+
+
+def outcome_message(damaged_ship, shipwreck):
+    """
+    Function that describes shot's outcome.
+    """
+    outcome = shot_outcome(damaged_ship, shipwreck)
+    if outcome == SUNK:
+        return f"SUNK {shipwreck.name()}"
+    return ("MISS", "HIT")[outcome]
+
+
+class GameSession:
+    """
+    Class GameSession. One game of a human player against Bot Player,
+    driven by protocol's commands.
+    Contains attributes:
+    :param boards_edge: length of Game Boards' edge.
+    :type boards_edge: int
+
+    :param rng: random number generator of the session
+    :type rng: instance of random.Random
+
+    :param fleet: names of both players' ships (keys) and their sizes
+    (values). By default == naval_fleet
+    :type fleet: dict
+    """
+    def __init__(self, boards_edge: int = 10, rng: Random = None,
+                 fleet: dict = None):
+        """
+        Creates session with Bot Player's fleet already arranged.
+        """
+        if not rng:
+            rng = Random()
+        self._rng = rng
+        self._player = HumanPlayer("Player", GameBoard(boards_edge), fleet)
+        self._opponent = BotPlayer("Opponent", GameBoard(boards_edge),
+                                   rng=rng, fleet=fleet)
+        self._opponent.opponent_arranges_ships_on_board("solver")
+        self._ships_to_place = list(self._player.fleet())
+        self._finished = False
+
+    def player(self):
+        """
+        Method that return session's player attribute.
+        """
+        return self._player
+
+    def opponent(self):
+        """
+        Method that return session's opponent attribute.
+        """
+        return self._opponent
+
+    def finished(self):
+        """
+        Method that return session's finished attribute.
+        """
+        return self._finished
+
+    def greeting(self):
+        """
+        Method that returns lines sent after connecting.
+        """
+        return [f"WELCOME {self._player.game_board().boards_edge()}"]
+
+    def handle(self, line: str):
+        """
+        Method that executes one command. Returns lines of the answer.
+        """
+        command, _, arguments = line.strip().partition(" ")
+        command = command.upper()
+        if command == "QUIT":
+            self._finished = True
+            return ["BYE"]
+        if command == "BOARD":
+            return self._boards()
+        if self._ships_to_place:
+            if command == "PLACE":
+                return self._place(arguments.split())
+            if command == "AUTO":
+                return self._auto_place()
+            return ["ERROR Place your fleet first"]
+        if command == "FIRE" and not self._finished:
+            return self._fire(arguments.strip())
+        return ["ERROR Unknown command"]
+
+    def _placed(self, ship: str):
+        """
+        Helper method. Answer after the ship has been placed.
+        """
+        self._ships_to_place.remove(ship)
+        answer = [f"PLACED {ship}"]
+        if not self._ships_to_place:
+            answer.append("READY")
+        return answer
+
+    def _place(self, arguments: list):
+        """
+        Helper method of handle. Places next ship of the fleet.
+        """
+        if len(arguments) != 2:
+            return ["ERROR Usage: PLACE <coordinate> <direction>"]
+        board = self._player.game_board()
+        bow, message = parse_coordinate(arguments[0], board)
+        if bow is None:
+            return [f"ERROR {message}"]
+        direction = arguments[1].lower()
+        direction = DIRECTIONS.get(direction, direction)
+        ship = self._ships_to_place[0]
+        if not self._player.place_ship(ship, bow, direction):
+            return ["ERROR You cannot place the ship in this area"]
+        return self._placed(ship)
+
+    def _auto_place(self):
+        """
+        Helper method of handle. Places all the remaining ships randomly
+        (with place_fleet, so they are placed whenever it is possible).
+        """
+        board = self._player.game_board()
+        fleet = self._player.fleet()
+        occupied = [coordinate for each_ship in board.fleet()
+                    for coordinate in each_ship.coordinates()]
+        remaining = {ship: fleet[ship] for ship in self._ships_to_place}
+        try:
+            ships = place_fleet(board.boards_edge(), remaining, occupied,
+                                self._rng)
+        except PlacementTimeout:
+            ships = None
+        if ships is None:
+            return ["ERROR Remaining ships don't fit on the board"]
+        answer = []
+        for new_ship in ships:
+            board.add_ship(new_ship)
+            answer += self._placed(new_ship.name())
+        return answer
+
+    def _fire(self, argument: str):
+        """
+        Helper method of handle. Fires player's shot and Bot Player's
+        answer.
+        """
+        opponents_board = self._opponent.game_board()
+        coordinate, message = parse_coordinate(argument, opponents_board)
+        if coordinate is None:
+            return [f"ERROR {message}"]
+        if self._player.chosen_before_coordinate(coordinate):
+            return ["ERROR You have already chosen this coordinate"]
+        _, damaged_ship, shipwreck, loser = \
+            self._player.fire_at(self._opponent, coordinate)
+        answer = [outcome_message(damaged_ship, shipwreck)]
+        if loser:
+            self._finished = True
+            return answer + ["WIN"]
+        _, damaged_ship, shipwreck, loser = \
+            self._opponent.attack_player(self._player, BOT_MOVE_TIME_BUDGET)
+        enemy_shot = self._opponent.last_chosen_coordinate()
+        answer.append(f"ENEMY {encode_coordinate(enemy_shot)} "
+                      f"{outcome_message(damaged_ship, shipwreck)}")
+        if loser:
+            self._finished = True
+            return answer + ["LOSE"]
+        return answer + ["TURN"]
+
+    def _boards(self):
+        """
+        Helper method of handle. Draws both boards (windows of
+        the viewport's size of bigger boards).
+        """
+        frames = ""
+        boards = ((self._opponent, "Opponent's Ocean Grid", False),
+                  (self._player, "Your Ocean Grid", True))
+        for player, title, reveal_ships in boards:
+            board = player.game_board()
+            window = viewport_window(board.boards_edge(), VIEWPORT_EDGE)
+            top, left, _, _ = window
+            frames += render_frame(
+                title, board_symbols(board, reveal_ships, window), top, left)
+        return frames.splitlines() + ["END"]
+
+
+class GameServer:
+    """
+    Class GameServer. Asyncio TCP server of game sessions.
+    Contains attributes:
+    :param boards_edge: length of Game Boards' edge in every session
+    :type boards_edge: int
+
+    :param seed: seed of sessions' random number generators
+    (By default sessions are not reproducible)
+    :type seed: int
+
+    :param fleet: fleet of every session (see GameSession)
+    :type fleet: dict
+    """
+    def __init__(self, boards_edge: int = 10, seed: int = None,
+                 fleet: dict = None):
+        """
+        Creates instance of a game server.
+        """
+        self._boards_edge = boards_edge
+        self._fleet = fleet
+        self._rng = Random(seed)
+        self._server = None
+        self._sessions = 0
+
+    def sessions(self):
+        """
+        Method that return server's sessions attribute
+        (number of sessions started so far).
+        """
+        return self._sessions
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter):
+        """
+        Method that runs one game session over the connection
+        (the session is created in a worker thread, because placing
+        Bot Player's fleet may take long).
+        If Bot Player's fleet can't be placed or the client sends a line
+        longer than the stream's limit, the client gets
+        "ERROR <message>" and the connection is closed.
+        """
+        self._sessions += 1
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                session = await loop.run_in_executor(
+                    None, GameSession, self._boards_edge,
+                    Random(self._rng.getrandbits(64)), self._fleet)
+            except (ValueError, PlacementTimeout) as error:
+                writer.write(f"ERROR {error}\n".encode())
+                return
+            writer.write(("\n".join(session.greeting()) + "\n").encode())
+            while not session.finished():
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b"ERROR Line is too long\n")
+                    break
+                if not line:
+                    break
+                answer = session.handle(line.decode(errors="replace"))
+                writer.write(("\n".join(answer) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Method that starts listening. Returns port the server listens on.
+        """
+        self._server = await asyncio.start_server(
+            self.handle_connection, host, port, backlog=CONNECTIONS_BACKLOG)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Method that stops the server.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        """
+        Method that serves sessions until the server is stopped.
+        """
+        await self._server.serve_forever()
+
+
+async def serve(host: str, port: int, boards_edge: int):
+    """
+    Function that starts the server and serves sessions forever.
+    """
+    server = GameServer(boards_edge)
+    port = await server.start(host, port)
+    print(f"Serving Battleships on {host}:{port}")
+    await server.serve_forever()
+
+
+def main():
+    """
+    Function that runs the server from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Battleships game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--edge", type=int, default=10)
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.edge))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import functools
+import json
+import math
+import time
+
+"""
+This file contains opt-in instrumentation of the game engine.
+enable() wraps chosen methods of the game's classes, so that every call
+is counted and timed, disable() puts the original methods back.
+While instrumentation is disabled the classes are not changed at all,
+so it costs nothing. Code inside the methods can count events
+(e.g. retries), guarded by a check of ENABLED.
+
+Latencies are kept in histograms with logarithmic buckets, from which
+percentiles are estimated. Snapshots of the metrics can be exported
+as JSON or as Prometheus text format.
+"""
+
+"""
+Whether the instrumentation is enabled (checked before counting events).
+"""
+ENABLED = False
+
+"""
+Upper bound of the first histogram's bucket (in seconds), growth
+of the bounds from one bucket to the next and number of buckets
+(the last one ends at about 200 seconds).
+"""
+HISTOGRAM_FIRST_BOUND = 1e-7
+HISTOGRAM_GROWTH = 2 ** 0.25
+HISTOGRAM_BUCKETS = 128
+
+"""
+Percentiles reported in snapshots.
+"""
+PERCENTILES = (50, 95, 99)
+
+"""
+Methods instrumented by default: class name -> names of its methods.
+"""
+DEFAULT_METHODS = {
+    "GameBoard": ("add_ship", "resolve_shot", "set_new_board_status",
+                  "occupied_fields"),
+    "Ship": ("register_hit", "is_it_afloat"),
+    "Player": ("ship_hull_placement", "random_ship_placement",
+               "remove_coordinate_from_memory", "has_lost"),
+    "HumanPlayer": ("place_ship", "fire_at"),
+    "BotPlayer": ("attack_player", "choose_new_hit", "choose_shot", "fire_at",
+                  "based_on_hit_memory", "choose_along_the_axis",
+                  "opponent_arranges_ships_on_board"),
+}
+
+METRICS_PREFIX = "battleships"
+
+
+class LatencyHistogram:
+    """
+    Class LatencyHistogram. Counts calls, their cumulative time
+    and the number of calls in each bucket of latency.
+    Bucket n counts latencies up to
+    HISTOGRAM_FIRST_BOUND * HISTOGRAM_GROWTH ** n.
+    """
+    __slots__ = ("_count", "_total", "_buckets")
+
+    def __init__(self):
+        """
+        Creates empty histogram.
+        """
+        self._count = 0
+        self._total = 0.0
+        self._buckets = [0] * HISTOGRAM_BUCKETS
+
+    def count(self):
+        """
+        Method that return histogram's count attribute.
+        """
+        return self._count
+
+    def total(self):
+        """
+        Method that return histogram's total attribute (in seconds).
+        """
+        return self._total
+
+    def buckets(self):
+        """
+        Method that return histogram's buckets attribute.
+        """
+        return self._buckets
+
+    def record(self, seconds: float):
+        """
+        Method that adds one latency to the histogram.
+        """
+        self._count += 1
+        self._total += seconds
+        if seconds <= HISTOGRAM_FIRST_BOUND:
+            bucket = 0
+        else:
+            bucket = math.ceil(math.log(seconds / HISTOGRAM_FIRST_BOUND,
+                                        HISTOGRAM_GROWTH))
+            bucket = min(bucket, HISTOGRAM_BUCKETS - 1)
+        self._buckets[bucket] += 1
+
+    def percentile(self, percent: float):
+        """
+        Method that estimates given percentile of latency - returns
+        upper bound of the bucket it falls into (0 for empty histogram).
+        """
+        if not self._count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * self._count))
+        cumulative = 0
+        for bucket, calls in enumerate(self._buckets):
+            cumulative += calls
+            if cumulative >= rank:
+                return bucket_bound(bucket)
+        return bucket_bound(HISTOGRAM_BUCKETS - 1)
+
+
+def bucket_bound(bucket: int):
+    """
+    Function that returns upper bound of the histogram's bucket.
+    """
+    return HISTOGRAM_FIRST_BOUND * HISTOGRAM_GROWTH ** bucket
+
+
+class Metrics:
+    """
+    Class Metrics. Latency histograms of instrumented methods
+    (by method's name, e.g. "BotPlayer.attack_player") and counters
+    of events.
+    """
+    def __init__(self):
+        """
+        Creates empty metrics.
+        """
+        self._histograms = {}
+        self._counters = {}
+
+    def histogram(self, name: str):
+        """
+        Method that returns histogram of the method (creates it
+        if it doesn't exist yet).
+        """
+        if name not in self._histograms:
+            self._histograms[name] = LatencyHistogram()
+        return self._histograms[name]
+
+    def count(self, event: str, amount: int = 1):
+        """
+        Method that adds amount to the event's counter.
+        """
+        self._counters[event] = self._counters.get(event, 0) + amount
+
+    def counter(self, event: str):
+        """
+        Method that returns value of the event's counter.
+        """
+        return self._counters.get(event, 0)
+
+    def reset(self):
+        """
+        Method that clears all the metrics.
+        """
+        self._histograms.clear()
+        self._counters.clear()
+
+    def snapshot(self):
+        """
+        Method that returns metrics as a dictionary:
+        "methods" - for each method its calls, cumulative time and
+        percentiles of latency (in seconds), "counters" - events' counts.
+        """
+        methods = {}
+        for name, histogram in sorted(self._histograms.items()):
+            method = {"calls": histogram.count(),
+                      "total_seconds": histogram.total()}
+            for percent in PERCENTILES:
+                method[f"p{percent}"] = histogram.percentile(percent)
+            methods[name] = method
+        return {"methods": methods, "counters": dict(sorted(
+            self._counters.items()))}
+
+    def to_json(self):
+        """
+        Method that exports snapshot of the metrics as JSON.
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """
+        Method that exports the metrics in Prometheus text format:
+        latencies as summaries, events as counters.
+        """
+        latency = f"{METRICS_PREFIX}_method_latency_seconds"
+        events = f"{METRICS_PREFIX}_events_total"
+        lines = [f"# HELP {latency} Latency of instrumented methods.",
+                 f"# TYPE {latency} summary"]
+        for name, histogram in sorted(self._histograms.items()):
+            label = f'method="{name}"'
+            for percent in PERCENTILES:
+                lines.append(f'{latency}{{{label},quantile="{percent / 100}"}}'
+                             f" {histogram.percentile(percent):.9g}")
+            lines.append(f"{latency}_sum{{{label}}} {histogram.total():.9g}")
+            lines.append(f"{latency}_count{{{label}}} {histogram.count()}")
+        lines += [f"# HELP {events} Events counted inside methods.",
+                  f"# TYPE {events} counter"]
+        for event, value in sorted(self._counters.items()):
+            lines.append(f'{events}{{event="{event}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+_metrics = Metrics()
+_originals = {}
+
+
+def get_metrics():
+    """
+    Function that returns metrics collected by the instrumentation.
+    """
+    return _metrics
+
+
+def count(event: str, amount: int = 1):
+    """
+    Function that counts an event. Callers check ENABLED first,
+    so that disabled instrumentation costs only that check.
+    """
+    _metrics.count(event, amount)
+
+
+def timed(name: str, method):
+    """
+    Function that wraps method, so that its calls are recorded
+    in the histogram of the given name (looked up on every call,
+    so the wrapper keeps recording after the metrics are reset).
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _metrics.histogram(name).record(time.perf_counter() - start)
+    return wrapper
+
+
+def default_classes():
+    """
+    Function that returns classes instrumented by default
+    (imported here, because the game's modules use this one).
+    """
+    from game_board import GameBoard
+    from players import BotPlayer, HumanPlayer, Player
+    from ship import Ship
+    return {"GameBoard": GameBoard, "Ship": Ship, "Player": Player,
+            "HumanPlayer": HumanPlayer, "BotPlayer": BotPlayer}
+
+
+def enable(methods: dict = None, classes: dict = None):
+    """
+    Function that enables the instrumentation: wraps given methods
+    (class name -> names of its methods, by default DEFAULT_METHODS)
+    of the classes (class name -> class). Only methods defined in
+    the class itself are wrapped (not the inherited ones).
+    """
+    global ENABLED
+    if methods is None:
+        methods = DEFAULT_METHODS
+    if classes is None:
+        classes = default_classes()
+    for class_name, method_names in methods.items():
+        instrumented_class = classes[class_name]
+        for method_name in method_names:
+            key = (instrumented_class, method_name)
+            if key in _originals:
+                continue
+            method = instrumented_class.__dict__.get(method_name)
+            if method is None:
+                continue
+            _originals[key] = method
+            setattr(instrumented_class, method_name,
+                    timed(f"{class_name}.{method_name}", method))
+    ENABLED = True
+
+
+def disable():
+    """
+    Function that disables the instrumentation: puts back all
+    the original methods. Collected metrics are kept.
+    """
+    global ENABLED
+    for (instrumented_class, method_name), method in _originals.items():
+        setattr(instrumented_class, method_name, method)
+    _originals.clear()
+    ENABLED = False
@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import time
+from random import Random
+import numpy as np
+from coordinate_codec import encode_coordinate
+from game_server import GameServer
+
+"""
+This file contains load generator of the game server. Every simulated
+client plays whole sessions: it places its fleet with AUTO and fires
+at random untried coordinates until the game is over, timing each move
+(from sending FIRE to reading the last line of the answer).
+"""
+
+"""
+Lines ending server's answer to a FIRE command.
+"""
+FINAL_LINES = ("TURN", "WIN", "LOSE", "BYE")
+
+
+class LoadReport:
+    """
+    Class LoadReport. Results of a load test.
+    Contains attributes:
+    :param sessions: number of finished sessions
+    :type sessions: int
+
+    :param elapsed: duration of the test (in seconds)
+    :type elapsed: float
+
+    :param latencies: duration of each move (in seconds)
+    :type latencies: list of floats
+    """
+    def __init__(self, sessions: int, elapsed: float, latencies: list):
+        """
+        Creates instance of a load report.
+        """
+        self._sessions = sessions
+        self._elapsed = elapsed
+        self._latencies = np.array(latencies, dtype=float)
+
+    def sessions(self):
+        """
+        Method that return report's sessions attribute.
+        """
+        return self._sessions
+
+    def elapsed(self):
+        """
+        Method that return report's elapsed attribute.
+        """
+        return self._elapsed
+
+    def moves(self):
+        """
+        Method that returns number of timed moves.
+        """
+        return len(self._latencies)
+
+    def sessions_per_second(self):
+        """
+        Method that returns number of sessions finished per second.
+        """
+        return self._sessions / self._elapsed
+
+    def latency_percentile(self, percent: float):
+        """
+        Method that returns given percentile of move latency
+        (in milliseconds).
+        """
+        if not len(self._latencies):
+            return 0.0
+        return float(np.percentile(self._latencies, percent)) * 1000
+
+    def __str__(self):
+        """
+        Returns summary of the report.
+        """
+        return (f"{self._sessions} sessions in {self._elapsed:.2f} s "
+                f"({self.sessions_per_second():.1f} sessions/s), "
+                f"{self.moves()} moves, "
+                f"latency p50 {self.latency_percentile(50):.2f} ms, "
+                f"p99 {self.latency_percentile(99):.2f} ms")
+
+
+async def read_answer(reader: asyncio.StreamReader,
+                      final_lines: tuple = FINAL_LINES):
+    """
+    Function that reads server's lines until the one ending the answer
+    (one of final_lines or an error). Returns all the lines read.
+    """
+    lines = []
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        lines.append(line)
+        if line in final_lines or line.startswith("ERROR"):
+            return lines
+
+
+async def play_session(host: str, port: int, rng: Random,
+                       latencies: list):
+    """
+    Function that plays one session against the server.
+    Appends latency of each move to latencies. Returns last line
+    sent by the server ("WIN" or "LOSE").
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        greeting = (await reader.readline()).decode().split()
+        boards_edge = int(greeting[1])
+        writer.write(b"AUTO\n")
+        answer = await read_answer(reader, ("READY",))
+        if answer[-1] != "READY":
+            raise ConnectionError(f"Fleet not placed: {answer[-1]}")
+        fields = list(range(boards_edge * boards_edge))
+        rng.shuffle(fields)
+        for field in fields:
+            coordinate = encode_coordinate(divmod(field, boards_edge))
+            started = time.perf_counter()
+            writer.write(f"FIRE {coordinate}\n".encode())
+            answer = await read_answer(reader)
+            latencies.append(time.perf_counter() - started)
+            if answer[-1] != "TURN":
+                return answer[-1]
+    finally:
+        writer.close()
+
+
+async def client(host: str, port: int, rng: Random, deadline: float,
+                 sessions: int, started: list, results: list,
+                 latencies: list):
+    """
+    Function that plays sessions one after another until given number
+    of sessions has been started (counted by all the clients in started)
+    or the deadline is reached.
+    """
+    while started[0] < sessions and time.perf_counter() < deadline:
+        started[0] += 1
+        results.append(await play_session(host, port, rng, latencies))
+
+
+async def generate_load(host: str, port: int, clients: int = 100,
+                        sessions: int = 1000, duration: float = 60.0,
+                        seed: int = None):
+    """
+    Function that runs given number of concurrent clients until they
+    finish given number of sessions (or the duration runs out).
+    Returns LoadReport.
+    """
+    rng = Random(seed)
+    started_sessions = [0]
+    results = []
+    latencies = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        client(host, port, Random(rng.getrandbits(64)), deadline,
+               sessions, started_sessions, results, latencies)
+        for _ in range(clients)))
+    return LoadReport(len(results), time.perf_counter() - started, latencies)
+
+
+async def local_load_test(boards_edge: int = 10, clients: int = 100,
+                          sessions: int = 1000, duration: float = 60.0,
+                          seed: int = None):
+    """
+    Function that starts the server in this process and runs
+    the load generator against it. Returns LoadReport.
+    """
+    server = GameServer(boards_edge, seed)
+    port = await server.start()
+    try:
+        return await generate_load("127.0.0.1", port, clients, sessions,
+                                   duration, seed)
+    finally:
+        await server.close()
+
+
+def main():
+    """
+    Function that runs the load generator from the command line.
+    Without --port the server is started locally.
+    """
+    parser = argparse.ArgumentParser(
+        description="Load generator of Battleships game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--edge", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--seed", type=int)
+    arguments = parser.parse_args()
+    if arguments.port is None:
+        report = asyncio.run(local_load_test(
+            arguments.edge, arguments.clients, arguments.sessions,
+            arguments.duration, arguments.seed))
+    else:
+        report = asyncio.run(generate_load(
+            arguments.host, arguments.port, arguments.clients,
+            arguments.sessions, arguments.duration, arguments.seed))
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
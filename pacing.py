@@ -0,0 +1,74 @@
+import time
+
+"""
+This file contains clocks that pace the game's messages.
+All the pauses in the game go through pause(), so they can be
+switched off (for tests, bots and the hosted service) by setting
+FastClock with set_clock().
+"""
+
+
+class Clock:
+    """
+    Class Clock. Clock that really waits.
+    """
+
+    def sleep(self, seconds: float):
+        """
+        Method that waits given number of seconds.
+        """
+        time.sleep(seconds)
+
+
+class FastClock(Clock):
+    """
+    Class FastClock. Subclass of Clock that doesn't wait at all,
+    it only adds up the time it was asked to wait.
+    Contains attributes:
+    :param slept: number of seconds that would have been waited
+    :type slept: float
+    """
+    def __init__(self):
+        """
+        Creates instance of a fast clock.
+        """
+        self._slept = 0.0
+
+    def slept(self):
+        """
+        Method that return clock's slept attribute.
+        """
+        return self._slept
+
+    def sleep(self, seconds: float):
+        """
+        Method that notes given number of seconds without waiting.
+        """
+        self._slept += seconds
+
+
+_clock = Clock()
+
+
+def get_clock():
+    """
+    Function that returns clock used by the game.
+    """
+    return _clock
+
+
+def set_clock(new_clock: Clock):
+    """
+    Function that sets clock used by the game. Returns previous clock.
+    """
+    global _clock
+    previous_clock = _clock
+    _clock = new_clock
+    return previous_clock
+
+
+def pause(seconds: float):
+    """
+    Function that pauses the game for given number of seconds.
+    """
+    _clock.sleep(seconds)
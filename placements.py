@@ -0,0 +1,274 @@
+from functools import lru_cache
+import numpy as np
+from ship import Ship, naval_fleet
+
+"""
+This file contains tables of all possible ship placements.
+For each board's edge and ship's size a table is built only once
+and it is kept in a bounded cache. Checking which placements are legal
+on a particular board comes down to a single Numpy mask test.
+"""
+
+"""
+Maximal number of (boards_edge, ship_size) tables kept in the cache.
+"""
+PLACEMENT_TABLES_CACHE_SIZE = 64
+
+"""
+Number of layouts that random_fleet_layouts draws at once
+(it bounds the size of temporary arrays).
+"""
+LAYOUTS_BLOCK_SIZE = 4096
+
+"""
+Number of times random_fleet_layouts draws layouts that have run
+into a dead end (a ship with no legal placement left) again before
+it gives up.
+"""
+LAYOUT_ATTEMPTS = 100
+
+"""
+Largest board (number of fields) for which placement tables are built.
+On bigger boards placements are computed one at a time
+(see placement_coordinates), because the tables would be huge.
+"""
+PLACEMENT_TABLE_MAX_FIELDS = 1 << 16
+
+
+def placements_count(boards_edge: int, ship_size: int):
+    """
+    Function that returns number of all placements of a ship
+    of given size on a board with given edge.
+    """
+    return 2 * boards_edge * max(boards_edge - ship_size + 1, 0)
+
+
+def placement_coordinates(boards_edge: int, ship_size: int,
+                          placement: int):
+    """
+    Function that returns fields of the placement (numbered like
+    in PlacementTable) as list of tuples, without building the table.
+    """
+    starts_in_line = boards_edge - ship_size + 1
+    horizontal_count = boards_edge * starts_in_line
+    if placement < horizontal_count:
+        y_coordinate, x_coordinate = divmod(placement, starts_in_line)
+        return [(y_coordinate, x_coordinate + offset)
+                for offset in range(ship_size)]
+    y_coordinate, x_coordinate = divmod(placement - horizontal_count,
+                                        boards_edge)
+    return [(y_coordinate + offset, x_coordinate)
+            for offset in range(ship_size)]
+
+
+class PlacementTable:
+    """
+    Class PlacementTable. All placements of a ship of given size
+    on a board with given edge.
+    Fields are numbered y * boards_edge + x. Horizontal placements
+    come first, ordered by their leftmost field, then vertical ones,
+    ordered by their top field.
+    Contains attributes:
+    :param boards_edge: length of Game Board's edge.
+    :type boards_edge: int
+
+    :param ship_size: Ship's size
+    :type ship_size: int
+
+    :param cells: fields of each placement, in order from
+    the leftmost (top) field
+    :type cells: Numpy array of shape (placements, ship_size)
+    """
+    def __init__(self, boards_edge: int, ship_size: int):
+        """
+        Creates table of all placements.
+        """
+        self._boards_edge = boards_edge
+        self._ship_size = ship_size
+        starts_in_line = max(boards_edge - ship_size + 1, 0)
+        line = np.arange(boards_edge)
+        offsets = np.arange(ship_size)
+        starts = np.arange(starts_in_line)
+        # horizontal: row * edge + (start + offset)
+        horizontal = (line[:, None, None] * boards_edge
+                      + starts[None, :, None] + offsets[None, None, :])
+        # vertical: (start + offset) * edge + column
+        vertical = ((starts[:, None, None] + offsets[None, None, :])
+                    * boards_edge + line[None, :, None])
+        self._horizontal_count = boards_edge * starts_in_line
+        self._cells = np.concatenate([
+            horizontal.reshape(-1, ship_size),
+            vertical.reshape(-1, ship_size)
+        ])
+        self._cells.setflags(write=False)
+        self._covering = None
+
+    def boards_edge(self):
+        """
+        Method that return table's boards_edge attribute.
+        """
+        return self._boards_edge
+
+    def ship_size(self):
+        """
+        Method that return table's ship_size attribute.
+        """
+        return self._ship_size
+
+    def cells(self):
+        """
+        Method that return table's cells attribute.
+        """
+        return self._cells
+
+    def horizontal_count(self):
+        """
+        Method that returns number of horizontal placements.
+        """
+        return self._horizontal_count
+
+    def __len__(self):
+        return len(self._cells)
+
+    def placement_index(self, start: tuple, horizontal: bool):
+        """
+        Method that returns index of the placement that starts at the given
+        leftmost (top) field. Returns None if the ship would stick out
+        of the board.
+        """
+        y_coordinate, x_coordinate = start
+        edge = self.boards_edge()
+        starts_in_line = edge - self.ship_size() + 1
+        if y_coordinate < 0 or x_coordinate < 0:
+            return None
+        if horizontal:
+            if x_coordinate >= starts_in_line or y_coordinate >= edge:
+                return None
+            return y_coordinate * starts_in_line + x_coordinate
+        if y_coordinate >= starts_in_line or x_coordinate >= edge:
+            return None
+        return (self.horizontal_count()
+                + y_coordinate * edge + x_coordinate)
+
+    def is_horizontal(self, placement: int):
+        """
+        Method that determines whether the placement is horizontal.
+        """
+        return placement < self.horizontal_count()
+
+    def coordinates(self, placement: int):
+        """
+        Method that returns fields of the placement as list of tuples.
+        """
+        edge = self.boards_edge()
+        return [divmod(int(cell), edge) for cell in self._cells[placement]]
+
+    def legal(self, occupied: np.ndarray, placements: np.ndarray = None):
+        """
+        Method that checks which placements don't overlap occupied fields.
+        occupied is a flat boolean array of all board's fields.
+        When placements (indices) are given only they are checked.
+        Returns boolean array.
+        """
+        if placements is None:
+            cells = self._cells
+        else:
+            cells = self._cells[placements]
+        return ~occupied[cells].any(axis=1)
+
+    def covering(self):
+        """
+        Method that returns placements covering each field, as a pair of
+        arrays (offsets, placements): placements covering field number i
+        are placements[offsets[i]:offsets[i + 1]].
+        They are built when needed for the first time.
+        """
+        if self._covering is None:
+            fields = self.boards_edge() * self.boards_edge()
+            flat_cells = self._cells.ravel()
+            owners = np.repeat(np.arange(len(self._cells)), self.ship_size())
+            order = np.argsort(flat_cells, kind="stable")
+            counts = np.bincount(flat_cells, minlength=fields)
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            self._covering = (offsets, owners[order])
+        return self._covering
+
+    def covering_field(self, cell: int):
+        """
+        Method that returns indices of placements covering the field.
+        """
+        offsets, placements = self.covering()
+        return placements[offsets[cell]:offsets[cell + 1]]
+
+
+@lru_cache(maxsize=PLACEMENT_TABLES_CACHE_SIZE)
+def placement_table(boards_edge: int, ship_size: int):
+    """
+    Function that returns (cached) table of all placements of a ship
+    of given size on a board with given edge.
+    """
+    return PlacementTable(boards_edge, ship_size)
+
+
+def random_fleet_layouts(boards_edge: int, count: int,
+                         fleet: dict = None, rng=None):
+    """
+    Function that draws count independent random fleet layouts.
+    Ships are placed one by one in fleet's order, each one uniformly
+    from the placements that are legal at that moment - exactly as
+    BotPlayer's "uniform" placement does, but for many layouts at once.
+    rng is a Numpy Generator or a seed.
+    Returns Numpy array of shape (count, ships): index of each ship's
+    placement in placement_table(boards_edge, ship's size).
+    """
+    if fleet is None:
+        fleet = naval_fleet
+    rng = np.random.default_rng(rng)
+    sizes = list(fleet.values())
+    layouts = np.zeros((count, len(sizes)), dtype=np.int64)
+    for first in range(0, count, LAYOUTS_BLOCK_SIZE):
+        pending = np.arange(first, min(first + LAYOUTS_BLOCK_SIZE, count))
+        for _ in range(LAYOUT_ATTEMPTS):
+            pending = pending[_draw_layouts(boards_edge, sizes, layouts,
+                                            pending, rng)]
+            if not len(pending):
+                break
+        else:
+            raise ValueError("Fleet can't be placed on the board")
+    return layouts
+
+
+def _draw_layouts(boards_edge: int, sizes: list, layouts: np.ndarray,
+                  rows: np.ndarray, rng: np.random.Generator):
+    """
+    Helper function of random_fleet_layouts. Draws the given rows
+    of layouts and returns boolean array telling which of them
+    have run into a dead end (they have to be drawn again).
+    """
+    occupied = np.zeros((len(rows), boards_edge * boards_edge), dtype=bool)
+    dead_ends = np.zeros(len(rows), dtype=bool)
+    for ship_number, ship_size in enumerate(sizes):
+        cells = placement_table(boards_edge, ship_size).cells()
+        if not len(cells):
+            raise ValueError("Fleet can't be placed on the board")
+        legal = ~occupied[:, cells].any(axis=2)
+        dead_ends |= ~legal.any(axis=1)
+        keys = np.where(legal, rng.random(legal.shape), -1.0)
+        chosen = keys.argmax(axis=1)
+        layouts[rows, ship_number] = chosen
+        occupied[np.arange(len(rows))[:, None], cells[chosen]] = True
+    return dead_ends
+
+
+def layout_ships(boards_edge: int, layout, fleet: dict = None):
+    """
+    Function that turns one layout drawn by random_fleet_layouts
+    into a list of ships.
+    """
+    if fleet is None:
+        fleet = naval_fleet
+    ships = []
+    for (name, ship_size), placement in zip(fleet.items(), layout):
+        table = placement_table(boards_edge, ship_size)
+        ships.append(Ship(name, ship_size, table.coordinates(placement)))
+    return ships
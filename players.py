@@ -1,13 +1,39 @@
+import time
 from typing import List
 import numpy as np
-from random import choice, randint
-import time
+from random import Random
 
 
+import instrumentation
+from cell_pool import CellPool
+from fleet_placer import place_fleet
 from game_board import GameBoard
+from placements import PLACEMENT_TABLE_MAX_FIELDS, placement_coordinates
+from placements import placement_table, placements_count
 from ship import Ship, naval_fleet
 from game_interface import choose_ship_placement, input_coordinate
-from game_interface import separator
+from renderer import get_renderer
+from zobrist import CHOSEN, status_change
+
+"""
+Maximal number of placements drawn on a huge board before
+random_ship_placement gives up.
+"""
+PLACEMENT_TRIES = 10000
+
+"""
+Largest board (number of fields) on which Bot Player's fleet
+is placed with "solver" placement by default. On bigger boards
+the solver's bitboards are too big, so a fleet that fits loosely
+(see BotPlayer.default_placement) is placed with "random" placement.
+"""
+SOLVER_PLACEMENT_MAX_FIELDS = 1 << 20
+
+"""
+Largest part of a huge board that ships together with the fields
+around them may take for the fleet to fit loosely.
+"""
+LOOSE_FLEET_MAX_FILL = 0.25
 
 
 class Player:
@@ -21,18 +47,34 @@ class Player:
     :type game_board: instance of a GameBoard class
 
     :param memory: player's memory
-    :type memory: Numpy array filled with zeros
+    :type memory: Numpy array filled with zeros (or other memory
+    created by the game board, see GameBoard.new_memory)
     (This parameter is needed in order to prevent player from choosing
     coordinate that has been already chosen before)
+
+    :param fleet: names of player's ships (keys) and their sizes (values)
+    :type fleet: dict. By default == naval_fleet
+
+    Player also keeps Zobrist hash of the memory (see zobrist.py),
+    updated whenever a coordinate is removed from it.
     """
-    def __init__(self, name: str, game_board: GameBoard):
+    __slots__ = ("_name", "_game_board", "_memory",
+                 "_last_chosen_coordinate", "_fleet", "_memory_hash")
+
+    def __init__(self, name: str, game_board: GameBoard,
+                 fleet: dict = None):
         """
         Creates instance of a player.
         """
         self._name = name
         self._game_board = game_board
-        board_dimension = game_board.boards_edge()
-        self._memory = np.zeros((board_dimension, board_dimension), dtype=int)
+        self._memory = game_board.new_memory()
+        self._memory_hash = 0
+        self._last_chosen_coordinate = None
+        if not fleet:
+            self._fleet = naval_fleet
+        else:
+            self._fleet = fleet
 
     def name(self):
         """
@@ -52,6 +94,25 @@ class Player:
         """
         return self._game_board
 
+    def fleet(self):
+        """
+        Method that return player's fleet attribute.
+        """
+        return self._fleet
+
+    def memory_hash(self):
+        """
+        Method that return player's memory_hash attribute.
+        """
+        return self._memory_hash
+
+    def last_chosen_coordinate(self):
+        """
+        Method that return player's last_chosen_coordinate attribute
+        (coordinate most recently removed from memory - player's last shot).
+        """
+        return self._last_chosen_coordinate
+
     def __str__(self):
         """
         Returns name of a player (as a string).
@@ -66,7 +127,13 @@ class Player:
         This action in the future prevents player from choosing the coordinate,
         that has been already chosen before.
         """
+        if not self.memory()[coordinate]:
+            y_coordinate, x_coordinate = coordinate
+            self._memory_hash ^= status_change(
+                y_coordinate * self.game_board().boards_edge()
+                + x_coordinate, 0, CHOSEN)
         self.memory()[coordinate] = 1
+        self._last_chosen_coordinate = coordinate
         updated_memory = self.memory()
         return updated_memory
 
@@ -88,10 +155,9 @@ class Player:
         by checking theirs fleet status.If each ship in a fleet is
         not afloat it means that the player lost,
         otherwise he hasn't lost yet.
+        Game board counts ships that are afloat, so no ship is checked.
         """
-        afloat_ships = [each_ship.is_it_afloat(self.game_board())
-                        for each_ship in self.game_board().fleet()]
-        if not any(afloat_ships):
+        if self.game_board().ships_afloat() == 0:
             return True
         else:
             return False
@@ -99,7 +165,7 @@ class Player:
     def find_ship_tuples(self, starting_point: tuple, size: int,
                          forward: bool, axis: bool):
         """
-        Helper method of ship_hull_placement_helper function.
+        Helper method of ship_hull_placement function.
         Creates list of coordinates (of tuples) that define
         the area that is occupied by ship in the board.
         """
@@ -120,80 +186,82 @@ class Player:
                     (y_coordinate - pos, x_coordinate) for pos in range(size)]
         return tuples_of_ship_position
 
-    def ship_hull_placement_helper(self, coordinate: int,  subarray: np,
-                                   directions: dict, ships_bow: tuple,
-                                   ship_size: int):
-        """
-        Helper method of ship_hull_placement function.
-        Checks possible direction in which the bow can be placed
-        By creating each potential subarray where the ship would
-        be placed and then checks whether the subarray exceeds
-        game boards' edges and if they are big enough for
-        the given ship.
-        """
-        first_subarray = subarray[:coordinate + 1]
-        maybe_direction = list(directions)[0]
-        board_axis = directions.get(maybe_direction)
-        if len(first_subarray) >= ship_size:
-            ship_position = subarray[coordinate + 1
-                                     - ship_size: coordinate + 1]
-            for position in ship_position:
-                if position == 1:
-                    directions.pop(maybe_direction)
-                    break
-            else:
-                forward = False
-                tuples_of_ship_position = self.find_ship_tuples(
-                    ships_bow, ship_size, forward, board_axis)
-                directions[maybe_direction] = tuples_of_ship_position
-        else:
-            directions.pop(maybe_direction)
-        second_subarray = subarray[coordinate:]
-        maybe_direction = list(directions)[-1]
-        if len(second_subarray) >= ship_size:
-            ship_position = subarray[coordinate: coordinate + ship_size]
-            for position in ship_position:
-                if position == 1:
-                    directions.pop(maybe_direction)
-                    break
-            else:
-                forward = True
-                tuples_of_ship_position = self.find_ship_tuples(
-                    ships_bow, ship_size, forward, board_axis)
-                directions[maybe_direction] = tuples_of_ship_position
-        else:
-            directions.pop(maybe_direction)
-        return directions
-
     def ship_hull_placement(self, ships_bow: tuple, ships_size: int):
         """
         Function that thanks to the provided ship's bow coordinates determines
         in which directions the rest of the ship (hull) can be allocated.
+        Only fields of the four candidate placements are checked,
+        so it costs the same on boards of any size.
 
         Returns possible directions.
         """
-        board = self.game_board()
+        # direction: (forward, horizontal)
+        candidates = {
+            "left": (False, True),
+            "right": (True, True),
+            "up": (False, False),
+            "down": (True, False)
+        }
         possible_positions = {}
-        y_coordinate, x_coordinate = ships_bow
-        hor_subarray = board.ocean_grid()[y_coordinate, :]
-        hor_directions = {"left": True, "right": True}
-        ver_subarray = board.ocean_grid()[:, x_coordinate]
-        ver_directions = {"up": False, "down": False}
-        # check possible horizontal positions
-        hor_positions = self.ship_hull_placement_helper(
-            x_coordinate, hor_subarray, hor_directions, ships_bow, ships_size)
-        # check possible vertical positions
-        ver_positions = self.ship_hull_placement_helper(
-            y_coordinate, ver_subarray, ver_directions, ships_bow, ships_size)
-        possible_positions = {**hor_positions, **ver_positions}
+        for direction, (forward, axis) in candidates.items():
+            coordinates = self.find_ship_tuples(
+                ships_bow, ships_size, forward, axis)
+            if self.placement_fits(coordinates):
+                possible_positions[direction] = coordinates
         return possible_positions
 
+    def placement_fits(self, coordinates: List[tuple]):
+        """
+        Method that checks whether all the coordinates (fields of one
+        placement, in a line) are on player's board and none of them
+        is occupied by a ship.
+        """
+        board = self.game_board()
+        last_index = board.boards_edge() - 1
+        for y_coordinate, x_coordinate in (coordinates[0], coordinates[-1]):
+            if not (0 <= y_coordinate <= last_index
+                    and 0 <= x_coordinate <= last_index):
+                return False
+        for coordinate in coordinates:
+            if board.field_status(coordinate) in (1, 2):
+                return False
+        return True
+
+    def random_ship_placement(self, ships_size: int, rng: Random):
+        """
+        Method that chooses ship's placement uniformly from all placements
+        that are legal on player's board at the moment. It needs no
+        retries, so it costs the same however crowded the board is.
+        On boards too big for placement tables placements are drawn
+        from all placements until a legal one is found (which is
+        uniform as well), at most PLACEMENT_TRIES times.
+        Returns list of coordinates (None if the ship can't be placed).
+        """
+        board = self.game_board()
+        boards_edge = board.boards_edge()
+        if boards_edge * boards_edge > PLACEMENT_TABLE_MAX_FIELDS:
+            count = placements_count(boards_edge, ships_size)
+            for _ in range(PLACEMENT_TRIES if count else 0):
+                coordinates = placement_coordinates(
+                    boards_edge, ships_size, rng.randrange(count))
+                if self.placement_fits(coordinates):
+                    return coordinates
+            return
+        table = placement_table(boards_edge, ships_size)
+        legal_placements = np.flatnonzero(
+            table.legal(board.occupied_fields()))
+        if len(legal_placements) == 0:
+            return
+        chosen = rng.randrange(len(legal_placements))
+        return table.coordinates(legal_placements[chosen])
+
 
 class HumanPlayer(Player):
     """
     Class HumanPlayer. Subclass of Player.
     Contains all the attributes inherited from Player.
     """
+    __slots__ = ()
 
     def ship_bow_placement(self, coordinates: tuple):
         """
@@ -204,7 +272,7 @@ class HumanPlayer(Player):
         y_coordinate, x_coordinate = coordinates
         end_loop = 1
         while end_loop:
-            if board.ocean_grid()[y_coordinate, x_coordinate] != 0:
+            if board.field_status((y_coordinate, x_coordinate)) != 0:
                 return
             else:
                 return coordinates
@@ -214,7 +282,7 @@ class HumanPlayer(Player):
         This method contains full proccess of ship placement.
         """
         players_board = self.game_board()
-        ships_size = naval_fleet.get(ship)
+        ships_size = self.fleet().get(ship)
         coordinates = input_coordinate(players_board)
         ships_bow_coordinates = self.ship_bow_placement(
             coordinates)
@@ -224,20 +292,53 @@ class HumanPlayer(Player):
             if len(possible_positions) != 0:
                 ships_final_coordinates = choose_ship_placement(
                     possible_positions)
-                new_ship = Ship(
-                    ship, naval_fleet[ship], ships_final_coordinates)
+                new_ship = Ship(ship, ships_size, ships_final_coordinates)
                 players_board.add_ship(new_ship)
                 return False
         return True
 
+    def place_ship(self, ship: str, bow: tuple, direction: str):
+        """
+        Method that places ship from the fleet with its bow at the given
+        coordinate and the rest of it facing given direction
+        ("up", "down", "left" or "right").
+        Returns True if the ship has been placed.
+        """
+        players_board = self.game_board()
+        ships_size = self.fleet().get(ship)
+        if not self.ship_bow_placement(bow):
+            return False
+        possible_positions = self.ship_hull_placement(bow, ships_size)
+        if direction not in possible_positions:
+            return False
+        new_ship = Ship(ship, ships_size, possible_positions[direction])
+        players_board.add_ship(new_ship)
+        return True
+
+    def fire_at(self, opponent: "BotPlayer", possible_hit: tuple):
+        """
+        Method that fires at the given coordinate of opponent's board.
+        Returns parameters which define game status after the attack.
+        """
+        shipwreck = None
+        loser = None
+        opponents_board = opponent.game_board()
+        self.remove_coordinate_from_memory(possible_hit)
+        damaged_ship = opponents_board.resolve_shot(possible_hit)
+        if damaged_ship:
+            is_afloat = damaged_ship.is_it_afloat(opponents_board)
+            if not is_afloat:
+                shipwreck = damaged_ship
+                is_loser = opponent.has_lost()
+                if is_loser:
+                    loser = opponent
+        return opponent, damaged_ship, shipwreck, loser
+
     def attack_opponent(self, opponent: "BotPlayer"):
         """
         Method that defines player's attack. Returns parameters
         which define game status after the players attack.
         """
-        damaged_ship = None
-        shipwreck = None
-        loser = None
         end_loop = True
         opponents_board = opponent.game_board()
         while end_loop:
@@ -245,23 +346,7 @@ class HumanPlayer(Player):
             was_chosen = self.chosen_before_coordinate(possible_hit)
             if not was_chosen:
                 end_loop = False
-        self.remove_coordinate_from_memory(possible_hit)
-        opponents_board.set_new_board_status(possible_hit)
-        for each_ship in opponents_board.fleet():
-            ship_damage = each_ship.ship_got_hit(possible_hit)
-            if ship_damage:
-                damaged_ship = each_ship
-                is_afloat = each_ship.is_it_afloat(opponents_board)
-                if not is_afloat:
-                    shipwreck = each_ship
-                    is_loser = opponent.has_lost()
-                    if is_loser:
-                        loser = opponent
-                        return opponent, damaged_ship, shipwreck, loser
-                    return opponent, damaged_ship, shipwreck, loser
-                return opponent, damaged_ship, shipwreck, loser
-        else:
-            return opponent, None, None, None
+        return self.fire_at(opponent, possible_hit)
 
     def graphic_rep(self):
         """
@@ -274,39 +359,8 @@ class HumanPlayer(Player):
         Missed shot (empty field): O
         Player's discovered by opponent ship placement field: "X".
         """
-        board = self.game_board()
-        print(f"{str(self)}'s Ocean Grid")
-        time.sleep(0.5)
-        separator()
-        size = np.shape(board.ocean_grid())[0]
-        for numbers in range(size+1):
-            if numbers == 0:
-                numbers = '  '
-                print(numbers, end=' ')
-            else:
-                print(f' {chr(numbers+64)}', end=' ')
-        separator()
-        for numbers in range(size):
-            time.sleep(0.2)
-            print(f'{(numbers+1):2}', end=" ")
-            for element in board.ocean_grid()[numbers, :-1]:
-                if element == 0:
-                    print(" .", end=" ")
-                elif element == 1:
-                    print(" #", end=" ")
-                elif element == 2:
-                    print(" X", end=" ")
-                else:
-                    print(" O", end=" ")
-            last_element = board.ocean_grid()[numbers, -1]
-            if last_element == 0:
-                print(" .")
-            elif last_element == 1:
-                print(" #")
-            elif last_element == 2:
-                print(" X")
-            else:
-                print(" O")
+        title = f"{str(self)}'s Ocean Grid"
+        get_renderer().draw(self.game_board(), title, reveal_ships=True)
 
 
 class BotPlayer(Player):
@@ -316,10 +370,20 @@ class BotPlayer(Player):
     Contains its own attributes:
     :param hits_memory: Bot Player memory of hits.
     :param type: List of tuples (coordinates of ships that have been hit.)
+
+    :param rng: Bot Player's own random number generator.
+    :param type: instance of random.Random (By default a fresh one)
+    (Seeding it makes every Bot Player's decision reproducible.)
+
+    Bot Player also keeps a pool of coordinates that haven't been chosen
+    yet, so a random new coordinate is drawn without retries.
     """
+    __slots__ = ("_hits_memory", "_rng", "_untried")
+
     def __init__(self, name: str, game_board: GameBoard,
-                 hits_memory: List[tuple] = None):
-        super().__init__(name, game_board)
+                 hits_memory: List[tuple] = None, rng: Random = None,
+                 fleet: dict = None):
+        super().__init__(name, game_board, fleet)
         """
         Creates an instance of Bot Player.
         name by default is set to an Opponent.
@@ -328,8 +392,14 @@ class BotPlayer(Player):
         self._name = "Opponent"
         if not hits_memory:
             self._hits_memory = []
+        else:
+            self._hits_memory = hits_memory
+        if not rng:
+            self._rng = Random()
+        else:
+            self._rng = rng
         board_dimension = game_board.boards_edge()
-        self._memory = np.zeros((board_dimension, board_dimension), dtype=int)
+        self._untried = CellPool(board_dimension * board_dimension)
 
     def hits_memory(self):
         """
@@ -337,6 +407,31 @@ class BotPlayer(Player):
         """
         return self._hits_memory
 
+    def rng(self):
+        """
+        Method that return player's rng attribute.
+        """
+        return self._rng
+
+    def remove_coordinate_from_memory(self, coordinate):
+        """
+        Method that removes given coordinate from player's memory
+        and from the pool of coordinates that haven't been chosen yet.
+        """
+        y_coordinate, x_coordinate = coordinate
+        self._untried.remove(
+            y_coordinate * self.game_board().boards_edge() + x_coordinate)
+        return super().remove_coordinate_from_memory(coordinate)
+
+    def random_untried_coordinate(self):
+        """
+        Method that chooses randomly one of the coordinates
+        that haven't been chosen before. It takes constant time
+        however many coordinates have been chosen already.
+        """
+        cell = self._untried.draw(self.rng())
+        return divmod(cell, self.game_board().boards_edge())
+
     def add_to_hit_memory(self, new_hit):
         """
         Method that adds new hit to a hits_memory.
@@ -374,7 +469,8 @@ class BotPlayer(Player):
             (y_coordinate-1, x_coordinate),
             (y_coordinate+1, x_coordinate)
         ]
-        new_y_coordinate, new_x_coordinate = choice(possible_new_hit)
+        new_y_coordinate, new_x_coordinate = \
+            self.rng().choice(possible_new_hit)
         return new_y_coordinate, new_x_coordinate
 
     def ineligible_coordinate(self, player: HumanPlayer,
@@ -385,8 +481,8 @@ class BotPlayer(Player):
         as 2 or 3 it means that the coordinate has been chosen before.
         """
         players_board = player.game_board()
-        if players_board.ocean_grid()[y_coordinate][x_coordinate] == 2 \
-           or players_board.ocean_grid()[y_coordinate][x_coordinate] == 3:
+        field_status = players_board.field_status((y_coordinate, x_coordinate))
+        if field_status == 2 or field_status == 3:
             return True
         return False
 
@@ -432,11 +528,27 @@ class BotPlayer(Player):
                                                   y_coordinate, x_coordinate):
                 not_eligible += 1
         if not_eligible != 2:
-            new_hit = choice(possible_hits)
+            new_hit = self.rng().choice(possible_hits)
             return new_hit
         else:
             return False
 
+    def hit_memory_candidate(self, player):
+        """
+        Method that makes one attempt of choosing new hit based on
+        hits memory (see based_on_hit_memory). The coordinate may be
+        outside the board or chosen before.
+        """
+        if len(self.hits_memory()) > 1:
+            new_hit = self.choose_along_the_axis(player)
+            if not new_hit:
+                successful_hit = self.rng().choice(self.hits_memory())
+                new_hit = self.choose_near_successful_hit(successful_hit)
+        else:
+            successful_hit = self.hits_memory()[0]
+            new_hit = self.choose_near_successful_hit(successful_hit)
+        return new_hit
+
     def based_on_hit_memory(self, player):
         """
         Function that determines the way the Bot Player is going to choose
@@ -448,62 +560,153 @@ class BotPlayer(Player):
         """
         end_loop = True
         while end_loop:
-            if len(self.hits_memory()) > 1:
-                new_hit = self.choose_along_the_axis(player)
-                if not new_hit:
-                    successful_hit = choice(self.hits_memory())
-                    new_hit = self.choose_near_successful_hit(successful_hit)
-            else:
-                successful_hit = self.hits_memory()[0]
-                new_hit = self.choose_near_successful_hit(successful_hit)
-            new_y_coordinate, new_x_coordinate = new_hit
+            new_y_coordinate, new_x_coordinate = \
+                self.hit_memory_candidate(player)
             board = self.game_board()
             if not board.outside_board(new_y_coordinate, new_x_coordinate):
                 end_loop = False
                 new_hit = new_y_coordinate, new_x_coordinate
+            elif instrumentation.ENABLED:
+                instrumentation.count("BotPlayer.based_on_hit_memory.retries")
         return new_hit
 
-    def attack_player(self, player: HumanPlayer):
+    def choose_new_hit(self, player: HumanPlayer):
         """
-        Method that defines logic behind Bot Player's new move in game.
-        Firstly it checks whether the hits memory is empty, chooses new hit
-        (after coordinates validation (if they are inside game board etc.))
-        and then updates Bot Players status (memories) and game status.
-
+        Method that chooses coordinate of Bot Player's next shot.
+        Firstly it checks whether the hits memory is empty and then
+        chooses new hit (after coordinates validation (if they are
+        inside game board etc.)) that hasn't been chosen before.
         """
-        opponent = player
-        damaged_ship = None
-        shipwreck = None
-        loser = None
         end_loop = True
         while end_loop:
             if len(self.hits_memory()) != 0:
                 possible_hit = self.based_on_hit_memory(player)
             else:
-                possible_hit = self.get_random_coordinate()
+                possible_hit = self.random_untried_coordinate()
             was_chosen = self.chosen_before_coordinate(possible_hit)
             if not was_chosen:
                 end_loop = False
+            elif instrumentation.ENABLED:
+                instrumentation.count("BotPlayer.choose_new_hit.retries")
+        return possible_hit
+
+    def refine_shots(self, player: HumanPlayer, deadline: float):
+        """
+        Method (a generator) that yields better and better shots
+        for choose_shot, each of them a coordinate that hasn't been
+        chosen before. It yields None after steps that haven't found
+        a better shot, so that choose_shot can check the time between
+        them. Refinements may use the deadline (a moment of
+        time.perf_counter()) to limit their own work.
+        Bot Player hunts with a random coordinate (choose_shot's
+        fallback), so only shots near hits are refined - one candidate
+        per step: an end of the axis of the hits, then each of the four
+        neighbours of each hit. The refinement ends when all of them
+        have been tried.
+        """
+        if not self.hits_memory():
+            return
+        board = self.game_board()
+        candidates = []
+        if len(self.hits_memory()) > 1:
+            along_the_axis = self.choose_along_the_axis(player)
+            if along_the_axis:
+                candidates.append(tuple(along_the_axis))
+        hits = list(self.hits_memory())
+        self.rng().shuffle(hits)
+        for y_coordinate, x_coordinate in hits:
+            neighbours = [(y_coordinate, x_coordinate-1),
+                          (y_coordinate, x_coordinate+1),
+                          (y_coordinate-1, x_coordinate),
+                          (y_coordinate+1, x_coordinate)]
+            self.rng().shuffle(neighbours)
+            candidates += neighbours
+        for new_hit in candidates:
+            if not board.outside_board(*new_hit) \
+                    and not self.chosen_before_coordinate(new_hit):
+                yield new_hit
+                return
+            if instrumentation.ENABLED:
+                instrumentation.count("BotPlayer.refine_shots.retries")
+            yield None
+
+    def choose_shot(self, player: HumanPlayer, deadline: float):
+        """
+        Method that chooses coordinate of the next shot before
+        the deadline (a moment of time.perf_counter()). It starts with
+        a cheap legal shot - a random coordinate that hasn't been
+        chosen before - and takes the shots found by refine_shots until
+        there are no more of them or the time is up.
+        A step of refine_shots isn't started if it wouldn't end before
+        the deadline (judging by the previous step's time), so the move
+        returns after the deadline only if a step takes longer than
+        expected - then it is counted as a deadline miss.
+        Counted events: moves, depth (the number of refinements taken),
+        cutoffs (refinement stopped by the deadline) and deadline misses.
+        """
+        best_shot = self.random_untried_coordinate()
+        depth = 0
+        cut_off = False
+        step_time = 0.0
+        refinements = self.refine_shots(player, deadline)
+        while True:
+            start = time.perf_counter()
+            if start + step_time >= deadline:
+                cut_off = True
+                break
+            shot = next(refinements, StopIteration)
+            if shot is StopIteration:
+                break
+            step_time = time.perf_counter() - start
+            if shot is not None:
+                best_shot = shot
+                depth += 1
+        refinements.close()
+        if instrumentation.ENABLED:
+            instrumentation.count("BotPlayer.choose_shot.moves")
+            instrumentation.count("BotPlayer.choose_shot.depth", depth)
+            if cut_off:
+                instrumentation.count("BotPlayer.choose_shot.cutoffs")
+            if time.perf_counter() > deadline:
+                instrumentation.count(
+                    "BotPlayer.choose_shot.deadline_misses")
+        return best_shot
+
+    def fire_at(self, player: HumanPlayer, possible_hit: tuple):
+        """
+        Method that fires at the given coordinate and then updates
+        Bot Players status (memories) and game status.
+        """
+        opponent = player
+        shipwreck = None
+        loser = None
         self.remove_coordinate_from_memory(possible_hit)
         players_board = player.game_board()
-        players_board.set_new_board_status(possible_hit)
-        for each_ship in players_board.fleet():
-            ship_damage = each_ship.ship_got_hit(possible_hit)
-            if ship_damage:
-                damaged_ship = each_ship
-                self.add_to_hit_memory(possible_hit)
-                is_afloat = each_ship.is_it_afloat(players_board)
-                if not is_afloat:
-                    shipwreck = each_ship
-                    self.remove_from_hits_memory(each_ship)
-                    is_loser = player.has_lost()
-                    if is_loser:
-                        loser = player
-                        return opponent, damaged_ship, shipwreck, loser
-                    return opponent, damaged_ship, shipwreck, loser
-                return opponent, damaged_ship, shipwreck, loser
+        damaged_ship = players_board.resolve_shot(possible_hit)
+        if damaged_ship:
+            self.add_to_hit_memory(possible_hit)
+            is_afloat = damaged_ship.is_it_afloat(players_board)
+            if not is_afloat:
+                shipwreck = damaged_ship
+                self.remove_from_hits_memory(damaged_ship)
+                is_loser = player.has_lost()
+                if is_loser:
+                    loser = player
+        return opponent, damaged_ship, shipwreck, loser
+
+    def attack_player(self, player: HumanPlayer, time_budget: float = None):
+        """
+        Method that defines logic behind Bot Player's new move in game.
+        It chooses new hit and fires at it. With time_budget (in seconds)
+        the hit is chosen by choose_shot, so the move takes about
+        that long at most.
+        """
+        if time_budget is None:
+            possible_hit = self.choose_new_hit(player)
         else:
-            return opponent, None, None, None
+            possible_hit = self.choose_shot(
+                player, time.perf_counter() + time_budget)
+        return self.fire_at(player, possible_hit)
 
     def graphic_rep(self):
         """
@@ -516,43 +719,17 @@ class BotPlayer(Player):
         Missed shot (empty field): O
         Opponents's discovered ship placement field: "X".
         """
-        board = self.game_board()
-        print(f"{str(self)}'s Ocean Grid")
-        time.sleep(0.5)
-        separator()
-        size = np.shape(board.ocean_grid())[0]
-        for numbers in range(size+1):
-            if numbers == 0:
-                numbers = '  '
-                print(numbers, end=' ')
-            else:
-                print(f' {chr(numbers+64)}', end=' ')
-        separator()
-        for numbers in range(size):
-            time.sleep(0.2)
-            print(f'{(numbers+1):2}', end=" ")
-            for element in board.ocean_grid()[numbers, :-1]:
-                if element == 2:
-                    print(" X", end=" ")
-                elif element == 3:
-                    print(" O", end=" ")
-                else:
-                    print(" .", end=" ")
-            last_element = board.ocean_grid()[numbers, -1]
-            if last_element == 2:
-                print(" X")
-            elif last_element == 3:
-                print(" O")
-            else:
-                print(" .")
+        title = f"{str(self)}'s Ocean Grid"
+        get_renderer().draw(self.game_board(), title, reveal_ships=False)
 
     def get_random_coordinate(self):
         """
         Method that chooses a new coordinate in a fully random manner.
         """
         opponent_board = self.game_board()
-        selected_row = randint(0, opponent_board.boards_edge()-1)
-        selected_column = randint(0, opponent_board.boards_edge()-1)
+        last_index = opponent_board.boards_edge() - 1
+        selected_row = self.rng().randint(0, last_index)
+        selected_column = self.rng().randint(0, last_index)
         coordinates = selected_row, selected_column
         return coordinates
 
@@ -565,7 +742,7 @@ class BotPlayer(Player):
         y_coordinate, x_coordinate = coordinates
         end_loop = 1
         while end_loop:
-            if board.ocean_grid()[y_coordinate, x_coordinate] != 0:
+            if board.field_status((y_coordinate, x_coordinate)) != 0:
                 return
             else:
                 return coordinates
@@ -575,19 +752,82 @@ class BotPlayer(Player):
         Method that randomly chooses direction
         in which the rest of the bow should face.
         """
-        chosen_direction = choice(list(possible_positions))
+        chosen_direction = self.rng().choice(list(possible_positions))
         ship_final_placement = possible_positions.get(chosen_direction)
         return ship_final_placement
 
-    def opponent_arranges_ships_on_board(self):
+    def opponent_random_ship_placement(self, ships_size: int):
+        """
+        Method that chooses ship's placement uniformly from all placements
+        that are legal on the board at the moment
+        (see Player.random_ship_placement).
+        Returns list of coordinates (None if the ship can't be placed).
+        """
+        return self.random_ship_placement(ships_size, self.rng())
+
+    def default_placement(self):
+        """
+        Method that returns placement used by
+        opponent_arranges_ships_on_board when none is given: "solver",
+        which places the fleet or proves there is no layout in bounded
+        time, unless the board is too big for it and the fleet fits
+        loosely - then "random", which finds room at once.
+        """
+        boards_edge = self.game_board().boards_edge()
+        fields = boards_edge * boards_edge
+        if fields <= SOLVER_PLACEMENT_MAX_FIELDS:
+            return "solver"
+        sizes = list(self.fleet().values())
+        surroundings = sum((size + 2) * 3 for size in sizes)
+        if max(sizes, default=0) * 2 <= boards_edge \
+                and surroundings <= fields * LOOSE_FLEET_MAX_FILL:
+            return "random"
+        return "solver"
+
+    def opponent_arranges_ships_on_board(self, placement: str = None):
         """
         Method that contains a "full" proccess of arranging ships on board
         that Bot Player needs to go through in order to place ships properly.
-        """
-        for key in naval_fleet:
+        With "random" placement the bow is drawn at random until
+        the ship fits, with "uniform" placement each ship is placed
+        with opponent_random_ship_placement. "solver" placement places
+        the whole fleet at once with place_fleet, so it either finds
+        a layout (also of a big fleet on a small board) or raises
+        ValueError when there is none (PlacementTimeout when it runs
+        out of time). By default the placement is chosen
+        by default_placement.
+        """
+        fleet = self.fleet()
+        if placement is None:
+            placement = self.default_placement()
+        if placement == "solver":
+            opponents_board = self.game_board()
+            occupied = [coordinate
+                        for each_ship in opponents_board.fleet()
+                        for coordinate in each_ship.coordinates()]
+            ships = place_fleet(opponents_board.boards_edge(), fleet,
+                                occupied, self.rng())
+            if ships is None:
+                raise ValueError("Fleet can't be placed on the board")
+            for new_ship in ships:
+                opponents_board.add_ship(new_ship)
+            return
+        if placement == "uniform":
+            opponents_board = self.game_board()
+            for key in fleet:
+                ships_final_coordinates = \
+                    self.opponent_random_ship_placement(fleet[key])
+                if not ships_final_coordinates:
+                    raise ValueError(f"{key} can't be placed on the board")
+                new_ship = Ship(key, fleet[key], ships_final_coordinates)
+                opponents_board.add_ship(new_ship)
+            return
+        if placement != "random":
+            raise ValueError(f"Unknown placement: {placement}")
+        for key in fleet:
             end_loop = 1
             while end_loop:
-                ships_size = naval_fleet.get(key)
+                ships_size = fleet.get(key)
                 opponents_board = self.game_board()
                 coordinates = self.get_random_coordinate()
                 ships_bow_coordinates = self.opponent_bow_placement(
@@ -600,6 +840,6 @@ class BotPlayer(Player):
                             self.opponent_chooses_ship_placement(
                                 possible_positions)
                         new_ship = Ship(
-                            key, naval_fleet[key], ships_final_coordinates)
+                            key, ships_size, ships_final_coordinates)
                         opponents_board.add_ship(new_ship)
                         end_loop = 0
@@ -0,0 +1,246 @@
+import sys
+import numpy as np
+from coordinate_codec import column_label
+from pacing import pause
+
+"""
+This file contains terminal renderer of game boards.
+A whole board is built as one string and written at once.
+In live mode the renderer keeps each board in its own place
+on the screen and redraws only fields that have changed,
+moving the cursor with ANSI escape codes.
+Boards bigger than the viewport are drawn only through a window
+of viewport's size - the rest of the board is never read.
+"""
+
+"""
+Symbols of field's statuses (0 - empty, 1 - ship, 2 - successful hit,
+3 - missed shot) on player's own board and on opponent's board,
+where undiscovered ships are hidden.
+"""
+OWN_SYMBOLS = np.array([".", "#", "X", "O"])
+OPPONENT_SYMBOLS = np.array([".", ".", "X", "O"])
+
+"""
+Number of screen lines above the first row of fields
+(title, blank line and column labels).
+"""
+FRAME_HEADER_LINES = 3
+
+"""
+Default length of the edge of the drawn window of a board.
+"""
+VIEWPORT_EDGE = 26
+
+
+def viewport_window(boards_edge: int, viewport_edge: int,
+                    focus: tuple = None):
+    """
+    Function that returns window of the board to be drawn:
+    (top, left, height, width). The whole board if it fits
+    in the viewport, otherwise window of viewport's size centered
+    on the focus (by default in the top left corner).
+    """
+    if boards_edge <= viewport_edge:
+        return 0, 0, boards_edge, boards_edge
+    if focus is None:
+        focus = (0, 0)
+    top, left = (min(max(0, each - viewport_edge // 2),
+                     boards_edge - viewport_edge) for each in focus)
+    return top, left, viewport_edge, viewport_edge
+
+
+def board_symbols(board, reveal_ships: bool, window: tuple = None):
+    """
+    Function that returns array of symbols of board's fields
+    (only of the fields in the window (top, left, height, width)
+    if it is given).
+    """
+    if reveal_ships:
+        symbols = OWN_SYMBOLS
+    else:
+        symbols = OPPONENT_SYMBOLS
+    if window is None:
+        return symbols[board.ocean_grid()]
+    return symbols[board.ocean_window(*window)]
+
+
+def label_widths(symbols: np.ndarray, top: int = 0, left: int = 0):
+    """
+    Function that returns widths of column labels and row labels
+    of the frame.
+    """
+    rows, columns = symbols.shape
+    return (len(column_label(left + max(columns, 1) - 1)),
+            max(2, len(str(top + rows))))
+
+
+def render_frame(title: str, symbols: np.ndarray, top: int = 0,
+                 left: int = 0):
+    """
+    Function that builds whole board's frame as one string:
+    title, blank line, column labels (letters) and rows of fields
+    labeled with numbers. Symbols may be a window of the board
+    starting at the row top and the column left.
+    """
+    label_width, row_width = label_widths(symbols, top, left)
+    lines = [title, ""]
+    labels = "".join(f" {column_label(left + number):>{label_width}} "
+                     for number in range(symbols.shape[1]))
+    lines.append(" " * (row_width + 1) + labels)
+    for number, row in enumerate(symbols):
+        fields = " ".join(f" {symbol:>{label_width}}" for symbol in row)
+        lines.append(f"{top + number + 1:{row_width}} {fields}")
+    return "\n".join(lines) + "\n"
+
+
+def field_screen_position(frame_top: int, y_coordinate: int,
+                          x_coordinate: int, label_width: int = 1,
+                          row_width: int = 2):
+    """
+    Function that returns screen's line and column (counted from 1)
+    of the field's symbol in a frame starting at line frame_top
+    (coordinate within the drawn window).
+    """
+    return (frame_top + FRAME_HEADER_LINES + y_coordinate,
+            row_width + 2 + (label_width + 2) * x_coordinate + label_width)
+
+
+class BoardRenderer:
+    """
+    Class BoardRenderer. Draws game boards on a terminal.
+    Contains attributes:
+    :param stream: stream the frames are written to
+    :type stream: text stream (By default sys.stdout)
+
+    :param live: whether boards stay in place and only changed fields
+    are redrawn (By default False - every frame is written in full
+    below the previous output)
+    :type live: bool
+
+    :param frame_pause: pause after drawing a frame (in seconds)
+    :type frame_pause: float
+
+    :param viewport_edge: length of the edge of the drawn window
+    of bigger boards
+    :type viewport_edge: int
+
+    The renderer remembers window of each board (by title), which
+    moves only when a focus is given.
+    """
+    def __init__(self, stream=None, live: bool = False,
+                 frame_pause: float = 0.5,
+                 viewport_edge: int = VIEWPORT_EDGE):
+        """
+        Creates instance of a board renderer.
+        """
+        self._stream = stream
+        self._live = live
+        self._frame_pause = frame_pause
+        self._viewport_edge = viewport_edge
+        self._frames = {}
+        self._windows = {}
+        self._next_frame_top = 1
+
+    def stream(self):
+        """
+        Method that return renderer's stream attribute.
+        """
+        if self._stream is None:
+            return sys.stdout
+        return self._stream
+
+    def live(self):
+        """
+        Method that return renderer's live attribute.
+        """
+        return self._live
+
+    def viewport_edge(self):
+        """
+        Method that return renderer's viewport_edge attribute.
+        """
+        return self._viewport_edge
+
+    def _live_update(self, board_title: str, title: str,
+                     symbols: np.ndarray, window: tuple):
+        """
+        Helper method of draw. Returns escape codes and symbols which
+        update the board's frame on the screen (the whole frame if it is
+        new or its window has moved).
+        """
+        top, left, _, _ = window
+        if board_title not in self._frames:
+            frame_top = self._next_frame_top
+            self._next_frame_top += FRAME_HEADER_LINES + len(symbols) + 1
+            previous_window = None
+        else:
+            frame_top, previous_window, previous_symbols = \
+                self._frames[board_title]
+        if previous_window != window:
+            frame_lines = render_frame(title, symbols, top,
+                                       left).splitlines()
+            update = "".join(
+                f"\x1b[{frame_top + number};1H\x1b[2K{line}"
+                for number, line in enumerate(frame_lines))
+            if frame_top == 1 and previous_window is None:
+                update = "\x1b[2J" + update
+        else:
+            label_width, row_width = label_widths(symbols, top, left)
+            changed = np.argwhere(previous_symbols != symbols)
+            update = ""
+            for y_coordinate, x_coordinate in changed:
+                line, column = field_screen_position(
+                    frame_top, y_coordinate, x_coordinate, label_width,
+                    row_width)
+                symbol = symbols[y_coordinate, x_coordinate]
+                update += f"\x1b[{line};{column}H{symbol}"
+        self._frames[board_title] = (frame_top, window, symbols.copy())
+        return update + f"\x1b[{self._next_frame_top};1H"
+
+    def draw(self, board, title: str, reveal_ships: bool,
+             focus: tuple = None):
+        """
+        Method that draws the board with one write to the stream.
+        Only the window of the board is drawn, moved to the focus
+        (a coordinate) if it is given.
+        """
+        boards_edge = board.boards_edge()
+        if focus is not None or title not in self._windows:
+            self._windows[title] = viewport_window(
+                boards_edge, self._viewport_edge, focus)
+        window = self._windows[title]
+        top, left, height, width = window
+        symbols = board_symbols(board, reveal_ships, window)
+        frame_title = title
+        if height < boards_edge:
+            last_column = column_label(left + width - 1)
+            frame_title = (f"{title} (rows {top + 1}-{top + height}, "
+                           f"columns {column_label(left)}-{last_column})")
+        if self.live():
+            output = self._live_update(title, frame_title, symbols, window)
+        else:
+            output = render_frame(frame_title, symbols, top, left)
+        self.stream().write(output)
+        self.stream().flush()
+        pause(self._frame_pause)
+
+
+_renderer = BoardRenderer()
+
+
+def get_renderer():
+    """
+    Function that returns renderer used by the game.
+    """
+    return _renderer
+
+
+def set_renderer(new_renderer: BoardRenderer):
+    """
+    Function that sets renderer used by the game. Returns previous one.
+    """
+    global _renderer
+    previous_renderer = _renderer
+    _renderer = new_renderer
+    return previous_renderer
@@ -1,3 +1,4 @@
+from array import array
 from typing import List
 
 """
@@ -25,10 +26,17 @@ class Ship:
 
     :param coordinates: Ship's coordinates. By default == None
     :type coordinates: List of tuples
+    (They are kept packed in an array of ints: y and x of each field
+    one after another.)
 
     :param afloat: Condition - shows whether ship is afloat.
     :type afloat: Boolean expression. By default == True.
+
+    Ship also counts its hit points - the number of its fields
+    that haven't been hit yet.
     """
+    __slots__ = ("_name", "_size", "_coordinates", "_afloat", "_hit_points")
+
     def __init__(self, name: str, size: int,
                  coordinates: List[tuple] = None, afloat: bool = True):
         """
@@ -36,11 +44,13 @@ class Ship:
         """
         self._name = name
         self._size = size
-        if not coordinates:
-            self._coordinates = []
-        else:
-            self._coordinates = coordinates
+        self._coordinates = array("i")
+        if coordinates:
+            for y_coordinate, x_coordinate in coordinates:
+                self._coordinates.append(y_coordinate)
+                self._coordinates.append(x_coordinate)
         self._afloat = afloat
+        self._hit_points = len(self._coordinates) // 2
 
     def name(self):
         """
@@ -56,9 +66,28 @@ class Ship:
 
     def coordinates(self):
         """
-        Method that return ship's coordinates attribute.
+        Method that return ship's coordinates attribute
+        (list of tuples unpacked from the array).
+        """
+        packed = self._coordinates
+        return list(zip(packed[::2], packed[1::2]))
+
+    def hit_points(self):
+        """
+        Method that return ship's hit_points attribute.
+        """
+        return self._hit_points
+
+    def register_hit(self):
+        """
+        Method that takes one hit point from the ship. It is called by
+        the game board when one of ship's fields gets hit for the first
+        time. When there are no hit points left the ship is not afloat.
         """
-        return self._coordinates
+        self._hit_points -= 1
+        if self._hit_points == 0:
+            self._afloat = False
+        return self._hit_points
 
     def ship_got_hit(self, hit: tuple):
         """
@@ -68,16 +97,14 @@ class Ship:
         if hit in self.coordinates():
             return True
 
-    def is_it_afloat(self, board):
+    def is_it_afloat(self, board=None):
         """
         Method that determines whether the ship is afloat or not by
-        checking status (what number it has) of each field that ship occupies.
+        checking whether it has any hit points left. Hit points are
+        updated by the board, so the board argument is not needed
+        (it is kept for compatibility).
         """
-        not_afloat = 0
-        for each_coordinate in self.coordinates():
-            if board.ocean_grid()[each_coordinate] == 2:
-                not_afloat += 1
-        if not_afloat != len(self.coordinates()):
+        if self.hit_points() > 0:
             return True
         else:
             return False
@@ -0,0 +1,135 @@
+from typing import List, Tuple
+from random import Random
+from game_board import GameBoard
+from game_record import GameRecordWriter, shot_outcome
+from players import BotPlayer, Player
+
+"""
+This file contains headless game engine. It plays full games between
+two players (bots or any scripted players) without printing anything
+or waiting for user's input.
+"""
+
+
+class GameResult:
+    """
+    Class GameResult. Compact record of a finished game.
+    Contains attributes:
+    :param winner: index of the winner (0 - first player, 1 - second player)
+    :type winner: int
+
+    :param shots: number of shots fired in the game by both players
+    :type shots: int
+
+    :param sink_turns: for each player's fleet the turn in which
+    each ship has sunk (None if the ship is still afloat)
+    :type sink_turns: Tuple of two tuples
+    """
+    def __init__(self, winner: int, shots: int,
+                 sink_turns: Tuple[tuple, tuple]):
+        """
+        Creates instance of a game result.
+        """
+        self._winner = winner
+        self._shots = shots
+        self._sink_turns = sink_turns
+
+    def winner(self):
+        """
+        Method that return result's winner attribute.
+        """
+        return self._winner
+
+    def shots(self):
+        """
+        Method that return result's shots attribute.
+        """
+        return self._shots
+
+    def sink_turns(self):
+        """
+        Method that return result's sink_turns attribute.
+        """
+        return self._sink_turns
+
+    def turns(self):
+        """
+        Method that returns number of turns the game lasted.
+        """
+        return (self.shots() + 1) // 2
+
+    def __eq__(self, other):
+        return isinstance(other, GameResult) and \
+            (self.winner(), self.shots(), self.sink_turns()) == \
+            (other.winner(), other.shots(), other.sink_turns())
+
+    def __repr__(self):
+        return (f"GameResult(winner={self.winner()}, shots={self.shots()}, "
+                f"sink_turns={self.sink_turns()})")
+
+
+def play_game(first_player: Player, second_player: Player,
+              recorder: GameRecordWriter = None):
+    """
+    Function that plays a full game between two players with arranged
+    fleets. Each player has to provide attack_player(opponent) method
+    returning the same status as BotPlayer.attack_player does.
+    First player always starts. Returns GameResult.
+    When recorder is given, the game is recorded shot by shot
+    (board number 0 belongs to the first player).
+    """
+    players = (first_player, second_player)
+    fleets = [player.game_board().fleet() for player in players]
+    sink_turns: List[list] = [[None] * len(fleet) for fleet in fleets]
+    if recorder:
+        recorder.begin_game([player.game_board() for player in players])
+    shots = 0
+    turn = 0
+    attacker = 0
+    while True:
+        if attacker == 0:
+            turn += 1
+        defender = 1 - attacker
+        _, damaged_ship, shipwreck, loser = \
+            players[attacker].attack_player(players[defender])
+        shots += 1
+        if recorder:
+            recorder.record_shot(
+                defender, players[attacker].last_chosen_coordinate(),
+                shot_outcome(damaged_ship, shipwreck))
+        if shipwreck:
+            ship_position = fleets[defender].index(shipwreck)
+            sink_turns[defender][ship_position] = turn
+            if loser:
+                if recorder:
+                    recorder.end_game()
+                return GameResult(attacker, shots,
+                                  tuple(tuple(each) for each in sink_turns))
+        attacker = defender
+
+
+def new_bot_player(boards_edge: int, rng: Random = None,
+                   board_class=GameBoard, fleet: dict = None,
+                   placement: str = None):
+    """
+    Function that creates Bot Player with its own game board
+    (of given class) and fleet (by default naval_fleet) arranged
+    with given placement (see opponent_arranges_ships_on_board).
+    All Bot Player's random draws come from rng.
+    """
+    bot = BotPlayer("Opponent", board_class(boards_edge), rng=rng,
+                    fleet=fleet)
+    bot.opponent_arranges_ships_on_board(placement)
+    return bot
+
+
+def simulate_bot_game(boards_edge: int = 10, seed: int = None):
+    """
+    Function that plays one headless game between two Bot Players
+    on boards of given size. Returns GameResult.
+    Games played with the same seed are identical.
+    """
+    rng = Random(seed)
+    first_bot = new_bot_player(boards_edge, rng)
+    second_bot = new_bot_player(boards_edge, rng)
+    return play_game(first_bot, second_bot)
@@ -0,0 +1,215 @@
+from typing import List
+import numpy as np
+from game_board import GameBoard
+from ship import Ship
+
+"""
+This file contains sparse game board and sparse player's memory.
+They keep only ships' fields and fields that have been shot at
+(in a dictionary and sets), so their size depends on the fleet
+and the number of shots, not on the board's area. They are meant
+for huge, mostly empty oceans (e.g. 100000 * 100000 fields).
+"""
+
+
+class SparseMemory:
+    """
+    Class SparseMemory. Player's memory of chosen coordinates kept as
+    a set. It can be indexed with a coordinate just like the Numpy array
+    memory (1 - chosen before, 0 - not chosen).
+    Contains attributes:
+    :param boards_edge: length of Game Board's edge.
+    :type boards_edge: int
+
+    :param chosen: chosen before coordinates
+    :type chosen: set of tuples
+    """
+    __slots__ = ("_boards_edge", "_chosen")
+
+    def __init__(self, boards_edge: int, chosen: set = None):
+        """
+        Creates instance of a sparse memory.
+        """
+        self._boards_edge = boards_edge
+        if not chosen:
+            self._chosen = set()
+        else:
+            self._chosen = chosen
+
+    def boards_edge(self):
+        """
+        Method that return memory's boards_edge attribute.
+        """
+        return self._boards_edge
+
+    def chosen(self):
+        """
+        Method that return memory's chosen attribute.
+        """
+        return self._chosen
+
+    def __len__(self):
+        return len(self._chosen)
+
+    def __getitem__(self, coordinate: tuple):
+        return int(tuple(coordinate) in self._chosen)
+
+    def __setitem__(self, coordinate: tuple, value: int):
+        if value:
+            self._chosen.add(tuple(coordinate))
+        else:
+            self._chosen.discard(tuple(coordinate))
+
+
+class SparseGameBoard(GameBoard):
+    """
+    Class SparseGameBoard. Subclass of GameBoard that keeps only
+    the index of ships' fields (a dictionary from coordinate to ship)
+    and the sets of hits and misses. It is a drop-in replacement
+    of GameBoard with the same rules - ocean_grid() and ocean_window()
+    return Numpy arrays built from them, which are snapshots,
+    so the board has to be changed only through its methods
+    (add_ship, set_new_board_status, resolve_shot).
+    ocean_grid() and occupied_fields() cover the whole board,
+    so on huge boards only windows should be read.
+    Players using this board get SparseMemory as their memory.
+    """
+    __slots__ = ("_ship_index", "_hits", "_misses")
+
+    def __init__(self, boards_edge: int, fleet: List["Ship"] = None):
+        """
+        Creates instance of a sparse game board.
+        """
+        self._boards_edge = boards_edge
+        self._ship_index = {}
+        self._hits = set()
+        self._misses = set()
+        self._ships_afloat = 0
+        self._zobrist_hash = 0
+        if not fleet:
+            self._fleet = []
+        else:
+            self._fleet = fleet
+        for ship_number, each_ship in enumerate(self._fleet, 1):
+            self._place_ship(each_ship, ship_number)
+
+    def hits(self):
+        """
+        Method that return game board's hits attribute.
+        """
+        return self._hits
+
+    def misses(self):
+        """
+        Method that return game board's misses attribute.
+        """
+        return self._misses
+
+    def ocean_window(self, top: int, left: int, height: int, width: int):
+        """
+        Method that returns ocean grid of the window of the board
+        (0 - empty, 1 - ship, 2 - successful hit, 3 - missed shot)
+        built from the fields kept by the board.
+        """
+        window = np.zeros((height, width), dtype=np.uint8)
+        layers = ((self._ship_index, 1), (self._hits, 2), (self._misses, 3))
+        for coordinates, status in layers:
+            for y_coordinate, x_coordinate in coordinates:
+                if top <= y_coordinate < top + height and \
+                        left <= x_coordinate < left + width:
+                    window[y_coordinate - top, x_coordinate - left] = status
+        return window
+
+    def ocean_grid(self):
+        """
+        Method that returns ocean grid of the whole board.
+        """
+        edge = self.boards_edge()
+        return self.ocean_window(0, 0, edge, edge)
+
+    def new_memory(self):
+        """
+        Method that creates an empty sparse player's memory.
+        """
+        return SparseMemory(self.boards_edge())
+
+    def field_status(self, coordinate: tuple):
+        """
+        Method that returns status of a single field:
+        0 - empty, 1 - ship, 2 - successful hit, 3 - missed shot.
+        """
+        coordinate = tuple(coordinate)
+        if coordinate in self._hits:
+            return 2
+        if coordinate in self._misses:
+            return 3
+        if coordinate in self._ship_index:
+            return 1
+        return 0
+
+    def occupied_fields(self):
+        """
+        Method that returns flat boolean array (field number
+        y * boards_edge + x) of fields occupied by ships.
+        """
+        edge = self.boards_edge()
+        occupied = np.zeros(edge * edge, dtype=bool)
+        for y_coordinate, x_coordinate in self._ship_index:
+            occupied[y_coordinate * edge + x_coordinate] = True
+        return occupied
+
+    def ship_at(self, coordinate: tuple):
+        """
+        Method that returns ship placed at the given coordinate
+        (None if the field is empty).
+        """
+        return self._ship_index.get(tuple(coordinate))
+
+    def _place_ship(self, new_ship: "Ship", ship_number: int):
+        """
+        Helper method of add_ship. Marks ship's fields in the index
+        of occupied fields (a dictionary, so the ship's number
+        is not needed).
+        """
+        for each_ship_coordinate in new_ship.coordinates():
+            self._rehash(each_ship_coordinate,
+                         self.field_status(each_ship_coordinate), 1)
+            self._ship_index[each_ship_coordinate] = new_ship
+        if new_ship.is_it_afloat():
+            self._ships_afloat += 1
+
+    def add_ship(self, new_ship: "Ship"):
+        """
+        Method that adds a new ship to a list of ships on game board.
+        Returns the index of occupied fields.
+        """
+        self.fleet().append(new_ship)
+        self._place_ship(new_ship, len(self.fleet()))
+        return self._ship_index
+
+    def resolve_shot(self, new_hit: tuple):
+        """
+        Method that marks the result of a shot in hits or misses
+        and returns the ship that has been hit (None if the shot missed).
+        The first hit at each of ship's fields takes its hit point.
+        """
+        new_hit = tuple(new_hit)
+        damaged_ship = self._ship_index.get(new_hit)
+        if damaged_ship:
+            if new_hit not in self._hits:
+                self._hits.add(new_hit)
+                self._rehash(new_hit, 1, 2)
+                if not damaged_ship.register_hit():
+                    self._ships_afloat -= 1
+        elif new_hit not in self._misses:
+            self._misses.add(new_hit)
+            self._rehash(new_hit, 0, 3)
+        return damaged_ship
+
+    def set_new_board_status(self, new_hit: tuple):
+        """
+        Method that sets new board status. It is performed after player's move.
+        Returns sets of hits and misses.
+        """
+        self.resolve_shot(new_hit)
+        return self._hits, self._misses
@@ -0,0 +1,219 @@
+from functools import lru_cache
+import numpy as np
+from game_board import GameBoard
+from placements import PLACEMENT_TABLES_CACHE_SIZE, placement_table
+from placements import placements_count
+from ship import naval_fleet
+
+"""
+This file contains canonical keys of positions under symmetries
+of the square board. Every layout has up to eight symmetric variants
+(four rotations, each of them also reflected), which are the same
+for analysis (solver's outcomes, density maps, statistics), so all
+of them get one key - the lexicographically smallest variant.
+
+Variants are computed with Numpy: a symmetry is a permutation
+of board's fields, and for each ship's size also a permutation
+of placements (see PlacementTable), so transforming many layouts
+is a few gathers. Ships of the same size are interchangeable,
+so their placements are sorted in each variant.
+A layout's key is its canonical placements packed into one integer.
+"""
+
+"""
+Number of symmetries of the square board.
+"""
+SYMMETRIES = 8
+
+"""
+Number of layouts transformed at once by canonical_layouts
+(it bounds the size of temporary arrays).
+"""
+SYMMETRY_BLOCK_SIZE = 1 << 15
+
+"""
+Largest size (in bytes) of the array of grids' variants built at once
+by canonical_grids.
+"""
+SYMMETRY_BLOCK_BYTES = 1 << 26
+
+
+@lru_cache(maxsize=PLACEMENT_TABLES_CACHE_SIZE)
+def field_permutations(boards_edge: int):
+    """
+    Function that returns (cached) Numpy array of shape (8, fields):
+    field number i of the t-th variant of a grid is field number
+    permutations[t, i] of the grid itself. The first one is identity,
+    then rotations by 90, 180 and 270 degrees, then the same ones
+    of the transposed grid.
+    """
+    grid = np.arange(boards_edge * boards_edge).reshape(boards_edge,
+                                                        boards_edge)
+    variants = [np.rot90(grid, turns) for turns in range(4)]
+    variants += [np.rot90(grid.T, turns) for turns in range(4)]
+    permutations = np.stack([variant.ravel() for variant in variants])
+    permutations.setflags(write=False)
+    return permutations
+
+
+@lru_cache(maxsize=PLACEMENT_TABLES_CACHE_SIZE)
+def placement_permutations(boards_edge: int, ship_size: int):
+    """
+    Function that returns (cached) Numpy array of shape
+    (8, placements): index of the image of each placement under
+    each symmetry. One field ships' vertical placements are mapped
+    to the horizontal ones (they have the same fields).
+    """
+    table = placement_table(boards_edge, ship_size)
+    images = np.argsort(field_permutations(boards_edge), axis=1)
+    cells = np.sort(images[:, table.cells()], axis=2)
+    starts = cells[:, :, 0]
+    if ship_size == 1:
+        horizontal = np.ones(starts.shape, dtype=bool)
+    else:
+        horizontal = cells[:, :, 1] - starts == 1
+    y_coordinates, x_coordinates = np.divmod(starts, boards_edge)
+    starts_in_line = boards_edge - ship_size + 1
+    permutations = np.where(
+        horizontal, y_coordinates * starts_in_line + x_coordinates,
+        table.horizontal_count() + starts)
+    permutations.setflags(write=False)
+    return permutations
+
+
+def lexicographic_min(variants: np.ndarray):
+    """
+    Function that returns the lexicographically smallest of the
+    variants of each row: variants have shape (variants, rows, columns),
+    the result (rows, columns).
+    """
+    alive = np.ones(variants.shape[:2], dtype=bool)
+    for column in range(variants.shape[2]):
+        values = variants[:, :, column]
+        smallest = np.where(alive, values, values.max()).min(axis=0)
+        alive &= values == smallest
+    chosen = alive.argmax(axis=0)
+    return variants[chosen, np.arange(variants.shape[1])]
+
+
+def canonical_layouts(boards_edge: int, layouts, fleet: dict = None):
+    """
+    Function that returns canonical forms of layouts (numbered like
+    in random_fleet_layouts: array of shape (layouts, ships) of each
+    ship's placement index, ships in fleet's order, by default
+    naval_fleet) - the same for all symmetric layouts.
+    """
+    if fleet is None:
+        fleet = naval_fleet
+    sizes = list(fleet.values())
+    layouts = np.asarray(layouts, dtype=np.int64).reshape(-1, len(sizes))
+    same_sizes = [[ship for ship, size in enumerate(sizes) if size == each]
+                  for each in set(sizes) if sizes.count(each) > 1]
+    canonical = np.empty_like(layouts)
+    for first in range(0, len(layouts), SYMMETRY_BLOCK_SIZE):
+        block = layouts[first:first + SYMMETRY_BLOCK_SIZE]
+        variants = np.empty((SYMMETRIES,) + block.shape, dtype=np.int64)
+        for ship, ship_size in enumerate(sizes):
+            permutations = placement_permutations(boards_edge, ship_size)
+            variants[:, :, ship] = permutations[:, block[:, ship]]
+        for ships in same_sizes:
+            variants[:, :, ships] = np.sort(variants[:, :, ships], axis=2)
+        canonical[first:first + len(block)] = lexicographic_min(variants)
+    return canonical
+
+
+def layout_radices(boards_edge: int, fleet: dict = None):
+    """
+    Function that returns number of placements of each ship
+    of the fleet (digits' bases of layouts' keys).
+    """
+    if fleet is None:
+        fleet = naval_fleet
+    return [placements_count(boards_edge, size) for size in fleet.values()]
+
+
+def layout_keys(boards_edge: int, layouts, fleet: dict = None):
+    """
+    Function that returns keys of layouts (see canonical_layouts) -
+    canonical placements packed into Numpy int64 numbers, the same
+    for all symmetric layouts. Raises ValueError if the keys don't fit
+    in 63 bits (then canonical_layouts should be used).
+    """
+    radices = layout_radices(boards_edge, fleet)
+    if np.prod([float(radix) for radix in radices]) >= 2.0 ** 63:
+        raise ValueError("Layout keys don't fit in 64-bit integers")
+    keys = np.zeros(len(np.asarray(layouts).reshape(-1, len(radices))),
+                    dtype=np.int64)
+    canonical = canonical_layouts(boards_edge, layouts, fleet)
+    for column, radix in enumerate(radices):
+        keys = keys * radix + canonical[:, column]
+    return keys
+
+
+def board_layout(board: GameBoard):
+    """
+    Function that returns placement index of each ship of the board's
+    fleet (numbered like in placement tables of the board).
+    """
+    layout = []
+    for each_ship in board.fleet():
+        coordinates = sorted(each_ship.coordinates())
+        horizontal = coordinates[0][0] == coordinates[-1][0]
+        table = placement_table(board.boards_edge(), each_ship.size())
+        layout.append(table.placement_index(coordinates[0], horizontal))
+    return layout
+
+
+def fleet_key(board: GameBoard):
+    """
+    Function that returns key of the layout of board's fleet - the same
+    for all symmetric layouts of ships of the same sizes (ships are
+    taken in fleet's order). It is a Python int, so it can't overflow,
+    and when the key fits in 63 bits it equals key given by layout_keys.
+    """
+    fleet = {number: each_ship.size()
+             for number, each_ship in enumerate(board.fleet())}
+    canonical = canonical_layouts(board.boards_edge(), board_layout(board),
+                                  fleet)[0]
+    key = 0
+    for placement, radix in zip(canonical.tolist(),
+                                layout_radices(board.boards_edge(), fleet)):
+        key = key * radix + placement
+    return key
+
+
+def grids_block_size(boards_edge: int, itemsize: int):
+    """
+    Function that returns number of grids with given edge and bytes
+    per field whose variants fit in SYMMETRY_BLOCK_BYTES (at least one).
+    """
+    variant_bytes = SYMMETRIES * boards_edge * boards_edge * itemsize
+    return max(1, SYMMETRY_BLOCK_BYTES // variant_bytes)
+
+
+def canonical_grids(grids):
+    """
+    Function that returns canonical forms of square grids (e.g. ocean
+    grids or density maps) of shape (grids, edge, edge) - for each grid
+    the lexicographically smallest of its symmetric variants.
+    """
+    grids = np.asarray(grids)
+    count, boards_edge = grids.shape[:2]
+    flat_grids = grids.reshape(count, -1)
+    permutations = field_permutations(boards_edge)
+    canonical = np.empty_like(flat_grids)
+    block_size = grids_block_size(boards_edge, grids.itemsize)
+    for first in range(0, count, block_size):
+        block = flat_grids[first:first + block_size]
+        canonical[first:first + len(block)] = lexicographic_min(
+            block[:, permutations].transpose(1, 0, 2))
+    return canonical.reshape(grids.shape)
+
+
+def grid_key(grid: np.ndarray):
+    """
+    Function that returns key of a square grid (e.g. board's ocean grid)
+    - bytes of its canonical form, the same for all its symmetric
+    variants.
+    """
+    return canonical_grids(np.asarray(grid)[None])[0].tobytes()
@@ -0,0 +1,63 @@
+import numpy as np
+from batch_board import batch_from_game_boards, batch_from_layouts
+from game_board import GameBoard
+from placements import layout_ships, random_fleet_layouts
+from ship import Ship, naval_fleet
+
+
+def two_boards():
+    first_board = GameBoard(4)
+    first_board.add_ship(Ship("Patrol boat", 2, [(0, 0), (0, 1)]))
+    second_board = GameBoard(4)
+    second_board.add_ship(Ship("Patrol boat", 2, [(3, 3), (2, 3)]))
+    return [first_board, second_board]
+
+
+def test_batch_from_game_boards():
+    batch = batch_from_game_boards(two_boards())
+    assert batch.games() == 2
+    assert batch.boards_edge() == 4
+    assert (batch.hit_points() == 2).all()
+    assert (batch.ships_afloat() == 1).all()
+
+
+def test_fire():
+    batch = batch_from_game_boards(two_boards())
+    hit, ship, sunk, lost = batch.fire(np.array([0, 0]), np.array([0, 0]))
+    assert list(hit) == [True, False]
+    assert list(ship) == [0, -1]
+    assert not sunk.any()
+    hit, ship, sunk, lost = batch.fire(np.array([0, 2]), np.array([1, 3]))
+    assert list(hit) == [True, True]
+    assert list(sunk) == [True, False]
+    assert list(lost) == [True, False]
+    assert (batch.ocean_grid(0) == np.array(
+        [[2, 2, 0, 0], [0] * 4, [0] * 4, [0] * 4])).all()
+
+
+def test_fire_same_field_twice():
+    batch = batch_from_game_boards(two_boards())
+    games = np.array([0])
+    batch.fire(np.array([0]), np.array([0]), games)
+    hit, _, sunk, _ = batch.fire(np.array([0]), np.array([0]), games)
+    assert hit[0] and not sunk[0]
+    assert batch.hit_points()[0, 0] == 1
+
+
+def test_batch_from_layouts_matches_ships():
+    layouts = random_fleet_layouts(8, 5, rng=2)
+    batch = batch_from_layouts(8, layouts)
+    for game, layout in enumerate(layouts):
+        board = GameBoard(8)
+        for each_ship in layout_ships(8, layout):
+            board.add_ship(each_ship)
+        assert (batch.ocean_grid(game) == board.ocean_grid()).all()
+    assert (batch.hit_points().sum(axis=1)
+            == sum(naval_fleet.values())).all()
+
+
+def test_ship_fields():
+    batch = batch_from_game_boards(two_boards())
+    fields = batch.ship_fields(np.array([1]), np.array([0]))
+    assert fields[0, 3, 3] and fields[0, 2, 3]
+    assert fields.sum() == 2
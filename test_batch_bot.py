@@ -0,0 +1,74 @@
+import numpy as np
+from random import Random
+from batch_bot import BatchBotPolicy, batch_shots_to_win, neighbour_counts
+from batch_bot import weighted_choice
+from game_board import GameBoard
+from players import BotPlayer, Player
+from simulation import new_bot_player
+
+
+def test_neighbour_counts():
+    fields = np.zeros((1, 3, 3), dtype=bool)
+    fields[0, 1, 1] = True
+    fields[0, 0, 1] = True
+    counts = neighbour_counts(fields)
+    assert counts[0, 0, 0] == 1
+    assert counts[0, 1, 0] == 1
+    assert counts[0, 0, 1] == 1
+    assert counts[0, 1, 1] == 1
+
+
+def test_weighted_choice_skips_zero_weights():
+    weights = np.zeros((50, 4))
+    weights[:, 2] = 1
+    cells = weighted_choice(weights, np.random.default_rng(0))
+    assert (cells == 2).all()
+
+
+def test_policy_fires_next_to_single_hit():
+    policy = BatchBotPolicy(20, 5, rng=0)
+    games = np.arange(20)
+    policy.observe(games, np.full(20, 2), np.full(20, 2),
+                   np.ones(20, dtype=bool))
+    y_coordinates, x_coordinates = policy.choose_shots()
+    distances = abs(y_coordinates - 2) + abs(x_coordinates - 2)
+    assert (distances == 1).all()
+
+
+def test_policy_fires_at_line_ends():
+    policy = BatchBotPolicy(20, 5, rng=0)
+    games = np.arange(20)
+    for x_coordinate in (1, 2):
+        policy.observe(games, np.full(20, 3), np.full(20, x_coordinate),
+                       np.ones(20, dtype=bool))
+    y_coordinates, x_coordinates = policy.choose_shots()
+    assert (y_coordinates == 3).all()
+    assert set(x_coordinates) == {0, 3}
+
+
+def test_policy_forgets_sunk_ship():
+    policy = BatchBotPolicy(1, 4, rng=0)
+    games = np.array([0])
+    policy.observe(games, np.array([0]), np.array([0]),
+                   np.array([True]))
+    sunk_fields = np.zeros((1, 4, 4), dtype=bool)
+    sunk_fields[0, 0, :2] = True
+    policy.observe(games, np.array([0]), np.array([1]),
+                   np.array([True]), np.array([True]), sunk_fields)
+    assert not policy.pending().any()
+
+
+def test_batch_policy_matches_bot_player():
+    batch_shots = batch_shots_to_win(8, 1000, seed=0)
+    bot_shots = []
+    for seed in range(500):
+        rng = Random(seed)
+        target = Player("Gosia", new_bot_player(8, rng).game_board())
+        bot = BotPlayer("Opponent", GameBoard(8), rng=rng)
+        shots = 0
+        while not target.has_lost():
+            bot.attack_player(target)
+            shots += 1
+        bot_shots.append(shots)
+    assert abs(batch_shots.mean() - np.mean(bot_shots)) < 2.0
+    assert abs(batch_shots.std() - np.std(bot_shots)) < 2.0
@@ -0,0 +1,149 @@
+import time
+from random import Random
+import numpy as np
+from belief_sampler import UPDATE_TIME_BUDGET, BeliefSampler
+from belief_sampler import MonteCarloBotPlayer
+from bitboard import array_to_mask
+from density_bot import DensityMap
+from endgame_solver import EndgameSolver, fields_of
+from game_board import GameBoard
+from players import Player
+from ship import Ship
+from simulation import new_bot_player, play_game
+
+
+def exact_probabilities(density_map: DensityMap):
+    solver = EndgameSolver(density_map.boards_edge(), 100000)
+    solver._deadline = float("inf")
+    hits = array_to_mask(density_map.hits())
+    layouts = solver.layouts(solver.placements(density_map, hits),
+                             density_map.remaining(), hits)
+    probabilities = np.zeros(density_map.boards_edge() ** 2)
+    for fields, _ in layouts:
+        for field in fields_of(fields):
+            probabilities[field] += 1
+    return probabilities / len(layouts)
+
+
+def layouts_are_consistent(sampler: BeliefSampler):
+    density_map = sampler.density_map()
+    hits = density_map.hits()
+    for chain in range(sampler.chains()):
+        occupied = np.zeros(density_map.boards_edge() ** 2, dtype=int)
+        for ship in range(len(sampler.sizes())):
+            occupied[sampler._cells(ship)[chain]] += 1
+        if occupied.max() > 1 or (occupied & density_map.blocked()).any():
+            return False
+        if (hits & (occupied == 0)).any():
+            return False
+    return True
+
+
+def untried_cells(density_map: DensityMap):
+    return np.flatnonzero(~density_map.tried())
+
+
+def test_probabilities_match_exact_ones():
+    density_map = DensityMap(4, [3, 2])
+    density_map.record_miss(5)
+    density_map.record_hit(10)
+    sampler = BeliefSampler(density_map, rng=0)
+    sampler.sample(200)
+    probabilities = sampler.hit_probabilities()
+    exact = exact_probabilities(density_map)
+    assert probabilities[5] == probabilities[10] == -1
+    untried = ~density_map.tried()
+    assert np.abs(probabilities - exact)[untried].max() < 0.05
+
+
+def test_chains_follow_shots():
+    density_map = DensityMap(6, [3, 2])
+    sampler = BeliefSampler(density_map, rng=1)
+    for cell in (0, 7, 14):
+        density_map.record_miss(cell)
+    density_map.record_hit(20)
+    sampler.update()
+    assert sampler.samples() == 0
+    assert layouts_are_consistent(sampler)
+    density_map.record_hit(21)
+    density_map.record_sunk([20, 21], 2)
+    sampler.update()
+    assert sampler.sizes() == [3]
+    assert sampler.placements().shape == (sampler.chains(), 1)
+    assert layouts_are_consistent(sampler)
+    sampler.sample(4)
+    probabilities = sampler.hit_probabilities()
+    assert probabilities[20] == probabilities[21] == -1
+    assert abs(probabilities[untried_cells(density_map)].sum() - 3) < 1e-9
+
+
+def test_layout_constructed_when_no_chain_fits():
+    density_map = DensityMap(5, [2])
+    sampler = BeliefSampler(density_map, chains=4, rng=2)
+    for cell in range(25):
+        if cell not in (12, 13):
+            density_map.record_miss(cell)
+    sampler.update()
+    assert sampler.consistent()
+    assert layouts_are_consistent(sampler)
+    density_map.record_miss(13)
+    sampler.update()
+    assert not sampler.consistent()
+    sampler.sample()
+    assert sampler.hit_probabilities() is None
+
+
+def test_sampler_has_no_dict():
+    sampler = BeliefSampler(DensityMap(5, [2]), chains=4, rng=0)
+    assert not hasattr(sampler, "__dict__")
+
+
+def test_choose_new_hit_bounds_update_time():
+    # the hits can't be covered by the fleet, so looking for a layout
+    # from scratch would take all the construction steps
+    player = Player("Gosia", GameBoard(10))
+    bot = MonteCarloBotPlayer("Opponent", GameBoard(10), rng=Random(0))
+    bot.belief_sampler(player)
+    for cell in range(0, 100, 7):
+        bot.density_map().record_hit(cell)
+    start = time.perf_counter()
+    shot = bot.choose_new_hit(player)
+    assert time.perf_counter() - start < UPDATE_TIME_BUDGET + 0.1
+    assert not bot.belief_sampler().consistent()
+    assert not bot.chosen_before_coordinate(shot)
+
+
+def test_monte_carlo_bot_finds_ship():
+    board = GameBoard(4)
+    board.add_ship(Ship("Patrol boat", 2, [(1, 1), (1, 2)]))
+    player = Player("Gosia", board)
+    bot = MonteCarloBotPlayer("Opponent", GameBoard(4), rng=Random(0))
+    shots = 0
+    while not player.has_lost():
+        bot.attack_player(player)
+        shots += 1
+    assert shots <= 16
+    assert bot.belief_sampler().samples()
+
+
+def test_monte_carlo_bot_game():
+    rng = Random(3)
+    bot = MonteCarloBotPlayer("Opponent", GameBoard(8), rng=rng, sweeps=4)
+    bot.opponent_arranges_ships_on_board("uniform")
+    result = play_game(bot, new_bot_player(8, rng))
+    assert result.winner() in (0, 1)
+
+
+def test_monte_carlo_bot_refines_shots():
+    board = GameBoard(6)
+    board.add_ship(Ship("Destroyer", 3, [(2, 2), (2, 3), (2, 4)]))
+    player = Player("Gosia", board)
+    bot = MonteCarloBotPlayer("Opponent", GameBoard(6), rng=Random(0),
+                              sweeps=3)
+    shots = [shot for shot in
+             bot.refine_shots(player, time.perf_counter() + 1) if shot]
+    assert len(shots) == 4
+    assert all(not bot.chosen_before_coordinate(shot) for shot in shots)
+    assert bot.belief_sampler().samples() == 3 * bot.belief_sampler().chains()
+    while not player.has_lost():
+        bot.attack_player(player, time_budget=0.01)
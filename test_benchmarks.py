@@ -0,0 +1,50 @@
+import json
+from random import Random
+from benchmarks import (BENCHMARKS, arranged_bot, compare_results, main,
+                        random_shots, results_document, run_suite)
+
+
+def test_run_suite():
+    results = run_suite(edges=(8, 10), repeat=1)
+    assert set(results) == set(BENCHMARKS)
+    for times in results.values():
+        assert set(times) == {"8", "10"}
+        assert all(seconds > 0 for seconds in times.values())
+
+
+def test_suite_draws_are_seeded():
+    first = arranged_bot(16, Random(1)).game_board()
+    second = arranged_bot(16, Random(1)).game_board()
+    assert (first.ocean_grid() == second.ocean_grid()).all()
+    assert random_shots(16, Random(2)) == random_shots(16, Random(2))
+
+
+def test_run_suite_skips_big_full_games():
+    results = run_suite(edges=(8, 300), repeat=1, names=["full_game"])
+    assert list(results) == ["full_game"]
+    assert list(results["full_game"]) == ["8"]
+
+
+def test_compare_results_flags_regressions():
+    base = results_document({"add_ship": {"8": 1.0, "16": 1.0}}, "a")
+    new = results_document({"add_ship": {"8": 1.05, "16": 1.5},
+                            "full_game": {"8": 1.0}}, "b")
+    rows = compare_results(base, new, threshold=0.1)
+    assert [(row[0], row[1], row[-1]) for row in rows] == [
+        ("add_ship", 8, False), ("add_ship", 16, True)]
+
+
+def test_main_run_and_compare(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    assert main(["run", "--edges", "8", "--repeat", "1",
+                 "--only", "add_ship", "--output", str(output)]) == 0
+    document = json.loads(output.read_text())
+    assert list(document["results"]) == ["add_ship"]
+    slower = dict(document)
+    slower["results"] = {"add_ship": {"8": document["results"]["add_ship"]
+                                      ["8"] * 2}}
+    slower_output = tmp_path / "slower.json"
+    slower_output.write_text(json.dumps(slower))
+    assert main(["compare", str(output), str(output)]) == 0
+    assert main(["compare", str(output), str(slower_output)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,68 @@
+import numpy as np
+from bitboard import BitGameBoard, BitMemory, bit_of, mask_to_array
+from bitboard import neighbours, popcount
+from game_board import GameBoard
+from players import BotPlayer, Player
+from ship import Ship
+from simulation import play_game
+
+
+def test_bit_of():
+    assert bit_of((0, 0), 8) == 1
+    assert bit_of((1, 2), 8) == 1 << 10
+
+
+def test_mask_to_array():
+    mask = bit_of((0, 1), 3) | bit_of((2, 2), 3)
+    array = mask_to_array(mask, 3)
+    assert array[0, 1] and array[2, 2]
+    assert np.count_nonzero(array) == 2
+
+
+def test_neighbours_stay_in_rows():
+    mask = bit_of((1, 0), 3)
+    near = mask_to_array(neighbours(mask, 3), 3)
+    assert near[0, 0] and near[2, 0] and near[1, 1]
+    assert not near[0, 2]
+    assert popcount(neighbours(mask, 3)) == 3
+
+
+def test_bit_memory():
+    memory = BitMemory(8)
+    memory[(2, 3)] = 1
+    assert memory[(2, 3)] == 1
+    assert memory[(3, 2)] == 0
+    assert memory.popcount() == 1
+
+
+def test_player_gets_bit_memory():
+    player = Player("Gosia", BitGameBoard(8))
+    new_memory = player.remove_coordinate_from_memory((0, 0))
+    assert new_memory[(0, 0)] == 1
+    assert player.chosen_before_coordinate((0, 0)) is True
+
+
+def test_bit_board_matches_numpy_board():
+    coordinates = [(0, 0), (1, 0)]
+    numpy_board = GameBoard(4, [Ship("Patrol boat", 2, list(coordinates))])
+    bit_board = BitGameBoard(4, [Ship("Patrol boat", 2, list(coordinates))])
+    for shot in [(0, 0), (2, 2), (1, 0)]:
+        numpy_grid = numpy_board.set_new_board_status(shot)
+        bit_grid = bit_board.set_new_board_status(shot)
+        assert (bit_grid == numpy_grid).all()
+    assert (bit_board.ocean_grid() == numpy_board.ocean_grid()).all()
+    assert bit_board.field_status((2, 2)) == 3
+    assert bit_board.ships_afloat() == 0
+    ship = Ship("Submarine", 1, [(3, 3)])
+    assert (bit_board.add_ship(ship) ==
+            numpy_board.add_ship(Ship("Submarine", 1, [(3, 3)]))).all()
+
+
+def test_bit_board_game():
+    first_bot = BotPlayer("Opponent", BitGameBoard(8))
+    second_bot = BotPlayer("Opponent", BitGameBoard(8))
+    first_bot.opponent_arranges_ships_on_board()
+    second_bot.opponent_arranges_ships_on_board()
+    result = play_game(first_bot, second_bot)
+    loser = (first_bot, second_bot)[1 - result.winner()]
+    assert loser.has_lost()
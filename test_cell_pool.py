@@ -0,0 +1,44 @@
+from random import Random
+from cell_pool import SHORT_POOL_SIZE, CellPool
+
+
+def test_cell_pool_remove():
+    pool = CellPool(4)
+    assert pool.remove(1) is True
+    assert pool.remove(1) is False
+    assert len(pool) == 3
+    assert 1 not in pool
+    assert 3 in pool
+
+
+def test_cell_pool_draw_only_remaining():
+    pool = CellPool(10)
+    for cell in range(9):
+        pool.remove(cell)
+    rng = Random(0)
+    assert {pool.draw(rng) for _ in range(20)} == {9}
+
+
+def test_sparse_cell_pool():
+    pool = CellPool(SHORT_POOL_SIZE + 2)
+    assert pool.sparse()
+    assert pool.remove(5) is True
+    assert pool.remove(5) is False
+    assert 5 not in pool
+    assert len(pool) == SHORT_POOL_SIZE + 1
+    rng = Random(0)
+    assert all(pool.draw(rng) != 5 for _ in range(1000))
+
+
+def test_sparse_cell_pool_becomes_dense():
+    size = SHORT_POOL_SIZE + 2
+    pool = CellPool(size)
+    for cell in range(0, size, 2):
+        pool.remove(cell)
+    assert pool.sparse()
+    pool.remove(1)
+    assert not pool.sparse()
+    assert len(pool) == size // 2 - 1
+    assert 1 not in pool and 0 not in pool and 3 in pool
+    rng = Random(1)
+    assert all(pool.draw(rng) % 2 == 1 for _ in range(1000))
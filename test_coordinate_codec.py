@@ -0,0 +1,32 @@
+import pytest
+from coordinate_codec import column_label, column_number, decode_coordinate
+from coordinate_codec import encode_coordinate
+
+
+def test_column_labels():
+    assert [column_label(x) for x in (0, 25, 26, 27, 701, 702)] == \
+        ["A", "Z", "AA", "AB", "ZZ", "AAA"]
+    for x_coordinate in range(2000):
+        assert column_number(column_label(x_coordinate)) == x_coordinate
+
+
+def test_encode_and_decode():
+    assert encode_coordinate((11, 27)) == "AB12"
+    assert decode_coordinate("AB12") == (11, 27)
+    assert decode_coordinate("ab12") == (11, 27)
+    assert decode_coordinate("c5") == (4, 2)
+    assert decode_coordinate("12,28") == (11, 27)
+    assert decode_coordinate("9999, 10000") == (9998, 9999)
+
+
+def test_decode_errors():
+    with pytest.raises(ValueError, match="length"):
+        decode_coordinate("A")
+    with pytest.raises(ValueError, match="letter"):
+        decode_coordinate("15")
+    with pytest.raises(ValueError, match="integer"):
+        decode_coordinate("AB")
+    with pytest.raises(ValueError, match="integer"):
+        decode_coordinate("A1B")
+    with pytest.raises(ValueError, match="integers"):
+        decode_coordinate("1,B")
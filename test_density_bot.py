@@ -0,0 +1,91 @@
+import numpy as np
+from random import Random
+from density_bot import DensityBotPlayer, DensityMap
+from placements import placement_table
+from game_board import GameBoard
+from players import Player
+from ship import Ship
+from simulation import new_bot_player, play_game
+
+
+def test_hunt_density_counts_placements():
+    density_map = DensityMap(3, [3])
+    density = density_map.density()
+    assert density[4] == 2
+    assert density[0] == 2
+    assert density[1] == 2
+
+
+def test_miss_removes_placements():
+    density_map = DensityMap(3, [3])
+    density_map.record_miss(4)
+    density = density_map.density()
+    assert density[4] == -1
+    assert density[1] == 1
+    assert density[0] == 2
+    assert (density_map.hunt_density()
+            == DensityMap(3, [3]).hunt_density() - np.array(
+                [0, 1, 0, 1, 2, 1, 0, 1, 0])).all()
+
+
+def test_target_density_around_hit():
+    density_map = DensityMap(5, [2])
+    density_map.record_hit(12)
+    density = density_map.density()
+    assert set(np.flatnonzero(density == density.max())) == {7, 11, 13, 17}
+
+
+def test_record_sunk():
+    density_map = DensityMap(4, [2, 3])
+    density_map.record_hit(0)
+    density_map.record_sunk([0, 1], 2)
+    assert density_map.remaining() == {3: 1}
+    assert not density_map.hits().any()
+    assert density_map.blocked()[[0, 1]].all()
+
+
+def rebuilt_target_density(density_map: DensityMap):
+    density = np.zeros(len(density_map.hits()), dtype=np.int64)
+    for size, count in density_map.remaining().items():
+        table = placement_table(density_map.boards_edge(), size)
+        cells = table.cells()[density_map.possible(size)]
+        covered_hits = density_map.hits()[cells].sum(axis=1)
+        density += count * np.bincount(
+            cells.ravel(), weights=np.repeat(covered_hits, size),
+            minlength=len(density)).astype(np.int64)
+    return density
+
+
+def test_target_density_is_updated():
+    rng = Random(5)
+    board = GameBoard(8)
+    player = Player("Gosia", board)
+    for each_ship in new_bot_player(8, rng).game_board().fleet():
+        board.add_ship(each_ship)
+    bot = DensityBotPlayer("Opponent", GameBoard(8), rng=rng)
+    while not player.has_lost():
+        bot.attack_player(player)
+        density_map = bot.density_map(player)
+        assert (density_map.target_density()
+                == rebuilt_target_density(density_map)).all()
+
+
+def test_density_bot_finds_ship():
+    board = GameBoard(4)
+    board.add_ship(Ship("Patrol boat", 2, [(1, 1), (1, 2)]))
+    player = Player("Gosia", board)
+    bot = DensityBotPlayer("Opponent", GameBoard(4), rng=Random(0))
+    shots = 0
+    while not player.has_lost():
+        bot.attack_player(player)
+        shots += 1
+    assert shots <= 16
+    assert bot.hits_memory() == []
+
+
+def test_density_bot_game():
+    rng = Random(1)
+    bot = DensityBotPlayer("Opponent", GameBoard(8), rng=rng)
+    bot.opponent_arranges_ships_on_board("uniform")
+    result = play_game(bot, new_bot_player(8, rng))
+    assert result.winner() in (0, 1)
@@ -0,0 +1,135 @@
+import time
+from functools import lru_cache
+from random import Random
+from density_bot import DensityMap
+from endgame_solver import EndgameBotPlayer, EndgameSolver, fields_of
+from endgame_solver import lowest_field
+from game_board import GameBoard
+from players import Player
+from ship import Ship
+from simulation import new_bot_player, play_game
+
+
+def solver_layouts(solver: EndgameSolver, density_map: DensityMap,
+                   hits: int = 0):
+    solver._deadline = float("inf")
+    placements = solver.placements(density_map, hits)
+    return solver.layouts(placements, density_map.remaining(), hits)
+
+
+@lru_cache(maxsize=None)
+def brute_force(layouts: frozenset, hits: int):
+    if not next(iter(layouts))[0]:
+        return 0.0
+    fields = 0
+    for layout_fields, _ in layouts:
+        fields |= layout_fields
+    best = float("inf")
+    for field in fields_of(fields & ~hits):
+        bit = 1 << field
+        outcomes = {}
+        for layout_fields, ships in layouts:
+            sub_hits, sunk, layout = hits, 0, (layout_fields, ships)
+            if layout_fields & bit:
+                ship = next(mask for mask in ships if mask & bit)
+                sub_hits = hits | bit
+                if not ship & ~sub_hits:
+                    sub_hits, sunk = sub_hits & ~ship, ship
+                    layout = (layout_fields & ~ship, tuple(
+                        mask for mask in ships if mask != ship))
+            outcomes.setdefault((sub_hits, sunk), set()).add(layout)
+        expected = 1.0
+        for (sub_hits, _), sub_layouts in outcomes.items():
+            expected += (len(sub_layouts) / len(layouts)
+                         * brute_force(frozenset(sub_layouts), sub_hits))
+        best = min(best, expected)
+    return best
+
+
+def test_fields_of():
+    assert list(fields_of(0b10110)) == [1, 2, 4]
+    assert lowest_field(0b10100) == 2
+
+
+def test_layouts_of_one_ship():
+    solver = EndgameSolver(3)
+    layouts = solver_layouts(solver, DensityMap(3, [2]))
+    assert len(layouts) == 12
+
+
+def test_layouts_cover_hits():
+    density_map = DensityMap(4, [2, 1])
+    density_map.record_hit(5)
+    layouts = solver_layouts(EndgameSolver(4, 1000), density_map, 1 << 5)
+    assert all(fields & 1 << 5 for fields, _ in layouts)
+    # the patrol boat covers the hit (4 ways, 14 fields left for the
+    # raft) or the raft does (it isn't sunk yet, so it can't)
+    assert len(layouts) == 4 * 14
+
+
+def test_too_many_layouts():
+    solver = EndgameSolver(10)
+    assert solver_layouts(solver, DensityMap(10, [5, 4, 3, 3, 2])) is None
+    assert solver.best_shot(DensityMap(10, [5, 4, 3, 3, 2])) is None
+
+
+def test_solver_matches_brute_force():
+    for boards_edge, ship_sizes, misses in [(3, [2], []), (3, [3], [4]),
+                                            (3, [2, 1], [0, 8]),
+                                            (4, [3], [5, 10])]:
+        density_map = DensityMap(boards_edge, ship_sizes)
+        for cell in misses:
+            density_map.record_miss(cell)
+        solver = EndgameSolver(boards_edge, 1000)
+        field, expected = solver.best_shot(density_map, time_budget=10)
+        layouts = solver_layouts(solver, density_map)
+        assert abs(expected - brute_force(frozenset(layouts), 0)) < 1e-9
+        assert field is not None
+
+
+def test_transposition_table_is_reused():
+    density_map = DensityMap(4, [3])
+    density_map.record_miss(5)
+    solver = EndgameSolver(4)
+    first = solver.best_shot(density_map, time_budget=10)
+    positions = len(solver.table())
+    assert positions > 1
+    assert solver.best_shot(density_map, time_budget=10) == first
+    assert len(solver.table()) == positions
+
+
+def test_time_budget():
+    solver = EndgameSolver(4)
+    assert solver.best_shot(DensityMap(4, [2]), time_budget=0) is None
+
+
+def test_endgame_bot_finds_ship():
+    board = GameBoard(4)
+    board.add_ship(Ship("Patrol boat", 2, [(1, 1), (1, 2)]))
+    player = Player("Gosia", board)
+    bot = EndgameBotPlayer("Opponent", GameBoard(4), rng=Random(0))
+    shots = 0
+    while not player.has_lost():
+        bot.attack_player(player)
+        shots += 1
+    assert shots <= 16
+    assert len(bot.endgame_solver().table())
+
+
+def test_endgame_bot_game():
+    rng = Random(1)
+    bot = EndgameBotPlayer("Opponent", GameBoard(8), rng=rng)
+    bot.opponent_arranges_ships_on_board("uniform")
+    result = play_game(bot, new_bot_player(8, rng))
+    assert result.winner() in (0, 1)
+
+
+def test_endgame_bot_refines_shots():
+    board = GameBoard(3)
+    board.add_ship(Ship("Patrol boat", 2, [(1, 0), (1, 1)]))
+    player = Player("Gosia", board)
+    bot = EndgameBotPlayer("Opponent", GameBoard(3), rng=Random(0))
+    assert len(list(bot.refine_shots(player, time.perf_counter() - 1))) == 1
+    shots = list(bot.refine_shots(player, time.perf_counter() + 10))
+    assert len(shots) == 2
+    assert len(bot.endgame_solver().table())
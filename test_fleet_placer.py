@@ -0,0 +1,88 @@
+import pytest
+from random import Random
+from fleet_placer import FleetPlacer, PlacementTimeout, bits_from
+from fleet_placer import place_fleet
+from ship import naval_fleet
+
+
+def assert_legal_layout(ships, boards_edge, occupied=()):
+    taken = set(occupied)
+    for each_ship in ships:
+        coordinates = each_ship.coordinates()
+        assert len(coordinates) == each_ship.size()
+        for y_coordinate, x_coordinate in coordinates:
+            assert 0 <= y_coordinate < boards_edge
+            assert 0 <= x_coordinate < boards_edge
+            assert (y_coordinate, x_coordinate) not in taken
+            taken.add((y_coordinate, x_coordinate))
+        rows = {y_coordinate for y_coordinate, _ in coordinates}
+        columns = {x_coordinate for _, x_coordinate in coordinates}
+        assert len(rows) == 1 or len(columns) == 1
+
+
+def test_bits_from():
+    mask = 0b101101
+    assert list(bits_from(mask, 0)) == [0, 2, 3, 5]
+    assert list(bits_from(mask, 3)) == [3, 5, 0, 2]
+
+
+def test_legal_starts():
+    placer = FleetPlacer(4, {"Destroyer": 3})
+    horizontal, vertical = placer.legal_starts((1 << 16) - 1, 3)
+    assert horizontal.bit_count() == 8
+    assert vertical.bit_count() == 8
+    horizontal, vertical = placer.legal_starts((1 << 16) - 1, 3, after=2)
+    assert horizontal & 0b11 == 0
+    assert vertical & 0b1 == 0 and vertical & 0b10
+
+
+def test_places_naval_fleet():
+    ships = place_fleet(10, rng=Random(0))
+    assert [each_ship.name() for each_ship in ships] == list(naval_fleet)
+    assert_legal_layout(ships, 10)
+
+
+def test_avoids_occupied_fields():
+    occupied = [(y_coordinate, x_coordinate)
+                for y_coordinate in range(6) for x_coordinate in range(6)
+                if y_coordinate != x_coordinate]
+    fleet = {"Patrol boat": 1, "Submarine": 1}
+    ships = place_fleet(6, fleet, occupied, Random(0))
+    assert_legal_layout(ships, 6, occupied)
+
+
+def test_fills_the_whole_board():
+    fleet = {f"Ship {number}": 5 for number in range(5)}
+    ships = place_fleet(5, fleet, rng=Random(1))
+    assert_legal_layout(ships, 5)
+
+
+def test_dense_custom_fleet():
+    fleet = {f"Ship {number}": 3 for number in range(16)}
+    ships = place_fleet(7, fleet, rng=Random(2))
+    assert_legal_layout(ships, 7)
+
+
+def test_proves_that_there_is_no_layout():
+    fleet = {f"Ship {number}": 4 for number in range(9)}
+    assert place_fleet(6, fleet, rng=Random(0), time_budget=10) is None
+    assert place_fleet(4, {"Carrier": 5}) is None
+
+
+def test_time_budget():
+    fleet = {f"Ship {number}": 4 for number in range(9)}
+    with pytest.raises(TimeoutError):
+        place_fleet(6, fleet, rng=Random(0), time_budget=0)
+    assert issubclass(PlacementTimeout, TimeoutError)
+
+
+def test_same_seed_same_layout():
+    first = place_fleet(10, rng=Random(5))
+    second = place_fleet(10, rng=Random(5))
+    assert ([each_ship.coordinates() for each_ship in first] ==
+            [each_ship.coordinates() for each_ship in second])
+
+
+def test_ship_size_has_to_be_positive():
+    with pytest.raises(ValueError):
+        FleetPlacer(10, {"Raft": 0})
@@ -1,53 +1,126 @@
+import pytest
+from bitboard import BitGameBoard
 from game_board import GameBoard
 from ship import Ship
+from sparse_board import SparseGameBoard
 
+"""
+Backends of the game board - all of them have to pass the tests below.
+"""
+BOARD_CLASSES = [GameBoard, BitGameBoard, SparseGameBoard]
 
-def test_init_gameboard_default():
-    board = GameBoard(8)
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_init_gameboard_default(board_class):
+    board = board_class(8)
     assert board.boards_edge() == 8
     assert board.fleet() == []
 
 
-def test_init_gameboard_with_ships():
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_init_gameboard_with_ships(board_class):
     ship1 = Ship("Carrier", 5)
     ship2 = Ship("Patrol boat", 2)
     ships = [ship1, ship2]
-    board = GameBoard(8, ships)
+    board = board_class(8, ships)
     assert board.boards_edge() == 8
     assert board.fleet() == ships
 
 
-def test_add_ship():
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_add_ship(board_class):
     coord1 = (0, 0)
     coord2 = (1, 0)
     coordinates = [coord1, coord2]
     ship1 = Ship("Patrol boat", 2, coordinates)
-    board = GameBoard(8)
+    board = board_class(8)
     board.add_ship(ship1)
     assert board.ocean_grid()[coord1] == 1
     assert board.ocean_grid()[coord2] == 1
     assert len(board.fleet()) == 1
 
 
-def test_set_new_board_status_hit():
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_set_new_board_status_hit(board_class):
     coord1 = (0, 0)
     coord2 = (1, 0)
     coordinates = [coord1, coord2]
     ship1 = Ship("Patrol boat", 2, coordinates)
-    board = GameBoard(8)
+    board = board_class(8)
     board.add_ship(ship1)
     hit = (0, 0)
     board.set_new_board_status(hit)
     assert board.ocean_grid()[hit] == 2
 
 
-def test_set_new_board_status_miss():
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_set_new_board_status_miss(board_class):
     coord1 = (0, 0)
     coord2 = (1, 0)
     coordinates = [coord1, coord2]
     ship1 = Ship("Patrol boat", 2, coordinates)
-    board = GameBoard(8)
+    board = board_class(8)
     board.add_ship(ship1)
     hit = (0, 2)
     board.set_new_board_status(hit)
     assert board.ocean_grid()[hit] == 3
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_ship_at(board_class):
+    ship1 = Ship("Patrol boat", 2, [(0, 0), (1, 0)])
+    board = board_class(8)
+    board.add_ship(ship1)
+    assert board.ship_at((1, 0)) is ship1
+    assert board.ship_at((0, 1)) is None
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_init_gameboard_indexes_fleet(board_class):
+    ship1 = Ship("Patrol boat", 2, [(0, 0), (1, 0)])
+    board = board_class(8, [ship1])
+    assert board.ship_at((0, 0)) is ship1
+    assert board.ocean_grid()[(1, 0)] == 1
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_resolve_shot(board_class):
+    ship1 = Ship("Patrol boat", 2, [(0, 0), (1, 0)])
+    board = board_class(8)
+    board.add_ship(ship1)
+    assert board.resolve_shot((1, 0)) is ship1
+    assert board.resolve_shot((1, 1)) is None
+    assert board.ocean_grid()[(1, 0)] == 2
+    assert board.ocean_grid()[(1, 1)] == 3
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_ships_afloat(board_class):
+    ship1 = Ship("Patrol boat", 2, [(0, 0), (1, 0)])
+    ship2 = Ship("Patrol boat", 2, [(0, 1), (1, 1)])
+    board = board_class(8)
+    board.add_ship(ship1)
+    board.add_ship(ship2)
+    assert board.ships_afloat() == 2
+    board.set_new_board_status((0, 0))
+    board.set_new_board_status((1, 0))
+    assert board.ships_afloat() == 1
+
+
+def test_board_grids_are_bytes():
+    board = GameBoard(8)
+    assert board.ocean_grid().dtype == "uint8"
+    assert board.new_memory().dtype == "uint8"
+    assert not hasattr(board, "__dict__")
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_ship_at_many_ships(board_class):
+    board = board_class(20)
+    for y_coordinate in range(20):
+        for x_coordinate in range(15):
+            board.add_ship(Ship("Buoy", 1, [(y_coordinate, x_coordinate)]))
+    assert len(board.fleet()) == 300
+    assert board.ship_at((19, 14)) is board.fleet()[-1]
+    assert board.ship_at((0, 0)) is board.fleet()[0]
+    assert board.ship_at((0, 19)) is None
@@ -0,0 +1,130 @@
+import os
+import numpy as np
+import pytest
+from random import Random
+from game_board import GameBoard
+from game_record import HIT, MISS, SUNK, GameRecordReader
+from game_record import GameRecordWriter, shot_outcome
+from players import BotPlayer
+from ship import Ship
+from simulation import new_bot_player, play_game
+
+
+def test_shot_outcome():
+    ship = Ship("Patrol boat", 2)
+    assert shot_outcome(None, None) == MISS
+    assert shot_outcome(ship, None) == HIT
+    assert shot_outcome(ship, ship) == SUNK
+
+
+def test_write_and_read_game(tmp_path):
+    path = os.path.join(tmp_path, "games.bsgr")
+    board = GameBoard(8)
+    board.add_ship(Ship("Patrol boat", 2, [(3, 4), (2, 4)]))
+    board.add_ship(Ship("Destroyer", 3, [(0, 2), (0, 1), (0, 0)]))
+    with GameRecordWriter(path) as writer:
+        writer.begin_game([board])
+        writer.record_shot(0, (7, 7), MISS)
+        writer.record_shot(0, (3, 4), HIT)
+        writer.record_shot(0, (2, 4), SUNK)
+        writer.end_game()
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 1
+        record = reader.game(0)
+        fleet = record.fleets()[0]
+        assert [each.coordinates() for each in fleet] == \
+            [[(3, 4), (2, 4)], [(0, 2), (0, 1), (0, 0)]]
+        assert fleet[1].name() == "Destroyer"
+        boards, coordinates, outcomes = record.shots()
+        assert list(boards) == [0, 0, 0]
+        assert coordinates.tolist() == [[7, 7], [3, 4], [2, 4]]
+        assert list(outcomes) == [MISS, HIT, SUNK]
+        replayed = record.board_at(0, 2)
+        assert replayed.field_status((7, 7)) == 3
+        assert replayed.field_status((3, 4)) == 2
+        assert replayed.field_status((2, 4)) == 1
+
+
+def test_record_simulated_games(tmp_path):
+    path = os.path.join(tmp_path, "games.bsgr")
+    rng = Random(5)
+    results = []
+    with GameRecordWriter(path) as writer:
+        for _ in range(3):
+            first = new_bot_player(8, rng)
+            second = new_bot_player(8, rng)
+            results.append(play_game(first, second, writer))
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 3
+        for number, result in enumerate(results):
+            record = reader.game(number)
+            boards, _, outcomes = record.shots()
+            assert len(outcomes) == result.shots()
+            loser = 1 - result.winner()
+            lost_board = record.board_at(loser, result.shots())
+            assert lost_board.ships_afloat() == 0
+            assert np.count_nonzero(outcomes[boards == loser] == SUNK) == 5
+
+
+def test_reader_rebuilds_index(tmp_path):
+    path = os.path.join(tmp_path, "games.bsgr")
+    writer = GameRecordWriter(path)
+    for _ in range(2):
+        bot = BotPlayer("Opponent", GameBoard(8), rng=Random(1))
+        bot.opponent_arranges_ships_on_board("uniform")
+        writer.begin_game([bot.game_board()])
+        writer.record_shot(0, (1, 1), MISS)
+        writer.end_game()
+    writer._file.close()
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 2
+        assert len(reader.game(1).shots()[2]) == 1
+
+
+def test_reader_skips_unfinished_game(tmp_path):
+    path = os.path.join(tmp_path, "games.bsgr")
+    writer = GameRecordWriter(path)
+    bot = BotPlayer("Opponent", GameBoard(20), rng=Random(2))
+    bot.opponent_arranges_ships_on_board("uniform")
+    writer.begin_game([bot.game_board()])
+    writer.record_shot(0, (1, 1), MISS)
+    writer.end_game()
+    writer.begin_game([bot.game_board()])
+    for field in range(400):
+        writer.record_shot(0, divmod(field, 20), MISS)
+    writer.flush()
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 1
+        assert len(reader.game(0).shots()[2]) == 1
+    writer._file.close()
+
+
+def test_record_of_many_ships(tmp_path):
+    path = os.path.join(tmp_path, "games.bsgr")
+    board = GameBoard(20)
+    for field in range(300):
+        board.add_ship(Ship("Buoy", 1, [divmod(field, 20)]))
+    with GameRecordWriter(path) as writer:
+        writer.begin_game([board])
+        writer.record_shot(0, (19, 19), MISS)
+    with GameRecordReader(path) as reader:
+        fleet = reader.game(0).fleets()[0]
+        assert len(fleet) == 300
+        assert fleet[-1].coordinates() == [(14, 19)]
+
+
+def test_game_over_limits_is_not_written(tmp_path):
+    path = os.path.join(tmp_path, "games.bsgr")
+    board = GameBoard(8)
+    board.add_ship(Ship("Patrol boat", 2, [(0, 0), (0, 1)]))
+    long_name = GameBoard(8)
+    long_name.add_ship(Ship("Boat" * 100, 2, [(0, 0), (0, 1)]))
+    with GameRecordWriter(path) as writer:
+        writer.begin_game([board])
+        writer.record_shot(0, (0, 0), HIT)
+        with pytest.raises(ValueError):
+            writer.begin_game([board, long_name])
+        writer.record_shot(0, (0, 1), SUNK)
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 1
+        assert len(reader.game(0).shots()[2]) == 2
@@ -0,0 +1,135 @@
+import asyncio
+from random import Random
+from coordinate_codec import encode_coordinate
+from game_server import GameServer, GameSession
+from load_generator import local_load_test
+
+
+def play_until_end(session: GameSession, rng: Random):
+    edge = session.player().game_board().boards_edge()
+    fields = list(range(edge * edge))
+    rng.shuffle(fields)
+    for field in fields:
+        coordinate = encode_coordinate(divmod(field, edge))
+        answer = session.handle(f"FIRE {coordinate}")
+        if answer[-1] != "TURN":
+            return answer
+    return answer
+
+
+def test_session_greeting():
+    session = GameSession(10, Random(0))
+    assert session.greeting() == ["WELCOME 10"]
+
+
+def test_session_place_ships():
+    session = GameSession(10, Random(0))
+    assert session.handle("FIRE A1") == ["ERROR Place your fleet first"]
+    assert session.handle("PLACE A1 right") == ["PLACED Carrier"]
+    assert session.handle("PLACE A1 down")[0].startswith("ERROR")
+    assert session.handle("PLACE A2 r") == ["PLACED Battleship"]
+    answer = session.handle("AUTO")
+    assert answer[-1] == "READY"
+    assert len(session.player().game_board().fleet()) == 5
+
+
+def test_session_custom_fleet():
+    fleet = {f"Ship {number}": 3 for number in range(16)}
+    session = GameSession(7, Random(0), fleet)
+    assert len(session.opponent().game_board().fleet()) == 16
+    assert session.handle("PLACE A1 right") == ["PLACED Ship 0"]
+    answer = session.handle("AUTO")
+    assert answer[-1] == "READY"
+    assert session.player().game_board().occupied_fields().sum() == 48
+
+
+def test_session_auto_place_without_room():
+    session = GameSession(5, Random(0), {"Carrier": 5, "Raft": 1})
+    assert session.handle("PLACE C1 down") == ["PLACED Carrier"]
+    assert session.handle("AUTO") == ["PLACED Raft", "READY"]
+    fleet = {"First": 2, "Second": 2, "Third": 2, "Carrier": 4}
+    session = GameSession(4, Random(0), fleet)
+    for command in ("PLACE A1 down", "PLACE B3 right", "PLACE C4 right"):
+        assert session.handle(command)[0].startswith("PLACED")
+    assert session.handle("AUTO")[0].startswith("ERROR")
+    assert session.handle("FIRE A1") == ["ERROR Place your fleet first"]
+
+
+def test_session_fire():
+    session = GameSession(10, Random(1))
+    session.handle("AUTO")
+    answer = session.handle("fire B2")
+    assert answer[0] in ("MISS", "HIT") or answer[0].startswith("SUNK")
+    assert answer[1].startswith("ENEMY ")
+    assert answer[-1] == "TURN"
+    assert session.handle("FIRE B2")[0].startswith("ERROR")
+    assert session.handle("FIRE Z99")[0].startswith("ERROR")
+
+
+def test_session_plays_whole_game():
+    session = GameSession(10, Random(2))
+    session.handle("AUTO")
+    answer = play_until_end(session, Random(3))
+    assert answer[-1] in ("WIN", "LOSE")
+    assert session.finished()
+    assert session.handle("FIRE A1") == ["ERROR Unknown command"]
+
+
+def test_session_board_and_quit():
+    session = GameSession(8, Random(0))
+    answer = session.handle("BOARD")
+    assert answer[0] == "Opponent's Ocean Grid"
+    assert answer[-1] == "END"
+    assert session.handle("QUIT") == ["BYE"]
+    assert session.finished()
+
+
+def test_server_hosts_concurrent_sessions():
+    report = asyncio.run(local_load_test(8, clients=10, sessions=20, seed=4))
+    assert report.sessions() == 20
+    assert report.moves() > 0
+    assert report.latency_percentile(99) >= report.latency_percentile(50)
+
+
+def test_server_over_tcp():
+    async def session():
+        server = GameServer(8, seed=5)
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        greeting = await reader.readline()
+        writer.write(b"QUIT\n")
+        goodbye = await reader.readline()
+        writer.close()
+        await server.close()
+        return greeting, goodbye, server.sessions()
+    assert asyncio.run(session()) == (b"WELCOME 8\n", b"BYE\n", 1)
+
+
+def test_server_closes_session_when_fleet_does_not_fit():
+    async def session():
+        server = GameServer(3, seed=5, fleet={"Carrier": 5})
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        answer = await reader.readline()
+        closed = await reader.readline()
+        writer.close()
+        await server.close()
+        return answer, closed
+    answer, closed = asyncio.run(session())
+    assert answer.startswith(b"ERROR")
+    assert closed == b""
+
+
+def test_server_closes_session_after_too_long_line():
+    async def session():
+        server = GameServer(8, seed=5)
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readline()
+        writer.write(b"FIRE " + b"A" * 100000 + b"\n")
+        answer = await reader.readline()
+        closed = await reader.readline()
+        writer.close()
+        await server.close()
+        return answer, closed
+    assert asyncio.run(session()) == (b"ERROR Line is too long\n", b"")
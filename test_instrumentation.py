@@ -0,0 +1,108 @@
+import json
+import time
+from random import Random
+import instrumentation
+from game_board import GameBoard
+from instrumentation import LatencyHistogram, Metrics, get_metrics
+from players import BotPlayer, HumanPlayer
+from simulation import simulate_bot_game
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(1e-6)
+    histogram.record(1e-3)
+    histogram.record(1e-3)
+    assert histogram.count() == 100
+    assert 1e-6 <= histogram.percentile(50) < 1.2e-6
+    assert 1e-3 <= histogram.percentile(99) < 1.2e-3
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_enable_and_disable():
+    original = BotPlayer.attack_player
+    get_metrics().reset()
+    instrumentation.enable()
+    try:
+        assert instrumentation.ENABLED
+        assert BotPlayer.attack_player is not original
+        simulate_bot_game(10, seed=3)
+    finally:
+        instrumentation.disable()
+    assert not instrumentation.ENABLED
+    assert BotPlayer.attack_player is original
+    snapshot = get_metrics().snapshot()
+    attack = snapshot["methods"]["BotPlayer.attack_player"]
+    assert attack["calls"] > 0
+    assert 0 < attack["p50"] <= attack["p95"] <= attack["p99"]
+    assert "GameBoard.resolve_shot" in snapshot["methods"]
+    assert "Player.has_lost" in snapshot["methods"]
+
+
+def test_reset_while_enabled():
+    get_metrics().reset()
+    instrumentation.enable({"BotPlayer": ("attack_player",)})
+    try:
+        simulate_bot_game(10, seed=3)
+        get_metrics().reset()
+        simulate_bot_game(10, seed=3)
+    finally:
+        instrumentation.disable()
+    snapshot = get_metrics().snapshot()
+    assert snapshot["methods"]["BotPlayer.attack_player"]["calls"] > 0
+
+
+def test_disabled_instrumentation_records_nothing():
+    get_metrics().reset()
+    simulate_bot_game(10, seed=4)
+    assert get_metrics().snapshot() == {"methods": {}, "counters": {}}
+
+
+def test_retries_counted():
+    get_metrics().reset()
+    instrumentation.enable({"BotPlayer": ("choose_new_hit",)})
+    try:
+        for seed in range(5):
+            simulate_bot_game(10, seed=seed)
+    finally:
+        instrumentation.disable()
+    assert get_metrics().counter("BotPlayer.choose_new_hit.retries") > 0
+
+
+def test_exports():
+    metrics = Metrics()
+    metrics.histogram("BotPlayer.attack_player").record(2e-6)
+    metrics.count("BotPlayer.based_on_hit_memory.retries", 3)
+    snapshot = json.loads(metrics.to_json())
+    assert snapshot["methods"]["BotPlayer.attack_player"]["calls"] == 1
+    text = metrics.to_prometheus()
+    assert "# TYPE battleships_method_latency_seconds summary" in text
+    assert ('battleships_method_latency_seconds_count'
+            '{method="BotPlayer.attack_player"} 1') in text
+    assert ('battleships_events_total'
+            '{event="BotPlayer.based_on_hit_memory.retries"} 3') in text
+    assert 'quantile="0.99"' in text
+
+
+def test_deadline_metrics():
+    bot = BotPlayer("Opponent", GameBoard(4), [(0, 0)], Random(0))
+    for coordinate in [(0, 0), (0, 1), (1, 0)]:
+        bot.remove_coordinate_from_memory(coordinate)
+    get_metrics().reset()
+    instrumentation.enable()
+    try:
+        bot.choose_shot(HumanPlayer("Gosia", GameBoard(4)),
+                        time.perf_counter() + 10)
+        bot.choose_shot(HumanPlayer("Gosia", GameBoard(4)),
+                        time.perf_counter() - 1)
+    finally:
+        instrumentation.disable()
+    metrics = get_metrics()
+    assert metrics.counter("BotPlayer.choose_shot.moves") == 2
+    assert metrics.counter("BotPlayer.choose_shot.cutoffs") == 1
+    assert metrics.counter("BotPlayer.choose_shot.deadline_misses") == 1
+    assert metrics.counter("BotPlayer.refine_shots.retries") == 4
+    assert metrics.counter("BotPlayer.choose_shot.depth") == 0
+    snapshot = metrics.snapshot()
+    assert snapshot["methods"]["BotPlayer.choose_shot"]["calls"] == 2
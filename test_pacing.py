@@ -0,0 +1,25 @@
+import game_interface
+from pacing import FastClock, get_clock, pause, set_clock
+
+
+def test_fast_clock_doesnt_wait():
+    clock = FastClock()
+    previous_clock = set_clock(clock)
+    try:
+        pause(10)
+        pause(0.5)
+        assert get_clock() is clock
+    finally:
+        set_clock(previous_clock)
+    assert clock.slept() == 10.5
+
+
+def test_game_messages_use_clock(capsys):
+    clock = FastClock()
+    previous_clock = set_clock(clock)
+    try:
+        game_interface.new_turn_separator()
+    finally:
+        set_clock(previous_clock)
+    assert capsys.readouterr().out == "*" * 80 + "\n"
+    assert clock.slept() > 0
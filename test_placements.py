@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+from game_board import GameBoard
+from placements import layout_ships, placement_table
+from placements import placement_coordinates, placements_count
+from placements import random_fleet_layouts
+from ship import naval_fleet
+
+
+def test_placement_table_size():
+    table = placement_table(10, 5)
+    assert len(table) == 2 * 10 * 6
+    assert table.horizontal_count() == 60
+    assert table.cells().shape == (120, 5)
+
+
+def test_placement_table_is_cached():
+    assert placement_table(8, 3) is placement_table(8, 3)
+
+
+def test_ship_longer_than_edge():
+    table = placement_table(3, 4)
+    assert len(table) == 0
+    assert table.placement_index((0, 0), True) is None
+
+
+def test_placement_index():
+    table = placement_table(8, 3)
+    horizontal = table.placement_index((2, 5), True)
+    vertical = table.placement_index((5, 2), False)
+    assert table.coordinates(horizontal) == [(2, 5), (2, 6), (2, 7)]
+    assert table.coordinates(vertical) == [(5, 2), (6, 2), (7, 2)]
+    assert table.is_horizontal(horizontal)
+    assert not table.is_horizontal(vertical)
+    assert table.placement_index((2, 6), True) is None
+    assert table.placement_index((6, 2), False) is None
+
+
+def test_legal():
+    table = placement_table(4, 2)
+    occupied = np.zeros(16, dtype=bool)
+    occupied[5] = True
+    legal = table.legal(occupied)
+    assert np.count_nonzero(~legal) == 4
+    assert not table.legal(occupied, np.array(
+        [table.placement_index((1, 0), True)]))[0]
+
+
+def test_random_fleet_layouts():
+    layouts = random_fleet_layouts(8, 50, rng=0)
+    assert layouts.shape == (50, len(naval_fleet))
+    for layout in layouts:
+        board = GameBoard(8)
+        for ship in layout_ships(8, layout):
+            board.add_ship(ship)
+        assert np.count_nonzero(board.ocean_grid()) == \
+            sum(naval_fleet.values())
+
+
+def test_random_fleet_layouts_are_reproducible():
+    first = random_fleet_layouts(8, 10, rng=3)
+    second = random_fleet_layouts(8, 10, rng=3)
+    assert (first == second).all()
+
+
+def test_random_fleet_layouts_redraw_dead_ends():
+    for ships in (6, 7):
+        fleet = {f"Submarine {number}": 3 for number in range(ships)}
+        layouts = random_fleet_layouts(5, 200, fleet, rng=0)
+        for layout in layouts:
+            board = GameBoard(5)
+            for ship in layout_ships(5, layout, fleet):
+                board.add_ship(ship)
+            assert np.count_nonzero(board.ocean_grid()) == 3 * ships
+
+
+def test_random_fleet_layouts_impossible_fleet():
+    with pytest.raises(ValueError):
+        random_fleet_layouts(3, 1, {"Carrier": 5})
+
+
+def test_covering_field():
+    table = placement_table(5, 3)
+    for cell in (0, 7, 24):
+        expected = [placement for placement in range(len(table))
+                    if cell in table.cells()[placement]]
+        assert sorted(table.covering_field(cell)) == expected
+
+
+def test_placement_coordinates_match_table():
+    for boards_edge, ship_size in ((6, 3), (10, 5), (7, 1)):
+        table = placement_table(boards_edge, ship_size)
+        assert placements_count(boards_edge, ship_size) == len(table)
+        for placement in range(len(table)):
+            assert placement_coordinates(
+                boards_edge, ship_size, placement) == \
+                table.coordinates(placement)
@@ -1,6 +1,10 @@
+import time
+from random import Random
+import pytest
 from game_board import GameBoard
+import players
 from players import BotPlayer, HumanPlayer, Player
-from ship import Ship
+from ship import Ship, naval_fleet
 
 
 def test_init_player():
@@ -139,3 +143,191 @@ def test_remove_from_hits_memory_empty():
     opponent.add_to_hit_memory(hit3)
     opponent.remove_from_hits_memory(humans_ship)
     assert len(opponent.hits_memory()) == 0
+
+
+def test_ship_hull_placement():
+    ship = Ship("Patrol boat", 2, [(0, 2), (1, 2)])
+    board = GameBoard(8)
+    board.add_ship(ship)
+    player = Player("Gosia", board)
+    positions = player.ship_hull_placement((0, 1), 3)
+    assert positions == {"down": [(0, 1), (1, 1), (2, 1)]}
+
+
+def test_opponent_random_ship_placement():
+    board = GameBoard(3)
+    board.add_ship(Ship("Destroyer", 3, [(0, 0), (0, 1), (0, 2)]))
+    board.add_ship(Ship("Destroyer", 3, [(1, 0), (1, 1), (1, 2)]))
+    opponent = BotPlayer("Przeciwnik", board)
+    placement = opponent.opponent_random_ship_placement(3)
+    assert placement == [(2, 0), (2, 1), (2, 2)]
+    assert opponent.opponent_random_ship_placement(4) is None
+
+
+def test_opponent_arranges_ships_uniformly():
+    board = GameBoard(8)
+    opponent = BotPlayer("Przeciwnik", board)
+    opponent.opponent_arranges_ships_on_board("uniform")
+    assert len(board.fleet()) == 5
+    assert board.occupied_fields().sum() == 17
+
+
+def test_player_fleet():
+    assert Player("Gosia", GameBoard(8)).fleet() == naval_fleet
+    fleet = {"Raft": 1}
+    assert Player("Gosia", GameBoard(8), fleet).fleet() == fleet
+
+
+def test_opponent_arranges_custom_fleet_with_solver():
+    fleet = {f"Ship {number}": 3 for number in range(16)}
+    board = GameBoard(7)
+    opponent = BotPlayer("Przeciwnik", board, rng=Random(0), fleet=fleet)
+    opponent.opponent_arranges_ships_on_board("solver")
+    assert len(board.fleet()) == 16
+    assert board.occupied_fields().sum() == 48
+
+
+def test_solver_placement_of_impossible_fleet():
+    fleet = {f"Ship {number}": 4 for number in range(9)}
+    opponent = BotPlayer("Przeciwnik", GameBoard(6), fleet=fleet)
+    with pytest.raises(ValueError):
+        opponent.opponent_arranges_ships_on_board("solver")
+
+
+def test_default_placement_of_fleet_that_does_not_fit():
+    opponent = BotPlayer("Przeciwnik", GameBoard(4), rng=Random(0))
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        opponent.opponent_arranges_ships_on_board()
+    assert time.perf_counter() - start < 1
+
+
+def test_default_placement():
+    assert BotPlayer("Przeciwnik", GameBoard(10)).default_placement() \
+        == "solver"
+    assert BotPlayer("Przeciwnik", GameBoard(2000)).default_placement() \
+        == "random"
+    fleet = {f"Ship {number}": 1500 for number in range(2)}
+    assert BotPlayer("Przeciwnik", GameBoard(2000),
+                     fleet=fleet).default_placement() == "solver"
+
+
+def test_random_untried_coordinate():
+    board = GameBoard(2)
+    opponent = BotPlayer("Przeciwnik", board)
+    for coordinate in [(0, 0), (0, 1), (1, 1)]:
+        opponent.remove_coordinate_from_memory(coordinate)
+    assert opponent.random_untried_coordinate() == (1, 0)
+
+
+def test_human_player_place_ship():
+    board = GameBoard(8)
+    player = HumanPlayer("Gosia", board)
+    assert player.place_ship("Destroyer", (0, 0), "right")
+    assert board.field_status((0, 1)) == 1
+    assert not player.place_ship("Submarine", (0, 1), "down")
+    assert not player.place_ship("Submarine", (7, 7), "right")
+
+
+def test_human_player_places_custom_ship():
+    player = HumanPlayer("Gosia", GameBoard(8), {"Raft": 1})
+    assert player.place_ship("Raft", (4, 4), "up")
+    assert player.game_board().field_status((4, 4)) == 1
+
+
+def test_human_player_fire_at():
+    board = GameBoard(8)
+    board.add_ship(Ship("Destroyer", 2, [(0, 0), (0, 1)]))
+    player = HumanPlayer("Gosia", GameBoard(8))
+    opponent = BotPlayer("Bot", board)
+    _, damaged_ship, shipwreck, loser = player.fire_at(opponent, (0, 0))
+    assert damaged_ship.name() == "Destroyer"
+    assert shipwreck is None
+    _, _, shipwreck, loser = player.fire_at(opponent, (0, 1))
+    assert shipwreck.name() == "Destroyer"
+    assert loser == opponent
+    assert player.chosen_before_coordinate((0, 1))
+
+
+def test_random_ship_placement_on_huge_board():
+    board = GameBoard(1000)
+    board.add_ship(Ship("Carrier", 5, [(0, x) for x in range(5)]))
+    player = Player("Gosia", board)
+    rng = Random(0)
+    for _ in range(50):
+        coordinates = player.random_ship_placement(4, rng)
+        assert len(coordinates) == 4
+        assert player.placement_fits(coordinates)
+
+
+def test_bot_on_huge_board():
+    bot = BotPlayer("Opponent", GameBoard(2000), rng=Random(0))
+    bot.opponent_arranges_ships_on_board()
+    assert len(bot.game_board().fleet()) == 5
+    opponent = BotPlayer("Opponent", GameBoard(2000), rng=Random(1))
+    opponent.opponent_arranges_ships_on_board("uniform")
+    for _ in range(100):
+        bot.attack_player(opponent)
+    assert int(bot.memory().sum()) == 100
+
+
+def test_choose_shot_near_hit():
+    bot = BotPlayer("Opponent", GameBoard(8), [(4, 4)], Random(0))
+    bot.remove_coordinate_from_memory((4, 4))
+    player = HumanPlayer("Gosia", GameBoard(8))
+    shot = bot.choose_shot(player, time.perf_counter() + 1)
+    assert shot in [(4, 3), (4, 5), (3, 4), (5, 4)]
+
+
+def test_choose_shot_when_no_neighbour_is_eligible():
+    # all the fields around the hit have been chosen, so the refinement
+    # ends after four directions with the fallback shot
+    bot = BotPlayer("Opponent", GameBoard(4), [(0, 0)], Random(0))
+    for coordinate in [(0, 0), (0, 1), (1, 0)]:
+        bot.remove_coordinate_from_memory(coordinate)
+    player = HumanPlayer("Gosia", GameBoard(4))
+    start = time.perf_counter()
+    shot = bot.choose_shot(player, start + 10)
+    assert time.perf_counter() - start < 0.5
+    assert not bot.chosen_before_coordinate(shot)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+
+class SlowBotPlayer(BotPlayer):
+    # each step of the refinement takes 50 ms of the clock
+    def refine_shots(self, player, deadline):
+        while True:
+            self.clock.now += 0.05
+            self.steps += 1
+            yield None
+
+
+def test_choose_shot_does_not_start_late_step(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(players, "time", clock)
+    bot = SlowBotPlayer("Opponent", GameBoard(4), rng=Random(0))
+    bot.clock = clock
+    bot.steps = 0
+    player = HumanPlayer("Gosia", GameBoard(4))
+    bot.choose_shot(player, 0.12)
+    assert bot.steps == 2
+    assert clock.now < 0.12
+
+
+def test_attack_player_with_time_budget():
+    board = GameBoard(4)
+    board.add_ship(Ship("Destroyer", 2, [(0, 0), (0, 1)]))
+    player = Player("Gosia", board)
+    bot = BotPlayer("Opponent", GameBoard(4), rng=Random(0))
+    shots = 0
+    while not player.has_lost():
+        bot.attack_player(player, time_budget=0.01)
+        shots += 1
+    assert shots <= 16
@@ -0,0 +1,88 @@
+import io
+from game_board import GameBoard
+from pacing import FastClock, set_clock
+from players import BotPlayer, HumanPlayer
+from renderer import BoardRenderer, board_symbols, field_screen_position
+from renderer import render_frame, set_renderer, viewport_window
+from ship import Ship
+
+
+def small_board():
+    board = GameBoard(3)
+    board.add_ship(Ship("Patrol boat", 2, [(0, 0), (0, 1)]))
+    board.set_new_board_status((0, 0))
+    board.set_new_board_status((2, 2))
+    return board
+
+
+def test_render_frame():
+    frame = render_frame("Gosia's Ocean Grid",
+                         board_symbols(small_board(), True))
+    assert frame == (
+        "Gosia's Ocean Grid\n"
+        "\n"
+        "    A  B  C \n"
+        " 1  X  #  .\n"
+        " 2  .  .  .\n"
+        " 3  .  .  O\n"
+    )
+
+
+def test_render_frame_hides_ships():
+    frame = render_frame("Opponent's Ocean Grid",
+                         board_symbols(small_board(), False))
+    assert " 1  X  .  .\n" in frame
+
+
+def test_graphic_rep_writes_once():
+    stream = io.StringIO()
+    previous_renderer = set_renderer(BoardRenderer(stream))
+    previous_clock = set_clock(FastClock())
+    try:
+        HumanPlayer("Gosia", small_board()).graphic_rep()
+        BotPlayer("Opponent", small_board()).graphic_rep()
+    finally:
+        set_renderer(previous_renderer)
+        set_clock(previous_clock)
+    assert stream.getvalue().count("Ocean Grid") == 2
+
+
+def test_live_renderer_redraws_changed_fields():
+    stream = io.StringIO()
+    renderer = BoardRenderer(stream, live=True, frame_pause=0)
+    board = small_board()
+    renderer.draw(board, "Grid", True)
+    stream.truncate(0)
+    stream.seek(0)
+    board.set_new_board_status((1, 1))
+    renderer.draw(board, "Grid", True)
+    line, column = field_screen_position(1, 1, 1)
+    assert stream.getvalue() == f"\x1b[{line};{column}HO\x1b[8;1H"
+
+
+def test_viewport_window():
+    assert viewport_window(10, 26) == (0, 0, 10, 10)
+    assert viewport_window(100, 20) == (0, 0, 20, 20)
+    assert viewport_window(100, 20, (50, 95)) == (40, 80, 20, 20)
+
+
+def test_render_frame_window_labels():
+    board = GameBoard(40)
+    board.set_new_board_status((29, 27))
+    window = (25, 25, 5, 5)
+    frame = render_frame("Grid", board_symbols(board, True, window), 25, 25)
+    lines = frame.splitlines()
+    assert lines[2] == "     Z  AA  AB  AC  AD "
+    assert lines[7] == "30   .   .   O   .   ."
+    line, column = field_screen_position(1, 4, 2, 2, 2)
+    assert lines[line - 1][column - 1] == "O"
+
+
+def test_renderer_draws_only_window():
+    stream = io.StringIO()
+    renderer = BoardRenderer(stream, frame_pause=0, viewport_edge=8)
+    board = GameBoard(1000)
+    renderer.draw(board, "Grid", True, focus=(500, 500))
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "Grid (rows 497-504, columns SC-SJ)"
+    assert len(lines) == 3 + 8
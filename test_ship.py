@@ -8,7 +8,7 @@ def test_init_ship_default():
     assert new_ship.name() == "Carrier"
     assert new_ship._size == 5
     assert new_ship.size() == 5
-    assert new_ship._coordinates == []
+    assert new_ship.coordinates() == []
     assert new_ship._afloat is True
 
 
@@ -51,3 +51,28 @@ def test_is_it_afloat_missed_hit():
     hit1 = (0, 2)
     board.set_new_board_status(hit1)
     assert ship.is_it_afloat(board) is True
+
+
+def test_register_hit():
+    ship = Ship("Patrol boat", 2, [(0, 1), (1, 1)])
+    assert ship.hit_points() == 2
+    assert ship.register_hit() == 1
+    assert ship.register_hit() == 0
+    assert ship.is_it_afloat() is False
+    assert ship._afloat is False
+
+
+def test_is_it_afloat_repeated_hit():
+    ship = Ship("Patrol boat", 2, [(0, 1), (1, 1)])
+    board = GameBoard(3, [ship])
+    board.set_new_board_status((0, 1))
+    board.set_new_board_status((0, 1))
+    assert ship.hit_points() == 1
+    assert ship.is_it_afloat(board) is True
+
+
+def test_ship_coordinates_packed():
+    new_ship = Ship("Destroyer", 3, [(1, 2), (1, 3), (1, 4)])
+    assert new_ship.coordinates() == [(1, 2), (1, 3), (1, 4)]
+    assert len(new_ship._coordinates) == 6
+    assert not hasattr(new_ship, "__dict__")
@@ -0,0 +1,47 @@
+from random import Random
+from game_board import GameBoard
+from players import BotPlayer
+from ship import Ship, naval_fleet
+from simulation import GameResult, new_bot_player, play_game
+from simulation import simulate_bot_game
+
+
+def test_simulate_bot_game():
+    result = simulate_bot_game(8)
+    loser = 1 - result.winner()
+    assert result.winner() in (0, 1)
+    assert len(result.sink_turns()[loser]) == len(naval_fleet)
+    assert None not in result.sink_turns()[loser]
+    assert result.shots() >= sum(naval_fleet.values())
+
+
+def test_new_bot_player_arranges_fleet():
+    bot = new_bot_player(10)
+    assert len(bot.game_board().fleet()) == len(naval_fleet)
+
+
+def test_new_bot_player_places_custom_fleet_with_solver():
+    fleet = {f"Submarine {number}": 3 for number in range(7)}
+    bot = new_bot_player(5, Random(0), fleet=fleet)
+    assert bot.game_board().occupied_fields().sum() == 21
+
+
+def test_play_game_sink_turns():
+    first_board = GameBoard(3)
+    first_board.add_ship(Ship("Patrol boat", 2, [(0, 0), (0, 1)]))
+    second_board = GameBoard(3)
+    second_board.add_ship(Ship("Patrol boat", 2, [(2, 1), (2, 2)]))
+    first_bot = BotPlayer("Opponent", first_board)
+    second_bot = BotPlayer("Opponent", second_board)
+    result = play_game(first_bot, second_bot)
+    loser = 1 - result.winner()
+    assert result.sink_turns()[loser][0] == result.turns()
+    assert result.sink_turns()[result.winner()][0] is None
+
+
+def test_game_result_getters():
+    result = GameResult(1, 40, ((3, None), (5, 20)))
+    assert result.winner() == 1
+    assert result.shots() == 40
+    assert result.turns() == 20
+    assert result == GameResult(1, 40, ((3, None), (5, 20)))
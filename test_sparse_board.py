@@ -0,0 +1,102 @@
+import numpy as np
+from game_board import GameBoard
+from players import BotPlayer, Player
+from ship import Ship
+from simulation import play_game
+from sparse_board import SparseGameBoard, SparseMemory
+
+
+def test_sparse_memory():
+    memory = SparseMemory(100000)
+    memory[(99999, 5)] = 1
+    assert memory[(99999, 5)] == 1
+    assert memory[(5, 99999)] == 0
+    assert len(memory) == 1
+    memory[(99999, 5)] = 0
+    assert len(memory) == 0
+
+
+def test_player_gets_sparse_memory():
+    player = Player("Gosia", SparseGameBoard(8))
+    new_memory = player.remove_coordinate_from_memory((0, 0))
+    assert isinstance(new_memory, SparseMemory)
+    assert player.chosen_before_coordinate((0, 0)) is True
+    assert player.chosen_before_coordinate((0, 1)) is False
+
+
+def test_sparse_board_matches_numpy_board():
+    coordinates = [(0, 0), (1, 0)]
+    numpy_board = GameBoard(4, [Ship("Patrol boat", 2, list(coordinates))])
+    sparse_board = SparseGameBoard(
+        4, [Ship("Patrol boat", 2, list(coordinates))])
+    for shot in [(0, 0), (2, 2), (0, 0), (1, 0)]:
+        numpy_board.set_new_board_status(shot)
+        sparse_board.set_new_board_status(shot)
+    assert (sparse_board.ocean_grid() == numpy_board.ocean_grid()).all()
+    assert (sparse_board.occupied_fields() ==
+            numpy_board.occupied_fields()).all()
+    assert sparse_board.field_status((2, 2)) == 3
+    assert sparse_board.ships_afloat() == 0
+
+
+def test_repeated_hit_takes_one_hit_point():
+    board = SparseGameBoard(8)
+    board.add_ship(Ship("Patrol boat", 2, [(3, 3), (3, 4)]))
+    assert board.resolve_shot((3, 3)).name() == "Patrol boat"
+    board.resolve_shot((3, 3))
+    assert board.ships_afloat() == 1
+    assert board.resolve_shot((3, 5)) is None
+    assert board.hits() == {(3, 3)}
+    assert board.misses() == {(3, 5)}
+
+
+def test_ocean_window():
+    board = SparseGameBoard(100000)
+    board.add_ship(Ship("Patrol boat", 2, [(50000, 70000), (50001, 70000)]))
+    board.resolve_shot((50001, 70000))
+    board.resolve_shot((50002, 70001))
+    window = board.ocean_window(50000, 69999, 3, 3)
+    assert window.tolist() == [[0, 1, 0], [0, 2, 0], [0, 0, 3]]
+    assert window.dtype == np.uint8
+
+
+def test_numpy_board_window():
+    board = GameBoard(8)
+    board.add_ship(Ship("Patrol boat", 2, [(3, 3), (3, 4)]))
+    assert board.ocean_window(3, 4, 2, 2).tolist() == [[1, 0], [0, 0]]
+
+
+def test_placement_rules_on_sparse_board():
+    players = [Player("Gosia", GameBoard(8)),
+               Player("Gosia", SparseGameBoard(8))]
+    for player in players:
+        player.game_board().add_ship(
+            Ship("Patrol boat", 2, [(3, 3), (3, 4)]))
+    for bow in [(3, 2), (3, 5), (2, 3), (0, 0), (7, 7)]:
+        numpy_positions, sparse_positions = (
+            player.ship_hull_placement(bow, 3) for player in players)
+        assert sparse_positions == numpy_positions
+    assert "right" not in players[1].ship_hull_placement((3, 2), 2)
+
+
+def test_bot_on_huge_sparse_board():
+    bot = BotPlayer("Opponent", SparseGameBoard(100000))
+    bot.opponent_arranges_ships_on_board()
+    target = Player("Gosia", SparseGameBoard(100000))
+    target.game_board().add_ship(Ship("Patrol boat", 2, [(0, 0), (0, 1)]))
+    for _ in range(100):
+        bot.attack_player(target)
+    assert len(bot.memory()) == 100
+    board = target.game_board()
+    assert len(board.hits()) + len(board.misses()) == 100
+    assert len(bot.game_board().fleet()) == 5
+
+
+def test_sparse_board_game():
+    first_bot = BotPlayer("Opponent", SparseGameBoard(8))
+    second_bot = BotPlayer("Opponent", SparseGameBoard(8))
+    first_bot.opponent_arranges_ships_on_board()
+    second_bot.opponent_arranges_ships_on_board()
+    result = play_game(first_bot, second_bot)
+    loser = (first_bot, second_bot)[1 - result.winner()]
+    assert loser.has_lost()
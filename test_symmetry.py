@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from game_board import GameBoard
+from placements import layout_ships, random_fleet_layouts
+from ship import Ship
+from symmetry import canonical_grids, canonical_layouts, field_permutations
+from symmetry import SYMMETRY_BLOCK_BYTES, grids_block_size
+from symmetry import fleet_key, grid_key, layout_keys
+from symmetry import placement_permutations
+
+
+def transformed_board(board: GameBoard, symmetry: int):
+    edge = board.boards_edge()
+    images = np.argsort(field_permutations(edge)[symmetry])
+    transformed = GameBoard(edge)
+    for each_ship in board.fleet():
+        coordinates = [divmod(int(images[y * edge + x]), edge)
+                       for y, x in each_ship.coordinates()]
+        transformed.add_ship(Ship(each_ship.name(), each_ship.size(),
+                                  coordinates))
+    return transformed
+
+
+def test_field_permutations():
+    permutations = field_permutations(4)
+    assert len({tuple(each) for each in permutations.tolist()}) == 8
+    assert permutations[0].tolist() == list(range(16))
+    grid = np.arange(16).reshape(4, 4)
+    assert (grid.ravel()[permutations[1]] == np.rot90(grid).ravel()).all()
+
+
+def test_placement_permutations():
+    permutations = placement_permutations(5, 3)
+    for row in permutations:
+        assert sorted(row.tolist()) == list(range(30))
+    raft = placement_permutations(3, 1)
+    assert raft.max() < 9
+
+
+def test_orbits_of_one_ship():
+    keys = layout_keys(3, np.arange(12)[:, None], {"Destroyer": 2})
+    # ships touching a corner and ships touching the centre
+    assert len(set(keys.tolist())) == 2
+
+
+def test_fleet_key_of_symmetric_boards():
+    board = GameBoard(6)
+    board.add_ship(Ship("Destroyer", 3, [(0, 1), (0, 2), (0, 3)]))
+    board.add_ship(Ship("Patrol boat", 2, [(2, 4), (3, 4)]))
+    board.add_ship(Ship("Raft", 1, [(5, 0)]))
+    keys = {fleet_key(transformed_board(board, symmetry))
+            for symmetry in range(8)}
+    assert len(keys) == 1
+    other = GameBoard(6)
+    other.add_ship(Ship("Destroyer", 3, [(1, 1), (1, 2), (1, 3)]))
+    other.add_ship(Ship("Patrol boat", 2, [(2, 4), (3, 4)]))
+    other.add_ship(Ship("Raft", 1, [(5, 0)]))
+    assert fleet_key(other) not in keys
+
+
+def test_interchangeable_ships():
+    fleet = {"Submarine": 3, "Cruiser": 3}
+    first = canonical_layouts(5, [[4, 20]], fleet)
+    second = canonical_layouts(5, [[20, 4]], fleet)
+    assert (first == second).all()
+
+
+def test_bulk_keys_match_board_keys():
+    layouts = random_fleet_layouts(10, 300, rng=0)
+    keys = layout_keys(10, layouts)
+    for layout, key in zip(layouts[:20], keys[:20]):
+        board = GameBoard(10, layout_ships(10, layout))
+        assert fleet_key(board) == key
+        for symmetry in (3, 6):
+            assert fleet_key(transformed_board(board, symmetry)) == key
+    assert len(set(keys.tolist())) == 300
+
+
+def test_keys_too_big():
+    with pytest.raises(ValueError):
+        layout_keys(300, [[0, 0, 0, 0, 0]])
+
+
+def test_grid_keys():
+    board = GameBoard(5)
+    board.add_ship(Ship("Destroyer", 3, [(0, 0), (0, 1), (0, 2)]))
+    board.resolve_shot((0, 1))
+    board.resolve_shot((4, 3))
+    grid = board.ocean_grid()
+    variants = [np.rot90(grid, turns) for turns in range(4)]
+    variants += [np.rot90(grid.T, turns) for turns in range(4)]
+    assert len({grid_key(variant) for variant in variants}) == 1
+    canonical = canonical_grids(np.stack(variants))
+    assert (canonical == canonical[0]).all()
+    assert grid_key(grid) != grid_key(GameBoard(5).ocean_grid())
+    density = np.random.default_rng(0).random((4, 4))
+    assert grid_key(density) == grid_key(density.T)
+
+
+def test_grids_block_size_counts_bytes():
+    block_size = grids_block_size(30, 8)
+    assert 1 <= block_size * 8 * 30 * 30 * 8 <= SYMMETRY_BLOCK_BYTES
+    assert grids_block_size(30, 1) == 8 * block_size
+    assert grids_block_size(10000, 8) == 1
+    grids = np.random.default_rng(0).random((2 * block_size + 1, 30, 30))
+    canonical = canonical_grids(grids)
+    assert (canonical[-1] == canonical_grids(grids[-1:])[0]).all()
@@ -0,0 +1,40 @@
+from tournament import TournamentSummary, game_seed, replay_game
+from tournament import run_tournament
+from simulation import GameResult, simulate_bot_game
+
+
+def test_game_seed_differs_between_games():
+    assert game_seed(0, 1) != game_seed(0, 2)
+    assert game_seed(1, 0) != game_seed(0, 0)
+
+
+def test_seeded_game_is_reproducible():
+    assert simulate_bot_game(8, 7) == simulate_bot_game(8, 7)
+
+
+def test_run_tournament_single_worker():
+    summary = run_tournament(6, 8, base_seed=3, workers=1,
+                             chunk_size=4, keep_results=True)
+    assert summary.games() == 6
+    assert sum(summary.wins()) == 6
+    assert len(summary.results()) == 6
+    assert summary.results()[5] == replay_game(5, 8, base_seed=3)
+
+
+def test_run_tournament_process_pool():
+    single = run_tournament(8, 8, base_seed=1, workers=1, keep_results=True)
+    pooled = run_tournament(8, 8, base_seed=1, workers=2, chunk_size=3,
+                            keep_results=True)
+    assert pooled.results() == single.results()
+    assert pooled.total_shots() == single.total_shots()
+
+
+def test_summary_merge():
+    summary = TournamentSummary()
+    summary.add_result(GameResult(0, 40, ((), ())))
+    other = TournamentSummary()
+    other.add_result(GameResult(1, 60, ((), ())))
+    summary.merge(other)
+    assert summary.games() == 2
+    assert summary.wins() == [1, 1]
+    assert summary.mean_shots() == 50
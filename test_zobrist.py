@@ -0,0 +1,71 @@
+from random import Random
+from bitboard import BitGameBoard
+from game_board import GameBoard
+from players import BotPlayer, Player
+from ship import Ship
+from sparse_board import SparseGameBoard
+from zobrist import CHOSEN, grid_hash, splitmix64, zobrist_key
+
+
+def fleet():
+    return [Ship("Destroyer", 3, [(1, 1), (1, 2), (1, 3)]),
+            Ship("Patrol boat", 2, [(4, 0), (5, 0)])]
+
+
+def test_splitmix64():
+    assert splitmix64(0) == 0xE220A8397B1DCDAF
+
+
+def test_zobrist_keys():
+    assert zobrist_key(7, 0) == 0
+    keys = {zobrist_key(field, status)
+            for field in range(100) for status in range(1, CHOSEN + 1)}
+    assert len(keys) == 400
+
+
+def test_board_hash_follows_changes():
+    for board_class in (GameBoard, BitGameBoard, SparseGameBoard):
+        board = board_class(6, fleet())
+        assert board.zobrist_hash() == grid_hash(board.ocean_grid())
+        for shot in [(1, 1), (0, 0), (1, 1), (0, 0), (5, 0)]:
+            board.set_new_board_status(shot)
+            assert board.zobrist_hash() == grid_hash(board.ocean_grid())
+
+
+def test_board_hash_is_the_same_for_all_boards():
+    hashes = set()
+    for board_class in (GameBoard, BitGameBoard, SparseGameBoard):
+        board = board_class(6)
+        for each_ship in fleet():
+            board.add_ship(each_ship)
+        for shot in [(4, 0), (3, 3), (1, 2)]:
+            board.resolve_shot(shot)
+        hashes.add(board.zobrist_hash())
+    assert len(hashes) == 1
+
+
+def test_order_of_shots_doesnt_matter():
+    shots = [(1, 1), (2, 2), (4, 0), (0, 5), (1, 3)]
+    first, second = GameBoard(6, fleet()), GameBoard(6, fleet())
+    for shot in shots:
+        first.resolve_shot(shot)
+    for shot in reversed(shots):
+        second.resolve_shot(shot)
+    assert first.zobrist_hash() == second.zobrist_hash()
+    assert first.zobrist_hash() != GameBoard(6, fleet()).zobrist_hash()
+
+
+def test_memory_hash():
+    player = Player("Gosia", GameBoard(6))
+    assert player.memory_hash() == 0
+    for coordinate in [(0, 0), (3, 4), (0, 0)]:
+        player.remove_coordinate_from_memory(coordinate)
+    assert player.memory_hash() == grid_hash(player.memory() * CHOSEN)
+    bot = BotPlayer("Opponent", BitGameBoard(6), rng=Random(0))
+    for coordinate in [(3, 4), (0, 0)]:
+        bot.remove_coordinate_from_memory(coordinate)
+    assert bot.memory_hash() == player.memory_hash()
+    board = GameBoard(6)
+    for coordinate in [(3, 4), (0, 0)]:
+        board.resolve_shot(coordinate)
+    assert board.zobrist_hash() != player.memory_hash()
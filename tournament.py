@@ -0,0 +1,176 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+import os
+from simulation import GameResult, simulate_bot_game
+
+"""
+This file contains tournament runner. It plays a large number of seeded
+Bot Player vs Bot Player games, spreading them across a process pool.
+Every game gets its own seed derived from the tournament's seed and
+game's number, so any single game can be replayed exactly.
+"""
+
+"""
+Number of games that can be played with one tournament's seed
+before game seeds start to overlap with the next tournament's seed.
+"""
+GAMES_PER_SEED = 2 ** 40
+
+
+def game_seed(base_seed: int, game_number: int):
+    """
+    Function that returns seed of the given game of a tournament.
+    """
+    return base_seed * GAMES_PER_SEED + game_number
+
+
+def replay_game(game_number: int, boards_edge: int = 10,
+                base_seed: int = 0):
+    """
+    Function that plays again the given game of a tournament.
+    Returns exactly the same GameResult as the tournament did.
+    """
+    return simulate_bot_game(boards_edge, game_seed(base_seed, game_number))
+
+
+class TournamentSummary:
+    """
+    Class TournamentSummary. Merged statistics of played games.
+    Contains attributes:
+    :param games: number of played games
+    :type games: int
+
+    :param wins: number of games won by the first and the second player
+    :type wins: List of two ints
+
+    :param total_shots: number of shots fired in all the games
+    :type total_shots: int
+
+    :param results: GameResults of played games, ordered by game's number
+    (kept only when requested, by default empty)
+    :type results: List of GameResults
+    """
+    def __init__(self, games: int = 0, wins: List[int] = None,
+                 total_shots: int = 0, results: List[GameResult] = None):
+        """
+        Creates instance of a tournament summary.
+        """
+        self._games = games
+        if not wins:
+            self._wins = [0, 0]
+        else:
+            self._wins = wins
+        self._total_shots = total_shots
+        if not results:
+            self._results = []
+        else:
+            self._results = results
+
+    def games(self):
+        """
+        Method that return summary's games attribute.
+        """
+        return self._games
+
+    def wins(self):
+        """
+        Method that return summary's wins attribute.
+        """
+        return self._wins
+
+    def total_shots(self):
+        """
+        Method that return summary's total_shots attribute.
+        """
+        return self._total_shots
+
+    def results(self):
+        """
+        Method that return summary's results attribute.
+        """
+        return self._results
+
+    def mean_shots(self):
+        """
+        Method that returns average number of shots fired in a game.
+        """
+        if not self.games():
+            return 0.0
+        return self.total_shots() / self.games()
+
+    def add_result(self, result: GameResult, keep_result: bool = False):
+        """
+        Method that adds result of a single game to the summary.
+        """
+        self._games += 1
+        self._wins[result.winner()] += 1
+        self._total_shots += result.shots()
+        if keep_result:
+            self._results.append(result)
+
+    def merge(self, other: "TournamentSummary"):
+        """
+        Method that merges other summary (of later games) into this one.
+        """
+        self._games += other.games()
+        self._wins[0] += other.wins()[0]
+        self._wins[1] += other.wins()[1]
+        self._total_shots += other.total_shots()
+        self._results.extend(other.results())
+        return self
+
+
+def play_games(boards_edge: int, base_seed: int, first_game: int,
+               last_game: int, keep_results: bool = False):
+    """
+    Function that plays games numbered from first_game to last_game
+    (last_game excluded) and summarises them.
+    It is the unit of work that is sent to worker processes - only the
+    summary goes back, so inter-process communication cost is paid
+    once per chunk, not once per game.
+    """
+    summary = TournamentSummary()
+    for game_number in range(first_game, last_game):
+        result = simulate_bot_game(
+            boards_edge, game_seed(base_seed, game_number))
+        summary.add_result(result, keep_results)
+    return summary
+
+
+def _play_chunk(arguments: tuple):
+    """
+    Helper function of run_tournament. Unpacks chunk's arguments.
+    """
+    return play_games(*arguments)
+
+
+def run_tournament(games: int, boards_edge: int = 10, base_seed: int = 0,
+                   workers: int = None, chunk_size: int = None,
+                   keep_results: bool = False):
+    """
+    Function that plays given number of seeded games and returns
+    merged TournamentSummary.
+    Games are split into chunks of consecutive game numbers which
+    are played by a pool of worker processes. By default the pool has
+    as many workers as there are CPU cores and each worker gets
+    about four chunks, which keeps all the cores busy till the end.
+    With one worker the games are played in the current process.
+    """
+    if not workers:
+        workers = os.cpu_count() or 1
+    if not chunk_size:
+        chunk_size = max(1, -(-games // (workers * 4)))
+    chunks = [
+        (boards_edge, base_seed, first_game,
+         min(first_game + chunk_size, games), keep_results)
+        for first_game in range(0, games, chunk_size)
+    ]
+    summary = TournamentSummary()
+    if workers == 1:
+        for chunk in chunks:
+            summary.merge(_play_chunk(chunk))
+        return summary
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_summary in executor.map(_play_chunk, chunks):
+            summary.merge(chunk_summary)
+    return summary
@@ -0,0 +1,80 @@
+from functools import lru_cache
+import numpy as np
+
+"""
+This file contains Zobrist hashing of boards and players' memories.
+Every pair (field, status) has its own random 64-bit key and the hash
+of a board is XOR of the keys of all its fields that aren't empty.
+When a field changes its status the hash is updated with two XORs,
+so boards and memories keep their hashes up to date in constant time
+(see GameBoard.zobrist_hash and Player.memory_hash) and the same
+position has the same hash whatever order it has been reached in.
+
+Keys are not kept in a table (huge boards have too many fields) -
+each of them is computed when needed with splitmix64 from the number
+of the pair, and the most recently used changes of status are cached.
+"""
+
+"""
+Seed of the keys. Hashes are comparable only when computed with
+the same seed.
+"""
+ZOBRIST_SEED = 0x5EED_BA77_1E5B_0A75
+
+"""
+Number of changes of status kept in the cache.
+"""
+ZOBRIST_CACHE_SIZE = 1 << 16
+
+"""
+Status of a field chosen before in player's memory (it has its own
+keys, different from keys of board's statuses 1 - 3).
+"""
+CHOSEN = 4
+
+STATUSES = 5
+
+MASK_64 = (1 << 64) - 1
+
+
+def splitmix64(state: int):
+    """
+    Function that returns 64-bit output of splitmix64 generator
+    for the given state.
+    """
+    state = (state + 0x9E3779B97F4A7C15) & MASK_64
+    state = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    state = ((state ^ (state >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return state ^ (state >> 31)
+
+
+def zobrist_key(field: int, status: int):
+    """
+    Function that returns key of the field (y * boards_edge + x)
+    with given status. Empty fields (status 0) have key 0.
+    """
+    if not status:
+        return 0
+    return splitmix64(ZOBRIST_SEED ^ (field * STATUSES + status))
+
+
+@lru_cache(maxsize=ZOBRIST_CACHE_SIZE)
+def status_change(field: int, old_status: int, new_status: int):
+    """
+    Function that returns what has to be XORed into a hash when
+    the field's status changes (cached, so that updating a hash
+    takes one lookup).
+    """
+    return zobrist_key(field, old_status) ^ zobrist_key(field, new_status)
+
+
+def grid_hash(grid: np.ndarray):
+    """
+    Function that computes hash of a grid of statuses (ocean grid
+    or player's memory with CHOSEN instead of 1) from scratch.
+    """
+    flat_grid = np.asarray(grid).ravel()
+    result = 0
+    for field in np.flatnonzero(flat_grid).tolist():
+        result ^= zobrist_key(field, int(flat_grid[field]))
+    return result